@@ -1,3 +1,26 @@
-from .generators import creer_environnement, creer_projet, creer_projet_interactif, main
+__version__ = '0.1.0'
 
-__all__ = ['creer_environnement', 'creer_projet', 'creer_projet_interactif', 'main']
\ No newline at end of file
+__all__ = ['creer_environnement', 'creer_projet', 'creer_projet_interactif', 'main']
+
+# Les exports sont chargés au premier accès : `import seo` (et donc la
+# commande `seo`) ne paie pas l'import des générateurs
+_EXPORTS = {
+    'creer_environnement': 'generators',
+    'creer_projet': 'generators',
+    'creer_projet_interactif': 'generators',
+    'main': 'lanceur',
+}
+
+
+def __getattr__(nom):
+    module = _EXPORTS.get(nom)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nom!r}")
+    from importlib import import_module
+    valeur = getattr(import_module(f'.{module}', __name__), nom)
+    globals()[nom] = valeur
+    return valeur
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,3 @@
+from .lanceur import main
+
+main()
@@ -0,0 +1,251 @@
+"""
+Archives précompilées des templates
+
+Chaque niveau (debutant, intermediaire, pro) est empaqueté une fois dans
+un fichier unique indexé, mis en cache dans le dossier utilisateur. La
+génération lit ensuite les fichiers depuis ce fichier projeté en mémoire
+(mmap) au lieu de parcourir seo/templates à chaque appel.
+
+Format : MAGIC | longueur de l'index (8 octets, little-endian) | index JSON | données
+
+L'index marque les fichiers contenant des variables ``{= ... =}`` : eux
+seuls passent par le rendu, les autres sont copiés tels quels. Il garde
+aussi l'empreinte SHA-256 de chaque fichier (mises à jour incrémentales).
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from . import __version__
+from .materialisation import RapportMaterialisation, construire_manifeste, repartir
+from .rendu import contient_variables
+from .utils import repertoire_cache
+
+MAGIC = b'SEOB'
+FORMAT = 3
+EXTENSION = '.seob'
+TEMPLATES_DIR = Path(__file__).parent / 'templates'
+
+_ENTETE = struct.Struct('<4sQ')
+
+# Archives déjà projetées dans ce processus, par niveau
+_archives: Dict[str, 'ArchiveTemplate'] = {}
+_verrou = threading.Lock()
+
+
+class ArchiveInvalide(Exception):
+    """Archive absente, corrompue ou périmée"""
+
+
+def hash_template(source) -> str:
+    """Empreinte SHA-256 du contenu d'un template (chemins et octets)"""
+    source = Path(source)
+    empreinte = hashlib.sha256()
+    for entree in construire_manifeste(source).fichiers:
+        empreinte.update(entree.chemin.encode('utf-8') + b'\0')
+        empreinte.update((source / entree.chemin).read_bytes())
+    return empreinte.hexdigest()
+
+
+def construire_archive(source, cible) -> Path:
+    """Empaquète un dossier de template dans un fichier d'archive"""
+    source = Path(source)
+    cible = Path(cible)
+    manifeste = construire_manifeste(source)
+    empreinte = hashlib.sha256()
+    fichiers, blocs, offset = [], [], 0
+    for entree in manifeste.fichiers:
+        contenu = (source / entree.chemin).read_bytes()
+        empreinte.update(entree.chemin.encode('utf-8') + b'\0')
+        empreinte.update(contenu)
+        fichiers.append([entree.chemin, offset, len(contenu), contient_variables(contenu),
+                         hashlib.sha256(contenu).hexdigest()])
+        blocs.append(contenu)
+        offset += len(contenu)
+
+    index = json.dumps({
+        'format': FORMAT,
+        'version': __version__,
+        'niveau': source.name,
+        'hash': empreinte.hexdigest(),
+        'dossiers': manifeste.dossiers,
+        'fichiers': fichiers,
+    }, separators=(',', ':')).encode('utf-8')
+
+    # Écriture atomique : plusieurs générations peuvent construire en parallèle
+    cible.parent.mkdir(parents=True, exist_ok=True)
+    fd, temporaire = tempfile.mkstemp(dir=cible.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_ENTETE.pack(MAGIC, len(index)))
+            f.write(index)
+            for contenu in blocs:
+                f.write(contenu)
+        os.replace(temporaire, cible)
+    except BaseException:
+        os.unlink(temporaire)
+        raise
+    return cible
+
+
+class ArchiveTemplate:
+    """Archive de template ouverte et projetée en mémoire"""
+
+    def __init__(self, chemin):
+        self.chemin = Path(chemin)
+        with open(self.chemin, 'rb') as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ArchiveInvalide(f"Archive vide: {self.chemin}")
+        try:
+            magic, taille_index = _ENTETE.unpack_from(self._mmap, 0)
+            if magic != MAGIC:
+                raise ArchiveInvalide(f"Archive invalide: {self.chemin}")
+            debut_index = _ENTETE.size
+            self.index = json.loads(self._mmap[debut_index:debut_index + taille_index])
+            self._debut_donnees = debut_index + taille_index
+            self._positions = {relatif: (offset, taille)
+                               for relatif, offset, taille, _, _ in self.index['fichiers']}
+        except (struct.error, ValueError, KeyError) as e:
+            self.fermer()
+            raise ArchiveInvalide(f"Archive corrompue: {self.chemin} ({e})")
+
+    @property
+    def version(self) -> str:
+        return self.index['version']
+
+    @property
+    def hash(self) -> str:
+        return self.index['hash']
+
+    @property
+    def octets(self) -> int:
+        return sum(taille for _, _, taille, _, _ in self.index['fichiers'])
+
+    @property
+    def a_rendre(self) -> List[str]:
+        """Fichiers contenant des variables de template"""
+        return [relatif for relatif, _, _, rendu, _ in self.index['fichiers'] if rendu]
+
+    @property
+    def empreintes(self) -> Dict[str, str]:
+        """SHA-256 du contenu brut de chaque fichier"""
+        return {relatif: empreinte for relatif, _, _, _, empreinte in self.index['fichiers']}
+
+    def lire(self, chemin: str) -> bytes:
+        """Contenu d'un fichier de l'archive"""
+        offset, taille = self._positions[chemin]
+        debut = self._debut_donnees + offset
+        return self._mmap[debut:debut + taille]
+
+    def materialiser(self, destination, workers: Optional[int] = None,
+                     brut_seulement: bool = False) -> RapportMaterialisation:
+        """
+        Écrit les fichiers de l'archive dans le dossier de destination
+
+        Args:
+            brut_seulement: Ignore les fichiers à rendre (écrits par le rendu)
+        """
+        debut = time.perf_counter()
+        destination = Path(destination)
+        destination.mkdir(parents=True, exist_ok=True)
+        for dossier in self.index['dossiers']:
+            (destination / dossier).mkdir(parents=True, exist_ok=True)
+
+        vue = memoryview(self._mmap)
+
+        fichiers = [fichier for fichier in self.index['fichiers']
+                    if not (brut_seulement and fichier[3])]
+
+        def ecrire(fichier):
+            relatif, offset, taille, _, _ = fichier
+            debut_fichier = self._debut_donnees + offset
+            with open(destination / relatif, 'wb') as f:
+                f.write(vue[debut_fichier:debut_fichier + taille])
+
+        try:
+            repartir(ecrire, fichiers, workers)
+        finally:
+            vue.release()
+        return RapportMaterialisation(len(fichiers), sum(fichier[2] for fichier in fichiers),
+                                      time.perf_counter() - debut)
+
+    def fermer(self):
+        self._mmap.close()
+
+
+def chemin_archive(niveau: str) -> Path:
+    """Emplacement de l'archive d'un niveau pour la version installée"""
+    return repertoire_cache() / 'templates' / f"{niveau}-{__version__}{EXTENSION}"
+
+
+def _installation_modifiable() -> bool:
+    """Vrai si le package tourne depuis les sources (templates modifiables sans changer de version)"""
+    return not any(partie in ('site-packages', 'dist-packages') for partie in TEMPLATES_DIR.parts)
+
+
+def charger_archive(niveau: str, verifier: Optional[bool] = None) -> Optional[ArchiveTemplate]:
+    """
+    Retourne l'archive d'un niveau, construite au premier usage
+
+    L'archive est reconstruite si elle manque, si elle provient d'une autre
+    version du package, ou (quand verifier est vrai) si le hash du template
+    source a changé. Par défaut la vérification n'a lieu que pour une
+    installation depuis les sources, ou si SEO_VERIFIER_TEMPLATES est défini.
+
+    Returns:
+        L'archive, ou None si le template n'existe pas
+    """
+    source = TEMPLATES_DIR / niveau
+    if verifier is None:
+        verifier = _installation_modifiable() or bool(os.environ.get('SEO_VERIFIER_TEMPLATES'))
+
+    with _verrou:
+        archive = _archives.get(niveau)
+        if archive is not None and not verifier:
+            return archive
+        if not source.exists():
+            return None
+
+        attendu = hash_template(source) if verifier else None
+        if archive is not None and archive.hash == attendu:
+            return archive
+
+        cible = chemin_archive(niveau)
+        try:
+            archive = ArchiveTemplate(cible)
+            if archive.version != __version__ or archive.index.get('format') != FORMAT \
+                    or (attendu is not None and archive.hash != attendu):
+                archive.fermer()
+                raise ArchiveInvalide(f"Archive périmée: {cible}")
+        except (OSError, ArchiveInvalide):
+            construire_archive(source, cible)
+            archive = ArchiveTemplate(cible)
+
+        _archives[niveau] = archive
+        return archive
+
+
+def construire_archives() -> Dict[str, Path]:
+    """Précompile les archives de tous les niveaux (étape de build, image Docker, CI)"""
+    resultats = {}
+    for source in sorted(TEMPLATES_DIR.iterdir()):
+        if not source.is_dir():
+            continue
+        # templates/modules/<nom> : fichiers ajoutés selon les options, une archive par module
+        if source.name == 'modules':
+            for module in sorted(source.iterdir()):
+                if module.is_dir():
+                    nom = f'modules/{module.name}'
+                    resultats[nom] = construire_archive(module, chemin_archive(nom))
+            continue
+        resultats[source.name] = construire_archive(source, chemin_archive(source.name))
+    return resultats
@@ -0,0 +1,160 @@
+"""
+Installation des dépendances en arrière-plan
+
+La génération lance un processus détaché (``python -m seo.arriere_plan``)
+avant d'écrire les fichiers, puis rend la main : l'installation continue
+pendant et après la matérialisation. L'avancement est écrit dans
+``.seo/statut.json`` et la sortie de pip dans ``.seo/installation.log`` ;
+``seo status`` les consulte.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .utils import DOSSIER_SEO
+
+FICHIER_STATUT = 'statut.json'
+FICHIER_LOG = 'installation.log'
+
+EN_ATTENTE = 'en_attente'
+EN_COURS = 'en_cours'
+PRET = 'pret'
+ECHEC = 'echec'
+INTERROMPU = 'interrompu'
+
+LIBELLES = {
+    EN_ATTENTE: "⏳ En attente",
+    EN_COURS: "🔧 Installation en cours",
+    PRET: "✅ Environnement prêt",
+    ECHEC: "❌ Installation échouée",
+    INTERROMPU: "⚠️ Installation interrompue",
+}
+LIBELLES_ETAPES = {
+    'resolution': "résolution des dépendances",
+    'wheelhouse': "préparation du wheelhouse",
+    'venv': "installation dans le venv",
+}
+
+
+def chemin_statut(chemin_projet) -> Path:
+    return Path(chemin_projet) / DOSSIER_SEO / FICHIER_STATUT
+
+
+def ecrire_statut(chemin_projet, **champs) -> Dict[str, Any]:
+    """Met à jour le fichier de statut (écriture atomique)"""
+    fichier = chemin_statut(chemin_projet)
+    fichier.parent.mkdir(parents=True, exist_ok=True)
+    statut = _lire_brut(chemin_projet) or {}
+    statut.update(champs, maj=time.time())
+    temporaire = fichier.parent / f'{FICHIER_STATUT}.{os.getpid()}.tmp'
+    temporaire.write_text(json.dumps(statut, indent=2, ensure_ascii=False), encoding='utf-8')
+    os.replace(temporaire, fichier)
+    return statut
+
+
+def _lire_brut(chemin_projet) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(chemin_statut(chemin_projet).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def lire_statut(chemin_projet) -> Optional[Dict[str, Any]]:
+    """Statut de l'installation, ou None si le projet n'en a pas"""
+    statut = _lire_brut(chemin_projet)
+    if statut is None:
+        return None
+    if statut.get('etat') in (EN_ATTENTE, EN_COURS) and not _processus_actif(statut.get('pid')):
+        statut['etat'] = INTERROMPU
+    return statut
+
+
+def _processus_actif(pid: Optional[int]) -> bool:
+    # Sans pid, le processus n'a jamais démarré
+    if not pid:
+        return False
+    if sys.platform == 'win32':
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def lancer_installation(chemin_projet, packages: List[str]) -> int:
+    """Démarre l'installation dans un processus détaché et retourne son pid"""
+    chemin_projet = Path(chemin_projet)
+    ecrire_statut(chemin_projet, etat=EN_ATTENTE, etape=None, packages=packages,
+                  debut=time.time(), fin=None, erreur=None, pid=None)
+    log = open(chemin_projet / DOSSIER_SEO / FICHIER_LOG, 'w', encoding='utf-8')
+    options = {}
+    if sys.platform == 'win32':
+        options['creationflags'] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        options['start_new_session'] = True
+    with log:
+        processus = subprocess.Popen(
+            [sys.executable, '-m', 'seo.arriere_plan', str(chemin_projet), *packages],
+            stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT, **options)
+    # Enregistré avant que le processus n'écrive : s'il meurt au démarrage (import,
+    # interpréteur), `seo status` le voit disparaître au lieu d'attendre sans fin
+    ecrire_statut(chemin_projet, pid=processus.pid)
+    return processus.pid
+
+
+def executer_installation(chemin_projet, packages: List[str]) -> bool:
+    """Corps du processus d'arrière-plan"""
+    from .installation import ETAPES, ErreurInstallation, installer_projet
+
+    def suivi(etape: str):
+        print(f"[{time.strftime('%H:%M:%S')}] {LIBELLES_ETAPES[etape]}", flush=True)
+        ecrire_statut(chemin_projet, etat=EN_COURS, etape=etape,
+                      progression=int(100 * ETAPES.index(etape) / len(ETAPES)))
+
+    try:
+        installation = installer_projet(packages, chemin_projet, suivi)
+    except (ErreurInstallation, OSError) as e:
+        print(e, flush=True)
+        ecrire_statut(chemin_projet, etat=ECHEC, erreur=str(e), fin=time.time())
+        return False
+    print(installation, flush=True)
+    ecrire_statut(chemin_projet, etat=PRET, etape=None, progression=100,
+                  hors_ligne=installation.hors_ligne, fin=time.time())
+    return True
+
+
+def afficher_statut(chemin_projet='.', attendre: bool = False) -> bool:
+    """Affiche l'état de l'environnement ; retourne vrai s'il est prêt"""
+    statut = lire_statut(chemin_projet)
+    while attendre and statut and statut.get('etat') in (EN_ATTENTE, EN_COURS):
+        time.sleep(0.5)
+        statut = lire_statut(chemin_projet)
+
+    if statut is None:
+        print(" Aucune installation en arrière-plan pour ce projet")
+        return True
+    etat = statut.get('etat')
+    print(f"\n {LIBELLES.get(etat, etat)}")
+    if etat == EN_COURS and statut.get('etape'):
+        print(f"   Étape: {LIBELLES_ETAPES.get(statut['etape'], statut['etape'])} "
+              f"({statut.get('progression', 0)} %)")
+    fin = statut.get('fin') or time.time()
+    if statut.get('debut'):
+        print(f"   Durée: {fin - statut['debut']:.1f} s")
+    if statut.get('erreur'):
+        print(f"   Erreur: {statut['erreur']}")
+    if etat in (ECHEC, INTERROMPU):
+        print(f"   Journal: {Path(chemin_projet) / DOSSIER_SEO / FICHIER_LOG}")
+    print()
+    return etat == PRET
+
+
+if __name__ == '__main__':
+    sys.exit(0 if executer_installation(sys.argv[1], sys.argv[2:]) else 1)
@@ -0,0 +1,451 @@
+"""
+Banc de charge des projets générés (`seo bench`)
+
+L'application du projet (``create_app()`` ou ``app``) est démarrée dans
+ce processus sur un serveur werkzeug multi-thread, contre une base
+SQLite jetable (ou ``--database-url``). La base est peuplée via les
+modèles User et Tache, puis des clients concurrents enchaînent les
+routes clés. Pour chaque route : latences p50/p95/p99, débit, codes de
+réponse et nombre moyen de requêtes SQL. Les résultats sont enregistrés
+en JSON dans ``.seo/bench/`` pour comparer les versions de templates.
+
+Les clients partagent le processus (et le GIL) du serveur : les chiffres
+servent à comparer deux exécutions sur la même machine, pas à dimensionner
+une production.
+
+Avec ``--url``, le banc charge un serveur déjà lancé (``seo run prod``)
+au lieu de démarrer l'application : c'est ainsi que se mesurent les
+applications ASGI (type ``api_async``) et que se comparent deux variantes
+sous la même charge, par exemple l'API synchrone et l'API asynchrone :
+
+    seo bench --url http://127.0.0.1:5000/api/v1/sante -c 64 -o sync.json
+    seo bench --url http://127.0.0.1:5001/api/v1/sante -c 64 --compare sync.json
+"""
+import http.client
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from . import __version__
+from .utils import DOSSIER_SEO
+
+DOSSIER_BENCH = 'bench'
+MOT_DE_PASSE = 'bench-mot-de-passe'
+
+
+class Scenario(NamedTuple):
+    """Route sollicitée par les clients"""
+    nom: str
+    methode: str
+    chemin: str
+    formulaire: Optional[Dict[str, str]] = None
+    connexion: bool = False
+
+
+def percentile(valeurs_triees: List[float], p: float) -> float:
+    """Percentile par rang le plus proche (liste déjà triée)"""
+    if not valeurs_triees:
+        return 0.0
+    rang = math.ceil(p / 100 * len(valeurs_triees))
+    return valeurs_triees[max(0, min(len(valeurs_triees), rang) - 1)]
+
+
+def preparer_application(chemin, url_base: str):
+    """Importe l'application du projet contre la base du banc"""
+    from .commandes import charger_app
+    os.environ['DATABASE_URL'] = url_base
+    return charger_app(str(chemin))
+
+
+def peupler(app, utilisateurs: int, taches: int) -> List[str]:
+    """
+    Crée les tables et insère les données du banc
+
+    Returns:
+        Noms des utilisateurs créés (vide si le projet n'a pas de modèle User)
+    """
+    from sqlalchemy import select
+    from .utilisateurs import extension_db, hacher, methode_hachage, trouver_modele
+    if 'sqlalchemy' not in app.extensions:
+        return []
+    db = extension_db(app)
+    with app.app_context():
+        db.create_all()
+        try:
+            User = trouver_modele(db, 'User')
+        except LookupError:
+            return []
+        # Un seul hachage : tous les comptes du banc partagent le mot de passe
+        empreinte = hacher(MOT_DE_PASSE, methode_hachage(app))
+        noms = [f'bench{i}' for i in range(utilisateurs)]
+        table = User.__table__
+        existants = set(db.session.execute(
+            select(table.c.username).where(table.c.username.in_(noms))).scalars())
+        nouveaux = [{'username': nom, 'email': f'{nom}@bench.local', 'password_hash': empreinte}
+                    for nom in noms if nom not in existants]
+        if nouveaux:
+            db.session.execute(table.insert(), nouveaux)
+        try:
+            Tache = trouver_modele(db, 'Tache')
+        except LookupError:
+            Tache = None
+        if Tache is not None and taches and nouveaux:
+            from datetime import datetime, timedelta
+            ids = db.session.execute(
+                select(table.c.id).where(table.c.username.in_([u['username'] for u in nouveaux]))).scalars()
+            maintenant = datetime.utcnow()
+            lignes = [{'titre': f'Tâche {n}', 'user_id': id_, 'termine': n % 3 == 0,
+                       'date_creation': maintenant - timedelta(minutes=n)}
+                      for id_ in ids for n in range(taches)]
+            db.session.execute(Tache.__table__.insert(), lignes)
+        db.session.commit()
+    return noms
+
+
+def scenarios(app, noms: List[str]) -> List[Scenario]:
+    """Routes clés du projet : parcours authentifié si le projet en a un"""
+    regles = {regle.endpoint for regle in app.url_map.iter_rules()}
+    if noms and {'utilisateurs.connexion', 'taches.liste', 'taches.ajouter'} <= regles:
+        return [
+            Scenario('connexion', 'POST', '/auth/connexion', connexion=True),
+            Scenario('taches.liste', 'GET', '/taches/'),
+            Scenario('taches.ajouter', 'POST', '/taches/ajouter', {'titre': 'Tâche du banc'}),
+        ]
+    # Sinon : toutes les pages GET sans paramètre
+    return [Scenario(regle.endpoint, 'GET', regle.rule)
+            for regle in sorted(app.url_map.iter_rules(), key=lambda r: r.rule)
+            if 'GET' in regle.methods and not regle.arguments and regle.endpoint != 'static']
+
+
+class CompteurRequetes:
+    """Compte les requêtes SQL de chaque requête HTTP servie"""
+
+    def __init__(self, app):
+        self._local = threading.local()
+        self._verrou = threading.Lock()
+        self.par_route: Dict[str, List[int]] = {}
+        if 'sqlalchemy' not in app.extensions:
+            return
+        from sqlalchemy import event
+        from .utilisateurs import extension_db
+        with app.app_context():
+            event.listen(extension_db(app).engine, 'before_cursor_execute', self._compter)
+        app.before_request(self._debut)
+        app.after_request(self._fin)
+
+    def _compter(self, *args):
+        self._local.requetes = getattr(self._local, 'requetes', 0) + 1
+
+    def _debut(self):
+        self._local.requetes = 0
+
+    def _fin(self, reponse):
+        from flask import request
+        cle = f"{request.method} {request.path}"
+        with self._verrou:
+            self.par_route.setdefault(cle, []).append(getattr(self._local, 'requetes', 0))
+        return reponse
+
+
+class Cible(NamedTuple):
+    """Serveur sollicité : celui du banc ou un serveur déjà lancé (--url)"""
+    hote: str = '127.0.0.1'
+    port: int = 80
+    https: bool = False
+
+
+class Client:
+    """Client HTTP minimal avec cookie de session"""
+
+    def __init__(self, cible: Cible):
+        classe = http.client.HTTPSConnection if cible.https else http.client.HTTPConnection
+        self.connexion = classe(cible.hote, cible.port, timeout=30)
+        self.cookie = None
+
+    def envoyer(self, methode: str, chemin: str, formulaire: Optional[Dict[str, str]] = None) -> int:
+        entetes = {}
+        corps = None
+        if formulaire is not None:
+            corps = urlencode(formulaire)
+            entetes['Content-Type'] = 'application/x-www-form-urlencoded'
+        if self.cookie:
+            entetes['Cookie'] = self.cookie
+        try:
+            self.connexion.request(methode, chemin, body=corps, headers=entetes)
+            reponse = self.connexion.getresponse()
+            reponse.read()
+        except (OSError, http.client.HTTPException):
+            self.connexion.close()
+            raise
+        cookie = reponse.getheader('Set-Cookie')
+        if cookie:
+            self.cookie = cookie.split(';', 1)[0]
+        if reponse.getheader('Connection', '').lower() == 'close' or reponse.version == 10:
+            self.connexion.close()
+        return reponse.status
+
+
+def demarrer_serveur(app):
+    """Serveur werkzeug multi-thread sur un port libre"""
+    import logging
+    from werkzeug.serving import make_server
+    # Le journal des requêtes fausserait les mesures
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    serveur = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=serveur.serve_forever, daemon=True).start()
+    return serveur
+
+
+def _identifiants(noms: List[str], numero: int) -> Optional[Dict[str, str]]:
+    return {'username': noms[numero % len(noms)], 'password': MOT_DE_PASSE} if noms else None
+
+
+def scenarios_url(urls: List[str]) -> Tuple[Cible, List[Scenario]]:
+    """Serveur et routes GET des URL de --url (un seul serveur par exécution)"""
+    parties = [urlsplit(url) for url in urls]
+    if any(partie.scheme not in ('http', 'https') or not partie.hostname for partie in parties):
+        raise LookupError("--url attend des URL http(s)://hote[:port]/chemin")
+    if len({(partie.scheme, partie.netloc) for partie in parties}) > 1:
+        raise LookupError("Toutes les URL de --url doivent viser le même serveur")
+    https = parties[0].scheme == 'https'
+    cible = Cible(parties[0].hostname, parties[0].port or (443 if https else 80), https)
+    liste = []
+    for partie in parties:
+        chemin = (partie.path or '/') + (f'?{partie.query}' if partie.query else '')
+        liste.append(Scenario(chemin, 'GET', chemin))
+    return cible, liste
+
+
+def est_asgi(app) -> bool:
+    """Application ASGI (Quart...) : ne se sert pas sur le serveur WSGI du banc"""
+    import inspect
+    return inspect.iscoroutinefunction(getattr(type(app), '__call__', None))
+
+
+def echauffer(cible: Cible, liste: List[Scenario], noms: List[str]):
+    """Une requête par route avant la mesure (imports paresseux, caches Jinja)"""
+    session = Client(cible)
+    identifiants = _identifiants(noms, 0)
+    if identifiants:
+        session.envoyer('POST', '/auth/connexion', identifiants)
+    for scenario in liste:
+        if scenario.connexion:
+            session.cookie = None
+        session.envoyer(scenario.methode, scenario.chemin,
+                        identifiants if scenario.connexion else scenario.formulaire)
+
+
+def charger(cible: Cible, liste: List[Scenario], noms: List[str], duree: float,
+            concurrence: int) -> Tuple[Dict[str, Dict[str, Any]], float]:
+    """
+    Lance `concurrence` clients pendant `duree` secondes
+
+    Returns:
+        Mesures par route et durée effective de la mesure
+    """
+    mesures = {scenario.nom: {'latences': [], 'codes': {}, 'erreurs': 0} for scenario in liste}
+    verrou = threading.Lock()
+    horloge = {}
+
+    def demarrer():
+        horloge['debut'] = time.perf_counter()
+        horloge['fin'] = horloge['debut'] + duree
+
+    if concurrence < 1:
+        raise ValueError("Il faut au moins un client")
+    # La mesure commence quand tous les clients sont connectés
+    depart = threading.Barrier(concurrence, action=demarrer)
+    echecs = []
+
+    def client(numero: int):
+        session = Client(cible)
+        identifiants = _identifiants(noms, numero)
+        try:
+            if identifiants:
+                session.envoyer('POST', '/auth/connexion', identifiants)
+        except (OSError, http.client.HTTPException) as e:
+            # Sans ce client, la barrière ne s'ouvrirait jamais : les autres abandonnent aussi
+            echecs.append(e)
+            depart.abort()
+            return
+        try:
+            depart.wait()
+        except threading.BrokenBarrierError:
+            return
+        i = numero
+        while time.perf_counter() < horloge['fin']:
+            scenario = liste[i % len(liste)]
+            i += 1
+            formulaire = scenario.formulaire
+            if scenario.connexion:
+                # Connexion complète (vérification du mot de passe) : sans la session en cours
+                formulaire, session.cookie = identifiants, None
+            debut = time.perf_counter()
+            try:
+                statut = session.envoyer(scenario.methode, scenario.chemin, formulaire)
+            except (OSError, http.client.HTTPException):
+                statut = None
+            latence = time.perf_counter() - debut
+            with verrou:
+                mesure = mesures[scenario.nom]
+                if statut is None or statut >= 500:
+                    mesure['erreurs'] += 1
+                mesure['latences'].append(latence)
+                mesure['codes'][str(statut)] = mesure['codes'].get(str(statut), 0) + 1
+
+    fils = [threading.Thread(target=client, args=(n,)) for n in range(concurrence)]
+    for fil in fils:
+        fil.start()
+    for fil in fils:
+        fil.join()
+    if echecs:
+        raise ConnectionError(f"Connexion d'un client impossible avant la mesure: {echecs[0]!r}")
+    return mesures, time.perf_counter() - horloge['debut']
+
+
+def synthese(liste: List[Scenario], mesures: Dict[str, Dict[str, Any]],
+             requetes_sql: Dict[str, List[int]], duree: float) -> Dict[str, Dict[str, Any]]:
+    """Statistiques par route (latences en millisecondes)"""
+    routes = {}
+    for scenario in liste:
+        mesure = mesures[scenario.nom]
+        latences = sorted(mesure['latences'])
+        sql = requetes_sql.get(f"{scenario.methode} {scenario.chemin}", [])
+        routes[scenario.nom] = {
+            'methode': scenario.methode,
+            'chemin': scenario.chemin,
+            'requetes': len(latences),
+            'erreurs': mesure['erreurs'],
+            'codes': mesure['codes'],
+            'debit': round(len(latences) / duree, 2) if duree else 0,
+            'moyenne_ms': round(1000 * sum(latences) / len(latences), 3) if latences else 0,
+            'p50_ms': round(1000 * percentile(latences, 50), 3),
+            'p95_ms': round(1000 * percentile(latences, 95), 3),
+            'p99_ms': round(1000 * percentile(latences, 99), 3),
+            'requetes_sql': round(sum(sql) / len(sql), 2) if sql else None,
+        }
+    return routes
+
+
+def _infos_projet(chemin: Path) -> Dict[str, Any]:
+    try:
+        manifeste = json.loads((chemin / DOSSIER_SEO / 'manifeste.json').read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return {cle: manifeste.get(cle) for cle in ('version', 'niveau', 'generateur')}
+
+
+def executer_bench(chemin='.', duree: float = 10, concurrence: int = 8, utilisateurs: int = 20,
+                   taches: int = 50, url_base: Optional[str] = None,
+                   urls: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Démarre l'application, la peuple et mesure ; retourne les résultats
+
+    Args:
+        urls: Routes d'un serveur déjà lancé à mesurer telles quelles (--url),
+            sans démarrer ni peupler l'application
+    """
+    chemin = Path(chemin).resolve()
+    if urls:
+        cible, liste = scenarios_url(urls)
+        echauffer(cible, liste, [])
+        mesures, ecoule = charger(cible, liste, [], duree, concurrence)
+        return _resultats(chemin, synthese(liste, mesures, {}, ecoule), ecoule, {
+            'duree': duree, 'concurrence': concurrence, 'url': f"{cible.hote}:{cible.port}"})
+
+    with tempfile.TemporaryDirectory(prefix='seo-bench-') as temporaire:
+        app = preparer_application(chemin, url_base or f"sqlite:///{Path(temporaire) / 'bench.db'}")
+        if est_asgi(app):
+            raise LookupError("application ASGI : lancez-la (seo run prod) puis "
+                              "seo bench --url http://127.0.0.1:5000/api/v1/sante")
+        noms = peupler(app, utilisateurs, taches)
+        liste = scenarios(app, noms)
+        if not liste:
+            raise LookupError("Aucune route à mesurer dans l'application")
+        compteur = CompteurRequetes(app)
+        serveur = demarrer_serveur(app)
+        cible = Cible(port=serveur.port)
+        try:
+            echauffer(cible, liste, noms)
+            compteur.par_route.clear()
+
+            mesures, ecoule = charger(cible, liste, noms, duree, concurrence)
+        finally:
+            serveur.shutdown()
+
+    routes = synthese(liste, mesures, compteur.par_route, ecoule)
+    return _resultats(chemin, routes, ecoule, {
+        'duree': duree, 'concurrence': concurrence, 'utilisateurs': utilisateurs,
+        'taches': taches, 'base': 'externe' if url_base else 'sqlite'})
+
+
+def _resultats(chemin: Path, routes: Dict[str, Dict[str, Any]], ecoule: float,
+               parametres: Dict[str, Any]) -> Dict[str, Any]:
+    total = sum(route['requetes'] for route in routes.values())
+    return {
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'seo_version': __version__,
+        'projet': _infos_projet(chemin),
+        'machine': {'python': platform.python_version(), 'cpus': os.cpu_count(),
+                    'plateforme': sys.platform},
+        'parametres': parametres,
+        'total': {'requetes': total, 'debit': round(total / ecoule, 2) if ecoule else 0,
+                  'duree': round(ecoule, 3)},
+        'routes': routes,
+    }
+
+
+def enregistrer(resultats: Dict[str, Any], chemin='.', fichier=None) -> Path:
+    """Écrit les résultats en JSON (par défaut dans .seo/bench/)"""
+    if fichier is None:
+        fichier = Path(chemin) / DOSSIER_SEO / DOSSIER_BENCH / f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    fichier = Path(fichier)
+    fichier.parent.mkdir(parents=True, exist_ok=True)
+    fichier.write_text(json.dumps(resultats, indent=2, ensure_ascii=False), encoding='utf-8')
+    return fichier
+
+
+def dernier_resultat(chemin='.', exclure=None) -> Optional[Path]:
+    """Résultat le plus récent de .seo/bench/"""
+    dossier = Path(chemin) / DOSSIER_SEO / DOSSIER_BENCH
+    fichiers = sorted(f for f in dossier.glob('bench-*.json') if f != exclure) if dossier.exists() else []
+    return fichiers[-1] if fichiers else None
+
+
+def afficher(resultats: Dict[str, Any], reference: Optional[Dict[str, Any]] = None):
+    """Tableau des routes, avec l'écart à une exécution de référence"""
+    def ecart(route: str, cle: str) -> str:
+        if not reference or route not in reference.get('routes', {}):
+            return ''
+        avant, apres = reference['routes'][route][cle], resultats['routes'][route][cle]
+        if not avant:
+            return ''
+        return f" ({100 * (apres - avant) / avant:+.0f} %)"
+
+    parametres = resultats['parametres']
+    print("\n" + "="*78)
+    print(f" Banc de charge: {parametres['concurrence']} clients, {resultats['total']['duree']:.1f} s, "
+          f"{resultats['total']['debit']:.0f} req/s")
+    print("="*78 + "\n")
+    print(f"   {'route':<18} {'req/s':>14} {'p50 ms':>8} {'p95 ms':>16} {'p99 ms':>8} {'SQL':>5} {'err':>4}")
+    for nom, route in resultats['routes'].items():
+        sql = '-' if route['requetes_sql'] is None else f"{route['requetes_sql']:.1f}"
+        print(f"   {nom:<18} {route['debit']:>7.1f}{ecart(nom, 'debit'):>7} {route['p50_ms']:>8.1f} "
+              f"{route['p95_ms']:>8.1f}{ecart(nom, 'p95_ms'):>8} {route['p99_ms']:>8.1f} {sql:>5} "
+              f"{route['erreurs']:>4}")
+    if 'url' in parametres:
+        print(f"\n   Serveur: {parametres['url']}")
+    if reference:
+        print(f"\n   Référence: {reference.get('date')} (seo {reference.get('seo_version')}, "
+              f"templates {reference.get('projet', {}).get('version')})")
+        if 'url' in reference.get('parametres', {}):
+            print(f"   Serveur de référence: {reference['parametres']['url']}")
+    print("\n" + "="*78 + "\n")
@@ -65,40 +65,45 @@ def collecter_preferences() -> Dict[str, Any]:
         "Apprentissage (simple, pour débuter)",
         "Application web (structure MVC complète)",
         "API professionnelle (production-ready)",
-        "Startup SaaS (auth, paiement, dashboard)"
+        "Startup SaaS (auth, paiement, dashboard)",
+        "API asynchrone (ASGI, nombreuses requêtes en attente d'E/S)"
     ]
     type_choix = poser_question(" Quel type de projet ?", type_options)
-    types_mapping = {0: "apprentissage", 1: "application", 2: "api", 3: "saas"}
+    types_mapping = {0: "apprentissage", 1: "application", 2: "api", 3: "saas", 4: "api_async"}
     preferences["type_projet"] = types_mapping[type_choix]
     
-    if preferences["type_projet"] in ["application", "api", "saas"]:
+    if preferences["type_projet"] in ["application", "api", "saas", "api_async"]:
         db_options = [
             "SQLite (simple, fichier local)",
             "PostgreSQL (recommandé pour production)",
             "MySQL (compatible, largement utilisé)"
         ]
         db_choix = poser_question("  Quelle base de données ?", db_options,
-                                   defaut=2 if preferences["type_projet"] in ["api", "saas"] else 1)
+                                   defaut=2 if preferences["type_projet"] in ["api", "saas", "api_async"] else 1)
         db_mapping = {0: "sqlite", 1: "postgresql", 2: "mysql"}
         preferences["base_donnees"] = db_mapping[db_choix]
         
-        if preferences["base_donnees"] == "sqlite" and preferences["type_projet"] in ["api", "saas"]:
+        if preferences["base_donnees"] == "sqlite" and preferences["type_projet"] in ["api", "saas", "api_async"]:
             print("\n  ATTENTION: SQLite non recommandé pour production.")
             if not confirmer("\n   Continuer avec SQLite ?", defaut=False):
                 print("\n    Passage à PostgreSQL")
                 preferences["base_donnees"] = "postgresql"
         
-        auth_options = [
-            "Session classique (cookies Flask)",
-            "JWT (tokens, pour API)",
-            "OAuth2 (Google, GitHub, etc.)"
-        ]
-        auth_choix = poser_question(" Type d'authentification ?", auth_options,
-                                     defaut=2 if preferences["type_projet"] == "api" else 1)
-        auth_mapping = {0: "session", 1: "jwt", 2: "oauth"}
-        preferences["auth"] = auth_mapping[auth_choix]
+        if preferences["type_projet"] == "api_async":
+            # Jetons vérifiés dans la boucle d'événements, sans session côté serveur
+            preferences["auth"] = "jwt"
+        else:
+            auth_options = [
+                "Session classique (cookies Flask)",
+                "JWT (tokens, pour API)",
+                "OAuth2 (Google, GitHub, etc.)"
+            ]
+            auth_choix = poser_question(" Type d'authentification ?", auth_options,
+                                         defaut=2 if preferences["type_projet"] == "api" else 1)
+            auth_mapping = {0: "session", 1: "jwt", 2: "oauth"}
+            preferences["auth"] = auth_mapping[auth_choix]
         
-        if preferences["type_projet"] in ["api", "saas"]:
+        if preferences["type_projet"] in ["api", "saas", "api_async"]:
             preferences["docker"] = True
             print("\n Docker inclus automatiquement")
         else:
@@ -151,6 +156,12 @@ def afficher_prochaines_etapes(nom_projet: str, type_projet: str, docker: bool =
     else:
         if type_projet == "apprentissage":
             print("  2. python app.py")
+        elif type_projet == "api_async":
+            print("  2. python -m venv venv")
+            print("  3. venv\\Scripts\\activate")
+            print("  4. pip install -r requirements.txt")
+            print("  5. quart --app run:app creer-tables")
+            print("  6. python run.py")
         else:
             print("  2. python -m venv venv")
             print("  3. venv\\Scripts\\activate")
@@ -159,7 +170,11 @@ def afficher_prochaines_etapes(nom_projet: str, type_projet: str, docker: bool =
             print("  6. seo user create")
             print("  7. seo run")
     print("\n Commandes:")
-    print("   seo db init     - Initialiser la base")
-    print("   seo user create - Créer un admin")
+    if type_projet != "api_async":
+        # Flask-Migrate et Flask-SQLAlchemy : pas dans le template asynchrone
+        print("   seo db init     - Initialiser la base")
+        print("   seo user create - Créer un admin")
     print("   seo run         - Lancer l'app")
+    if type_projet == "api_async":
+        print("   seo bench --url - Comparer à la variante synchrone sous la même charge")
     print("\n" + "="*60 + "\n")
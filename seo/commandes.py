@@ -3,77 +3,259 @@ Commandes internes pour gérer le projet Flask
 """
 import os
 import sys
-import subprocess
-from pathlib import Path
-
-
-def commande_db(action: str):
-    """Gestion de la base de données"""
-    if action == "init":
-        print("  Initialisation de la base...")
-        subprocess.run([sys.executable, "-m", "flask", "db", "init"])
-        print(" Base initialisée")
-    elif action == "migrate":
-        message = input("Message (optionnel): ").strip()
-        if message:
-            subprocess.run([sys.executable, "-m", "flask", "db", "migrate", "-m", message])
-        else:
-            subprocess.run([sys.executable, "-m", "flask", "db", "migrate"])
-        print(" Migration créée")
-    elif action == "upgrade":
-        subprocess.run([sys.executable, "-m", "flask", "db", "upgrade"])
-        print(" Migrations appliquées")
-    else:
-        print(f" Action '{action}' inconnue")
-
-
-def commande_user(action: str):
-    """Gestion des utilisateurs"""
-    if action == "create":
-        print(" Création admin\n")
-        username = input("Username: ").strip()
-        email = input("Email: ").strip()
-        import getpass
-        password = getpass.getpass("Password: ")
-        
-        try:
-            from app import create_app, db
-            from app.models import User
-            app = create_app()
+
+
+ACTIONS_DB = ('init', 'migrate', 'upgrade', 'downgrade')
+
+
+def charger_app(chemin: str = '.'):
+    """
+    Importe l'application Flask du projet (dossier courant par défaut)
+
+    Cherche `create_app` dans le package `app`, sinon l'objet `app` de
+    app.py ou de run.py.
+    """
+    import importlib
+    chemin = os.path.abspath(chemin)
+    if chemin not in sys.path:
+        sys.path.insert(0, chemin)
+    module = importlib.import_module('app')
+    if hasattr(module, 'create_app'):
+        return module.create_app()
+    if hasattr(module, 'app'):
+        return module.app
+    return importlib.import_module('run').app
+
+
+def commande_db(actions, message: str = None, sql: bool = False,
+                revision: str = None, dossier: str = None) -> bool:
+    """
+    Gestion de la base de données
+
+    L'application est chargée une seule fois et Flask-Migrate est piloté
+    dans ce processus : `seo db migrate upgrade` enchaîne les deux actions.
+
+    Args:
+        actions: Une action ou une liste d'actions (ACTIONS_DB), dans l'ordre
+        sql: Génère le SQL au lieu de l'exécuter (mode hors ligne d'Alembic)
+        revision: Cible de upgrade/downgrade (défaut: head / -1)
+    """
+    if isinstance(actions, str):
+        actions = [actions]
+    inconnues = [action for action in actions if action not in ACTIONS_DB]
+    if inconnues:
+        print(f" Action '{inconnues[0]}' inconnue")
+        return False
+
+    try:
+        import flask_migrate
+    except ImportError:
+        print(" Flask-Migrate n'est pas installé: pip install flask-migrate")
+        return False
+    try:
+        app = charger_app()
+    except (ImportError, AttributeError) as e:
+        print(f" Impossible de charger l'application: {e}")
+        return False
+
+    with app.app_context():
+        for action in actions:
+            if action == "init":
+                print("  Initialisation de la base...")
+                flask_migrate.init(directory=dossier)
+                print(" Base initialisée")
+            elif action == "migrate":
+                if message is None and sys.stdin.isatty():
+                    message = input("Message (optionnel): ").strip() or None
+                flask_migrate.migrate(directory=dossier, message=message)
+                print(" Migration créée")
+            elif action == "upgrade":
+                flask_migrate.upgrade(directory=dossier, revision=revision or 'head', sql=sql)
+                if not sql:
+                    print(" Migrations appliquées")
+            elif action == "downgrade":
+                flask_migrate.downgrade(directory=dossier, revision=revision or '-1', sql=sql)
+                if not sql:
+                    print(" Migration annulée")
+    return True
+
+
+def commande_user(action: str, fichier: str = None, taille_lot: int = None,
+                  workers: int = None) -> bool:
+    """
+    Gestion des utilisateurs
+
+    Args:
+        action: create, list, import ou export
+        fichier: CSV à importer, ou destination de l'export (sortie standard par défaut)
+        taille_lot: Lignes par lot (import/export) ou par page (list)
+        workers: Processus de hachage des mots de passe (import)
+    """
+    from . import utilisateurs
+
+    try:
+        app = charger_app()
+    except (ImportError, AttributeError) as e:
+        print(f" Impossible de charger l'application: {e}")
+        return False
+
+    try:
+        if action == "create":
+            print(" Création admin\n")
+            username = input("Username: ").strip()
+            email = input("Email: ").strip()
+            import getpass
+            password = getpass.getpass("Password: ")
+
+            db = utilisateurs.extension_db(app)
             with app.app_context():
+                User = utilisateurs.trouver_modele_user(db)
                 user = User(username=username, email=email, is_admin=True)
                 user.set_password(password)
                 db.session.add(user)
                 db.session.commit()
                 print(f" Utilisateur '{username}' créé")
-        except ImportError as e:
-            print(f" Erreur: {e}")
-    elif action == "list":
-        try:
-            from app import create_app, db
-            from app.models import User
-            app = create_app()
-            with app.app_context():
-                users = User.query.all()
-                print("\n Utilisateurs:\n")
-                for user in users:
-                    print(f"   {user.username}")
-        except ImportError:
-            print(" Impossible de charger les utilisateurs")
+        elif action == "list":
+            utilisateurs.lister(app, taille_lot or 50)
+        elif action == "import":
+            if not fichier:
+                print(" Fichier CSV requis: seo user import utilisateurs.csv")
+                return False
+            with open(fichier, newline='', encoding='utf-8-sig') as f:
+                total = utilisateurs.importer(app, f, taille_lot or utilisateurs.TAILLE_LOT, workers)
+            print(f" {total} utilisateurs importés")
+        elif action == "export":
+            if fichier and fichier != '-':
+                with open(fichier, 'w', newline='', encoding='utf-8') as f:
+                    total = utilisateurs.exporter(app, f, taille_lot or utilisateurs.TAILLE_LOT)
+                print(f" {total} utilisateurs exportés dans {fichier}")
+            else:
+                try:
+                    utilisateurs.exporter(app, sys.stdout, taille_lot or utilisateurs.TAILLE_LOT)
+                except BrokenPipeError:
+                    # Sortie tronquée par le lecteur (`| head`) : pas une erreur
+                    os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        else:
+            print(f" Action '{action}' inconnue")
+            return False
+    except (LookupError, OSError, utilisateurs.ErreurImport) as e:
+        print(f" Erreur: {e}")
+        return False
+    return True
+
+
+def commande_templates(chemin: str = '.') -> bool:
+    """
+    Précompile les templates Jinja du projet dans son cache de bytecode
+
+    Exécute la commande `flask compiler-templates` enregistrée par le
+    gabarits.py du projet : même liste de templates et même cache que
+    les workers, qui chargent le code compilé au lieu de compiler chaque
+    template à sa première requête.
+    """
+    try:
+        app = charger_app(chemin)
+    except (ImportError, AttributeError) as e:
+        print(f" Impossible de charger l'application: {e}")
+        return False
+    commande = app.cli.commands.get('compiler-templates')
+    if commande is None:
+        print(" Pas de cache de bytecode Jinja (gabarits.init_app) : rien à précompiler")
+        return False
+    from jinja2 import TemplateError
+    try:
+        with app.app_context():
+            commande.main(args=[], prog_name='compiler-templates', standalone_mode=False)
+    except TemplateError as e:
+        print(f" {getattr(e, 'name', None) or 'Template'}: {e}")
+        return False
+    return True
+
+
+CLASSES_WORKER = ('sync', 'gthread', 'gevent')
+CONFIG_GUNICORN = 'gunicorn.conf.py'
+
+
+def cible_wsgi(chemin: str = '.') -> str:
+    """Application à servir, au format module:variable de gunicorn"""
+    if os.path.exists(os.path.join(chemin, 'run.py')):
+        return 'run:app'
+    if os.path.isdir(os.path.join(chemin, 'app')):
+        return 'app:create_app()'
+    return 'app:app'
+
+
+def arguments_gunicorn(cible: str = None, workers: int = None, threads: int = None,
+                       bind: str = None, max_requests: int = None, chemin: str = '.'):
+    """
+    Ligne de commande gunicorn de `seo run prod`
+
+    Le gunicorn.conf.py du projet (ou, à défaut, celui du template pro)
+    dimensionne les workers ; les options explicites le remplacent.
+    """
+    config = os.path.join(chemin, CONFIG_GUNICORN)
+    if not os.path.exists(config):
+        config = os.path.join(os.path.dirname(__file__), 'templates', 'pro', CONFIG_GUNICORN)
+    arguments = ['-c', config]
+    for option, valeur in (('--workers', workers), ('--threads', threads),
+                           ('--bind', bind), ('--max-requests', max_requests)):
+        if valeur is not None:
+            arguments += [option, str(valeur)]
+    return arguments + [cible or cible_wsgi(chemin)]
+
 
+def commande_run(mode: str = "dev", profil=None, **options) -> bool:
+    """
+    Lance l'application
 
-def commande_run(mode: str = "dev"):
-    """Lance l'application"""
+    Args:
+        profil: Options de seo.profilage (--profile), ou None
+        options: En production, worker_class et paramètres de arguments_gunicorn
+    """
+    import subprocess
+    if profil is not None:
+        # Lues par le processus de l'application (python -m seo.profilage, gunicorn.conf.py)
+        os.environ.update(profil.vers_environnement())
+        print(f" Profilage {profil.mode}: {profil.dossier} (rapport: seo profile report)")
     if mode == "dev":
         print(" Mode développement...\n")
         os.environ["FLASK_ENV"] = "development"
         os.environ["FLASK_DEBUG"] = "1"
-        if Path("run.py").exists():
-            subprocess.run([sys.executable, "run.py"])
-        elif Path("app.py").exists():
-            subprocess.run([sys.executable, "app.py"])
+        lanceur = [sys.executable, "-m", "seo.profilage"] if profil is not None else [sys.executable]
+        if os.path.exists("run.py"):
+            subprocess.run([*lanceur, "run.py"])
+        elif os.path.exists("app.py"):
+            subprocess.run([*lanceur, "app.py"])
+        elif profil is not None:
+            subprocess.run([*lanceur, "-m", "flask", "run", "--debug", "--no-reload"])
         else:
             subprocess.run([sys.executable, "-m", "flask", "run", "--debug"])
+    elif mode == "prod":
+        import importlib.util
+        if sys.platform == 'win32':
+            print(" gunicorn ne fonctionne pas sous Windows: utilisez Docker ou WSL")
+            return False
+        if importlib.util.find_spec('gunicorn') is None:
+            print(" gunicorn n'est pas installé: pip install gunicorn")
+            return False
+        worker_class = options.pop('worker_class', None)
+        if worker_class:
+            # Lu par gunicorn.conf.py : le dimensionnement suit le modèle de worker
+            os.environ['GUNICORN_WORKER_CLASS'] = worker_class
+        # Aussi par la configuration de l'application, qui en déduit la taille des pools SQL
+        for variable, valeur in (('WEB_CONCURRENCY', options.get('workers')),
+                                 ('GUNICORN_THREADS', options.get('threads'))):
+            if valeur is not None:
+                os.environ[variable] = str(valeur)
+        if os.environ.get('GUNICORN_WORKER_CLASS') == 'gevent' and importlib.util.find_spec('gevent') is None:
+            print(" Le worker gevent nécessite gevent: pip install gevent")
+            return False
+        os.environ.setdefault("FLASK_ENV", "production")
+        commande = [sys.executable, '-m', 'gunicorn', *arguments_gunicorn(**options)]
+        print(f" Mode production: {' '.join(commande[2:])}\n", flush=True)
+        # gunicorn remplace ce processus : il reçoit directement les signaux (conteneurs)
+        os.execv(sys.executable, commande)
+    return True
 
 
 def afficher_aide():
@@ -85,9 +267,25 @@ def afficher_aide():
     print("  seo db init      - Initialiser")
     print("  seo db migrate   - Créer migration")
     print("  seo db upgrade   - Appliquer")
+    print("  seo db downgrade - Annuler la dernière")
+    print("  seo db migrate upgrade     - Enchaîner (une seule initialisation)")
+    print("  seo db upgrade --sql       - Générer le SQL sans l'exécuter")
     print("\n Utilisateurs:")
     print("  seo user create  - Créer admin")
-    print("  seo user list    - Lister")
+    print("  seo user list    - Lister (par pages)")
+    print("  seo user import utilisateurs.csv - Import en masse")
+    print("  seo user export [fichier.csv]    - Export CSV")
     print("\n Lancement:")
     print("  seo run          - Mode dev")
+    print("  seo run prod     - gunicorn (--worker-class sync|gthread|gevent)")
+    print("  seo bench        - Banc de charge (--compare)")
+    print("  seo bench --url URL        - Banc d'un serveur lancé (API asynchrone, comparaison)")
+    print("  seo run --profile [sample] - Profils par requête dans .seo/profils (sample: prod)")
+    print("  seo profile report         - Fonctions les plus coûteuses des profils")
+    print("  seo assets build           - static/dist : minifiés, versionnés, .gz/.br")
+    print("  seo templates compile      - Précompiler les templates Jinja (cache de bytecode)")
+    print("  seo templates archive      - Précompiler les archives des templates SEO (image, CI)")
+    print("\n Environnement:")
+    print("  seo status       - État de l'installation en arrière-plan")
+    print("  seo upgrade      - Mettre à jour avec les templates installés")
     print("\n" + "="*60 + "\n")
@@ -0,0 +1,203 @@
+"""
+Installation des dépendances des projets générés
+
+1. Résolution : la liste ``packages`` d'un générateur est résolue une
+   seule fois en un lock figé (``nom==version``), mis en cache par pile.
+2. Wheelhouse : les wheels du lock sont construites une fois dans un
+   dossier local partagé, indexé par le hash du lock.
+3. Installation : chaque projet reçoit son propre venv, installé hors
+   ligne depuis le wheelhouse (``--no-index``). Le venv est créé sans
+   ensurepip (le plus lent de l'opération) : le pip de l'hôte y installe
+   le lock puis pip lui-même via ``--python`` (pip >= 22.3).
+
+Une pile déjà vue s'installe donc sans accès réseau.
+"""
+import hashlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Iterable, List, NamedTuple, Optional
+
+from .utils import repertoire_cache
+
+NOM_LOCK = 'requirements.lock'
+NOM_VENV = 'venv'
+MARQUEUR_COMPLET = '.complet'
+
+
+class ErreurInstallation(Exception):
+    """Échec de la résolution, du téléchargement ou de l'installation"""
+
+
+class Installation(NamedTuple):
+    """Résultat de l'installation d'un projet"""
+    lock: Path
+    venv: Path
+    wheelhouse: Path
+    hors_ligne: bool
+    duree: float
+
+    def __str__(self):
+        source = "wheelhouse local, hors ligne" if self.hors_ligne else "résolution + téléchargement"
+        return f"venv {self.venv} prêt en {self.duree:.1f} s ({source})"
+
+
+def _pip(*arguments, python: str = sys.executable) -> subprocess.CompletedProcess:
+    """Lance pip et lève ErreurInstallation en cas d'échec"""
+    resultat = subprocess.run([python, '-m', 'pip', *arguments, '--disable-pip-version-check'],
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                              universal_newlines=True)
+    if resultat.returncode != 0:
+        detail = (resultat.stderr or resultat.stdout).strip().splitlines()[-5:]
+        raise ErreurInstallation("La commande pip a échoué:\n   " + "\n   ".join(detail))
+    return resultat
+
+
+def _version_pip() -> tuple:
+    """Version du pip de l'interpréteur courant"""
+    try:
+        import pip
+    except ImportError:
+        raise ErreurInstallation("pip n'est pas disponible pour cet interpréteur")
+    return tuple(int(partie) for partie in pip.__version__.split('.')[:2] if partie.isdigit())
+
+
+def _signature_plateforme() -> str:
+    """La résolution dépend des marqueurs d'environnement (version Python, OS, architecture)"""
+    return f"{sys.implementation.name}{sys.version_info[0]}.{sys.version_info[1]}-{sys.platform}-{platform.machine()}"
+
+
+def cle_pile(packages: Iterable[str]) -> str:
+    """Identifiant d'une pile de dépendances pour la plateforme courante"""
+    normalises = sorted({p.strip().lower().replace('_', '-') for p in packages})
+    contenu = json.dumps([normalises, _signature_plateforme()])
+    return hashlib.sha256(contenu.encode('utf-8')).hexdigest()[:16]
+
+
+def resoudre(packages: List[str], rafraichir: bool = False) -> str:
+    """
+    Résout les packages en un lock figé, une seule fois par pile
+
+    Returns:
+        Contenu du lock (format requirements, une ligne nom==version)
+    """
+    cache = repertoire_cache() / 'locks' / f"{cle_pile(packages)}.txt"
+    if cache.exists() and not rafraichir:
+        return cache.read_text(encoding='utf-8')
+
+    with tempfile.TemporaryDirectory() as temporaire:
+        rapport = Path(temporaire) / 'rapport.json'
+        _pip('install', '--dry-run', '--ignore-installed', '--quiet',
+             '--report', str(rapport), *packages)
+        installes = json.loads(rapport.read_text(encoding='utf-8'))['install']
+
+    epingles = sorted(f"{p['metadata']['name']}=={p['metadata']['version']}" for p in installes)
+    contenu = (
+        "# Généré par seo-dev-env - ne pas modifier à la main\n"
+        f"# packages: {', '.join(packages)}\n"
+        f"# plateforme: {_signature_plateforme()}\n"
+        + "\n".join(epingles) + "\n"
+    )
+    cache.parent.mkdir(parents=True, exist_ok=True)
+    temporaire = cache.parent / f'{cache.name}.{os.getpid()}.tmp'
+    temporaire.write_text(contenu, encoding='utf-8')
+    os.replace(temporaire, cache)
+    return contenu
+
+
+def chemin_wheelhouse(lock: str) -> Path:
+    """Dossier des wheels d'un lock"""
+    return repertoire_cache() / 'wheelhouse' / hashlib.sha256(lock.encode('utf-8')).hexdigest()[:16]
+
+
+def preparer_wheelhouse(lock: str) -> Path:
+    """Construit (une fois) les wheels de toutes les entrées du lock"""
+    wheelhouse = chemin_wheelhouse(lock)
+    if (wheelhouse / MARQUEUR_COMPLET).exists():
+        return wheelhouse
+    if wheelhouse.exists():
+        # Reste d'une construction interrompue
+        shutil.rmtree(wheelhouse, ignore_errors=True)
+    cle = wheelhouse.name
+
+    # Construction à côté puis renommage : plusieurs générations peuvent tourner en parallèle
+    wheelhouse.parent.mkdir(parents=True, exist_ok=True)
+    temporaire = Path(tempfile.mkdtemp(dir=wheelhouse.parent, prefix=f'{cle}.'))
+    try:
+        fichier_lock = temporaire / NOM_LOCK
+        fichier_lock.write_text(lock, encoding='utf-8')
+        _pip('wheel', '--no-deps', '--quiet', '-r', str(fichier_lock), '-w', str(temporaire))
+        # pip lui-même, pour équiper les venvs créés sans ensurepip
+        _pip('download', '--no-deps', '--quiet', 'pip', '-d', str(temporaire))
+        (temporaire / MARQUEUR_COMPLET).touch()
+        try:
+            os.replace(temporaire, wheelhouse)
+        except OSError:
+            # Un autre processus a terminé le même wheelhouse entre-temps
+            if not (wheelhouse / MARQUEUR_COMPLET).exists():
+                raise
+    finally:
+        shutil.rmtree(temporaire, ignore_errors=True)
+    return wheelhouse
+
+
+def python_venv(venv: Path) -> Path:
+    """Interpréteur d'un venv"""
+    if sys.platform == 'win32':
+        return venv / 'Scripts' / 'python.exe'
+    return venv / 'bin' / 'python'
+
+
+def creer_venv(chemin_projet, avec_pip: bool = True) -> Path:
+    """Crée le venv du projet s'il n'existe pas"""
+    venv = Path(chemin_projet) / NOM_VENV
+    if not python_venv(venv).exists():
+        options = [] if avec_pip else ['--without-pip']
+        resultat = subprocess.run([sys.executable, '-m', 'venv', *options, str(venv)],
+                                  stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                  universal_newlines=True)
+        if resultat.returncode != 0:
+            raise ErreurInstallation(f"Création du venv impossible: {resultat.stdout.strip()}")
+    return venv
+
+
+ETAPES = ('resolution', 'wheelhouse', 'venv')
+
+
+def installer_projet(packages: List[str], chemin_projet,
+                     suivi: Optional[Callable[[str], None]] = None) -> Installation:
+    """
+    Résout, prépare le wheelhouse et installe hors ligne dans le venv du projet
+
+    Args:
+        suivi: Appelé avec le nom de chaque étape (ETAPES) au moment où elle commence
+    """
+    suivi = suivi or (lambda etape: None)
+    debut = time.perf_counter()
+    chemin_projet = Path(chemin_projet)
+    lock_en_cache = (repertoire_cache() / 'locks' / f"{cle_pile(packages)}.txt").exists()
+
+    suivi('resolution')
+    lock = resoudre(packages)
+    hors_ligne = lock_en_cache and (chemin_wheelhouse(lock) / MARQUEUR_COMPLET).exists()
+    suivi('wheelhouse')
+    wheelhouse = preparer_wheelhouse(lock)
+
+    fichier_lock = chemin_projet / NOM_LOCK
+    fichier_lock.write_text(lock, encoding='utf-8')
+
+    suivi('venv')
+    options = ['install', '--quiet', '--no-index', '--find-links', str(wheelhouse), '-r', str(fichier_lock)]
+    if _version_pip() >= (22, 3):
+        venv = creer_venv(chemin_projet, avec_pip=False)
+        _pip('--python', str(python_venv(venv)), *options, 'pip')
+    else:
+        venv = creer_venv(chemin_projet)
+        _pip(*options, python=str(python_venv(venv)))
+    return Installation(fichier_lock, venv, wheelhouse, hors_ligne, time.perf_counter() - debut)
@@ -0,0 +1,331 @@
+"""
+Point d'entrée de la commande `seo`
+
+Le lanceur ne charge que ce dont la sous-commande demandée a besoin :
+ni argparse pour `seo help`, ni les générateurs pour `seo run` ou
+`seo db upgrade`. Chaque commande déclare ses options dans une fonction
+et importe son module au moment de l'exécution. test_demarrage.py
+vérifie ce budget avec `python -X importtime`.
+"""
+import os
+import sys
+
+from . import __version__
+
+# Commandes qui importent ou servent l'application : exécutées par le Python du venv du projet
+COMMANDES_PROJET = {'run', 'db', 'user', 'templates', 'bench'}
+# installation.NOM_VENV (module non chargé ici : chemin rapide)
+NOM_VENV = 'venv'
+
+
+def _options_create(parser):
+    parser.add_argument('nom', nargs='?', help='Nom du projet (optionnel, sera demandé si non fourni)')
+    parser.add_argument('--from', dest='manifeste', metavar='MANIFESTE',
+                        help='Générer tous les projets d\'un manifeste JSON/YAML (non interactif)')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help='Nombre de processus pour --from (défaut: nombre de CPU)')
+    parser.add_argument('--no-install', dest='installer', action='store_false',
+                        help='Ne pas installer les dépendances')
+    parser.add_argument('--background', dest='arriere_plan', action='store_true',
+                        help='Installer les dépendances en arrière-plan (suivi: seo status)')
+
+
+def _create(args):
+    if args.manifeste:
+        from .lot import creer_depuis_manifeste
+        if not creer_depuis_manifeste(args.manifeste, args.jobs, args.installer):
+            sys.exit(1)
+    else:
+        from .generators import creer_projet_interactif
+        creer_projet_interactif(args.nom, args.installer, args.arriere_plan)
+
+
+def _options_db(parser):
+    parser.add_argument('actions', nargs='+', metavar='action',
+                        choices=['init', 'migrate', 'upgrade', 'downgrade'],
+                        help='init, migrate, upgrade ou downgrade (enchaînables)')
+    parser.add_argument('-m', '--message', help='Message de la migration')
+    parser.add_argument('--sql', action='store_true',
+                        help='Afficher le SQL de upgrade/downgrade sans l\'exécuter')
+    parser.add_argument('-r', '--revision', help='Révision cible de upgrade/downgrade')
+    parser.add_argument('-d', '--directory', dest='dossier', help='Dossier des migrations')
+
+
+def _db(args):
+    from .commandes import commande_db
+    if not commande_db(args.actions, args.message, args.sql, args.revision, args.dossier):
+        sys.exit(1)
+
+
+def _options_user(parser):
+    parser.add_argument('action', choices=['create', 'list', 'import', 'export'])
+    parser.add_argument('fichier', nargs='?',
+                        help='CSV à importer, ou destination de l\'export (défaut: sortie standard)')
+    parser.add_argument('--batch-size', dest='taille_lot', type=int, default=None,
+                        help='Lignes par lot pour import/export (défaut: 1000), par page pour list (défaut: 50)')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help='Processus de hachage des mots de passe (défaut: nombre de CPU)')
+
+
+def _user(args):
+    from .commandes import commande_user
+    if not commande_user(args.action, args.fichier, args.taille_lot, args.jobs):
+        sys.exit(1)
+
+
+def _options_run(parser):
+    parser.add_argument('mode', nargs='?', default='dev', choices=['dev', 'prod'])
+    production = parser.add_argument_group('production (gunicorn, défauts: gunicorn.conf.py)')
+    production.add_argument('--worker-class', choices=['sync', 'gthread', 'gevent'],
+                            help='Modèle de worker (défaut: gthread)')
+    production.add_argument('--workers', '-w', type=int, help='Nombre de processus (défaut: selon les CPU)')
+    production.add_argument('--threads', type=int, help='Threads par worker gthread (défaut: 4)')
+    production.add_argument('--bind', '-b', help='Adresse d\'écoute (défaut: 0.0.0.0:5000)')
+    production.add_argument('--max-requests', type=int,
+                            help='Requêtes avant recyclage d\'un worker (défaut: 1000)')
+    production.add_argument('--app', dest='cible', help='Application WSGI (défaut: run:app ou app:create_app())')
+    profilage = parser.add_argument_group('profilage (rapport: seo profile report)')
+    profilage.add_argument('--profile', dest='profil', nargs='?', const='cprofile', choices=['cprofile', 'sample'],
+                           help='Profil de chaque requête: cprofile (défaut) ou sample (échantillonnage, production)')
+    profilage.add_argument('--profile-dir', dest='profil_dossier', metavar='DOSSIER', help='Dossier des profils (défaut: .seo/profils)')
+    profilage.add_argument('--profile-path', dest='profil_chemins', action='append', default=[], metavar='PREFIXE',
+                           help='Ne profiler que les chemins commençant par PREFIXE (répétable)')
+    profilage.add_argument('--profile-min-ms', dest='profil_duree_min', type=float, default=0, metavar='MS',
+                           help='Ne garder que les requêtes d\'au moins N ms')
+    profilage.add_argument('--profile-interval-ms', dest='profil_intervalle', type=float, default=5, metavar='MS',
+                           help='Intervalle d\'échantillonnage en ms (mode sample, défaut: 5)')
+
+
+def _run(args):
+    from .commandes import commande_run
+    options = {}
+    if args.mode == 'prod':
+        options = dict(cible=args.cible, worker_class=args.worker_class, workers=args.workers,
+                       threads=args.threads, bind=args.bind, max_requests=args.max_requests)
+    if args.profil:
+        from .profilage import Options
+        options['profil'] = Options(args.profil, args.profil_dossier or Options().dossier,
+                                    tuple(args.profil_chemins), args.profil_duree_min, args.profil_intervalle)
+    if not commande_run(args.mode, **options):
+        sys.exit(1)
+
+
+def _options_status(parser):
+    parser.add_argument('chemin', nargs='?', default='.', help='Dossier du projet (défaut: dossier actuel)')
+    parser.add_argument('--wait', dest='attendre', action='store_true',
+                        help='Attendre la fin de l\'installation')
+
+
+def _status(args):
+    from .arriere_plan import afficher_statut
+    if not afficher_statut(args.chemin, args.attendre):
+        sys.exit(1)
+
+
+def _options_upgrade(parser):
+    parser.add_argument('chemin', nargs='?', default='.', help='Dossier du projet (défaut: dossier actuel)')
+    parser.add_argument('--dry-run', dest='simulation', action='store_true',
+                        help='Afficher les changements sans rien écrire')
+    parser.add_argument('--force', dest='forcer', action='store_true',
+                        help='Écraser aussi les fichiers modifiés localement')
+
+
+def _upgrade(args):
+    from .mise_a_jour import afficher_rapport, mettre_a_jour
+    try:
+        rapport = mettre_a_jour(args.chemin, args.simulation, args.forcer)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"🚫 {e}")
+        sys.exit(1)
+    afficher_rapport(rapport, args.simulation)
+    if rapport.conflits:
+        sys.exit(1)
+
+
+def _entier_positif(valeur: str) -> int:
+    import argparse
+    try:
+        nombre = int(valeur)
+    except ValueError:
+        nombre = 0
+    if nombre < 1:
+        raise argparse.ArgumentTypeError(f"entier >= 1 attendu: {valeur}")
+    return nombre
+
+
+def _options_bench(parser):
+    parser.add_argument('chemin', nargs='?', default='.', help='Dossier du projet (défaut: dossier actuel)')
+    parser.add_argument('--duration', dest='duree', type=float, default=10,
+                        help='Durée de la mesure en secondes (défaut: 10)')
+    parser.add_argument('--concurrency', '-c', dest='concurrence', type=_entier_positif, default=8,
+                        help='Clients simultanés (défaut: 8)')
+    parser.add_argument('--users', dest='utilisateurs', type=int, default=20,
+                        help='Utilisateurs créés dans la base du banc (défaut: 20)')
+    parser.add_argument('--tasks', dest='taches', type=int, default=50,
+                        help='Tâches par utilisateur (défaut: 50)')
+    parser.add_argument('--database-url', dest='url_base',
+                        help='Base jetable à utiliser au lieu d\'un SQLite temporaire')
+    parser.add_argument('--url', dest='urls', action='append', metavar='URL',
+                        help='Mesurer cette route d\'un serveur déjà lancé (ASGI, comparaison de variantes) ; '
+                             'répétable')
+    parser.add_argument('--compare', dest='reference', nargs='?', const='dernier', metavar='FICHIER',
+                        help='Comparer à un résultat JSON (défaut: la dernière exécution)')
+    parser.add_argument('--output', '-o', dest='sortie', help='Fichier JSON des résultats (défaut: .seo/bench/)')
+
+
+def _bench(args):
+    import json
+    from .bench import afficher, dernier_resultat, enregistrer, executer_bench
+    try:
+        resultats = executer_bench(args.chemin, args.duree, args.concurrence, args.utilisateurs,
+                                   args.taches, args.url_base, args.urls)
+    except (ImportError, LookupError, AttributeError, OSError) as e:
+        print(f"🚫 Banc impossible: {e}")
+        sys.exit(1)
+    fichier = enregistrer(resultats, args.chemin, args.sortie)
+    reference = None
+    if args.reference:
+        chemin_reference = (dernier_resultat(args.chemin, exclure=fichier)
+                            if args.reference == 'dernier' else args.reference)
+        if chemin_reference:
+            with open(chemin_reference, encoding='utf-8') as f:
+                reference = json.load(f)
+    afficher(resultats, reference)
+    print(f" Résultats: {fichier}")
+
+
+def _options_profile(parser):
+    parser.add_argument('action', choices=['report'])
+    parser.add_argument('dossier', nargs='?', help='Dossier des profils (défaut: .seo/profils)')
+    parser.add_argument('--limit', '-n', dest='limite', type=int, default=20,
+                        help='Nombre de fonctions affichées (défaut: 20)')
+    parser.add_argument('--sort', dest='tri', choices=['propre', 'cumul'], default='propre',
+                        help='propre: temps dans la fonction (défaut), cumul: appels compris')
+    parser.add_argument('--collapsed', dest='fusion', metavar='FICHIER',
+                        help='Écrire les piles fusionnées des profils sample (flamegraph.pl, speedscope)')
+
+
+def _profile(args):
+    from .profilage import Options, afficher_rapport, construire_rapport
+    try:
+        rapport = construire_rapport(args.dossier or Options().dossier, args.tri, args.fusion)
+    except (OSError, ValueError) as e:
+        print(f"🚫 {e}")
+        sys.exit(1)
+    afficher_rapport(rapport, args.limite)
+    if args.fusion:
+        print(f" Piles fusionnées: {args.fusion}")
+
+
+def _options_assets(parser):
+    parser.add_argument('action', choices=['build'])
+    parser.add_argument('chemin', nargs='?', default='.', help='Dossier du projet (défaut: dossier actuel)')
+    parser.add_argument('--static', dest='statique', metavar='DOSSIER',
+                        help='Dossier des fichiers statiques (défaut: static/ ou app/static/)')
+    parser.add_argument('--no-minify', dest='minifier', action='store_false',
+                        help='Copier CSS et JS sans les minifier')
+
+
+def _assets(args):
+    from .statiques import afficher_resultat, construire
+    try:
+        resultat = construire(args.chemin, args.statique, args.minifier)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"🚫 {e}")
+        sys.exit(1)
+    afficher_resultat(resultat)
+
+
+def _options_templates(parser):
+    parser.add_argument('action', choices=['compile', 'archive'],
+                        help='compile: templates Jinja du projet ; archive: archives des templates SEO '
+                             '(étape de build, image Docker, CI)')
+    parser.add_argument('chemin', nargs='?', default='.', help='Dossier du projet (défaut: dossier actuel)')
+
+
+def _templates(args):
+    if args.action == 'archive':
+        from .archives import construire_archives
+        try:
+            archives = construire_archives()
+        except OSError as e:
+            print(f"🚫 Cache des templates non inscriptible: {e}")
+            sys.exit(1)
+        dossier = next(iter(archives.values())).parent if archives else None
+        print(f"✅ {len(archives)} archive(s) de templates précompilée(s) dans {dossier}")
+        return
+    from .commandes import commande_templates
+    if not commande_templates(args.chemin):
+        sys.exit(1)
+
+
+def _executer_dans_le_venv(chemin: str, argv):
+    """
+    Relance la commande avec l'interpréteur du venv du projet, s'il existe
+
+    Les dépendances du projet (flask, flask-migrate, gunicorn...) sont
+    installées dans <projet>/venv, pas dans l'environnement de seo. seo
+    reste importable : son dossier est ajouté en fin de sys.path, après
+    les paquets du venv, qui gardent la priorité.
+    """
+    venv = os.path.join(os.path.abspath(chemin), NOM_VENV)
+    if sys.platform == 'win32':
+        python = os.path.join(venv, 'Scripts', 'python.exe')
+    else:
+        python = os.path.join(venv, 'bin', 'python')
+    if not os.path.exists(python) or os.path.realpath(sys.prefix) == os.path.realpath(venv):
+        return
+    racine = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    amorce = f"import sys; sys.path.append({racine!r}); from seo.lanceur import main; main(sys.argv[1:])"
+    sys.stdout.flush()
+    os.execv(python, [python, '-c', amorce, *argv])
+
+
+# nom -> (aide, déclaration des options, exécution)
+COMMANDES = {
+    'create': ('Créer un nouveau projet (mode interactif)', _options_create, _create),
+    'db': ('Gestion de la base de données', _options_db, _db),
+    'user': ('Gestion des utilisateurs', _options_user, _user),
+    'run': ('Lancer l\'application', _options_run, _run),
+    'status': ('État de l\'installation en arrière-plan', _options_status, _status),
+    'upgrade': ('Mettre à jour un projet avec les templates installés', _options_upgrade, _upgrade),
+    'bench': ('Banc de charge de l\'application du projet', _options_bench, _bench),
+    'profile': ('Rapport des profils de `seo run --profile`', _options_profile, _profile),
+    'assets': ('Construire les fichiers statiques (minifiés, versionnés, compressés)', _options_assets, _assets),
+    'templates': ('Précompiler les templates Jinja du projet ou les archives des templates SEO', _options_templates, _templates),
+}
+
+
+def _afficher_aide():
+    from .commandes import afficher_aide
+    afficher_aide()
+
+
+def main(argv=None):
+    """Point d'entrée principal pour le CLI"""
+    argv = sys.argv[1:] if argv is None else list(argv)
+
+    # Si aucune commande, afficher l'aide
+    if not argv or argv[0] in ('help', '-h', '--help'):
+        _afficher_aide()
+        return
+    if argv[0] in ('--version', '-V'):
+        print(f"seo-dev-env {__version__}")
+        return
+
+    commande = COMMANDES.get(argv[0])
+    if commande is None:
+        print(f"🚫 Commande inconnue: {argv[0]}")
+        _afficher_aide()
+        sys.exit(2)
+
+    # argparse n'est chargé que pour analyser les options de la commande choisie
+    import argparse
+
+    aide, declarer_options, executer = commande
+    parser = argparse.ArgumentParser(prog=f'seo {argv[0]}', description=aide)
+    declarer_options(parser)
+    args = parser.parse_args(argv[1:])
+    if argv[0] in COMMANDES_PROJET:
+        _executer_dans_le_venv(getattr(args, 'chemin', '.'), argv)
+    executer(args)
@@ -0,0 +1,233 @@
+"""
+Génération non interactive de plusieurs projets à partir d'un manifeste
+
+Le manifeste (JSON, ou YAML si PyYAML est installé) est une liste de
+préférences au format de ``collecter_preferences``. Toutes les entrées
+sont validées avant de commencer, puis générées en parallèle sur un
+pool de processus.
+"""
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple
+
+TYPES_PROJET = ('apprentissage', 'application', 'api', 'saas', 'api_async')
+BASES_DONNEES = ('sqlite', 'postgresql', 'mysql')
+AUTHS = ('session', 'jwt', 'oauth')
+OPTIONS = ('docker', 'stripe', 'email', 'celery', 'git')
+
+
+class ManifesteInvalide(ValueError):
+    """Manifeste illisible ou entrées invalides"""
+
+    def __init__(self, erreurs: List[str]):
+        super().__init__("\n".join(erreurs))
+        self.erreurs = erreurs
+
+
+class ResultatProjet(NamedTuple):
+    """Résultat de la génération d'un projet du lot"""
+    nom_projet: str
+    duree: float
+    packages: List[str]
+    erreur: str
+    sortie: str
+
+    @property
+    def reussi(self) -> bool:
+        return not self.erreur
+
+
+def charger_manifeste(chemin) -> List[Dict[str, Any]]:
+    """Lit un manifeste JSON ou YAML (liste, ou objet avec une clé 'projets')"""
+    chemin = Path(chemin)
+    with open(chemin, encoding='utf-8-sig') as f:
+        if chemin.suffix in ('.yml', '.yaml'):
+            try:
+                import yaml
+            except ImportError:
+                raise ManifesteInvalide(["PyYAML est requis pour un manifeste YAML: pip install pyyaml"])
+            donnees = yaml.safe_load(f)
+        else:
+            try:
+                donnees = json.load(f)
+            except ValueError as e:
+                raise ManifesteInvalide([f"JSON invalide: {e}"])
+    if isinstance(donnees, dict):
+        donnees = donnees.get('projets')
+    if not isinstance(donnees, list):
+        raise ManifesteInvalide(["Le manifeste doit être une liste de projets (ou {'projets': [...]})"])
+    return donnees
+
+
+def completer_preferences(preferences: Dict[str, Any]) -> Dict[str, Any]:
+    """Applique les valeurs par défaut du mode interactif"""
+    type_projet = preferences.get('type_projet')
+    complet = {
+        'base_donnees': 'postgresql' if type_projet in ('api', 'saas', 'api_async') else 'sqlite',
+        'auth': 'jwt' if type_projet in ('api', 'api_async') else 'session',
+        'docker': type_projet != 'apprentissage',
+        'git': True,
+    }
+    if type_projet == 'saas':
+        complet.update(stripe=True, email=True, celery=True)
+    complet.update(preferences)
+    return complet
+
+
+def valider_preferences(preferences: Any) -> List[str]:
+    """Retourne la liste des erreurs d'une entrée (vide si valide)"""
+    if not isinstance(preferences, dict):
+        return ["l'entrée doit être un objet"]
+    erreurs = []
+    nom = preferences.get('nom_projet')
+    if not isinstance(nom, str) or not nom.strip():
+        erreurs.append("'nom_projet' manquant")
+    if preferences.get('type_projet') not in TYPES_PROJET:
+        erreurs.append(f"'type_projet' doit valoir {', '.join(TYPES_PROJET)}")
+    if preferences.get('base_donnees', 'sqlite') not in BASES_DONNEES:
+        erreurs.append(f"'base_donnees' doit valoir {', '.join(BASES_DONNEES)}")
+    if preferences.get('auth', 'session') not in AUTHS:
+        erreurs.append(f"'auth' doit valoir {', '.join(AUTHS)}")
+    for option in OPTIONS:
+        if not isinstance(preferences.get(option, False), bool):
+            erreurs.append(f"'{option}' doit être un booléen")
+    return erreurs
+
+
+def valider_manifeste(entrees: List[Any]) -> List[Dict[str, Any]]:
+    """Valide toutes les entrées avant toute génération"""
+    erreurs, projets, chemins = [], [], {}
+    for i, entree in enumerate(entrees, 1):
+        problemes = valider_preferences(entree)
+        if not problemes:
+            chemin = Path(entree['nom_projet']).resolve()
+            if chemin in chemins:
+                problemes.append(f"même dossier que le projet n°{chemins[chemin]}")
+            elif chemin.exists() and any(chemin.iterdir()):
+                problemes.append(f"le dossier {chemin} existe et n'est pas vide")
+            chemins[chemin] = i
+        nom = entree.get('nom_projet', '?') if isinstance(entree, dict) else '?'
+        erreurs.extend(f"projet n°{i} ({nom}): {probleme}" for probleme in problemes)
+        if not problemes:
+            projets.append(completer_preferences(entree))
+    if erreurs:
+        raise ManifesteInvalide(erreurs)
+    return projets
+
+
+def _generer_projet(preferences: Dict[str, Any]) -> ResultatProjet:
+    """Génère un projet dans un processus du pool (sortie capturée)"""
+    from .generators import creer_generateur
+
+    sortie = io.StringIO()
+    debut = time.perf_counter()
+    packages, erreur = [], ''
+    try:
+        with redirect_stdout(sortie):
+            generator = creer_generateur(preferences)
+            generator.installer = False
+            generator.generer()
+            packages = generator.packages
+    except Exception as e:
+        erreur = f"{type(e).__name__}: {e}"
+    return ResultatProjet(preferences['nom_projet'], time.perf_counter() - debut,
+                          packages, erreur, sortie.getvalue())
+
+
+def generer_lot(projets: List[Dict[str, Any]], jobs: int = None) -> List[ResultatProjet]:
+    """Génère les projets validés, en parallèle sur `jobs` processus"""
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(projets)))
+    resultats = []
+    if jobs == 1:
+        for preferences in projets:
+            resultats.append(_generer_projet(preferences))
+            _afficher_resultat(resultats[-1])
+        return resultats
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_generer_projet, preferences) for preferences in projets]
+        for future in as_completed(futures):
+            resultats.append(future.result())
+            _afficher_resultat(resultats[-1])
+    return resultats
+
+
+def _afficher_resultat(resultat: ResultatProjet):
+    if resultat.reussi:
+        print(f"  ✅ {resultat.nom_projet:<30} {resultat.duree:6.2f} s")
+    else:
+        print(f"  ❌ {resultat.nom_projet:<30} {resultat.duree:6.2f} s  {resultat.erreur}")
+
+
+def afficher_synthese(resultats: List[ResultatProjet], duree_totale: float):
+    """Résumé agrégé du lot"""
+    reussis = [r for r in resultats if r.reussi]
+    cumul = sum(r.duree for r in resultats)
+    print("\n" + "="*60)
+    print(" Synthèse")
+    print("="*60)
+    print(f"\n   Projets: {len(reussis)}/{len(resultats)} générés")
+    print(f"   Durée totale: {duree_totale:.2f} s (cumul séquentiel {cumul:.2f} s, "
+          f"accélération x{cumul / duree_totale if duree_totale else 1:.1f})")
+    if resultats:
+        durees = sorted(r.duree for r in resultats)
+        print(f"   Par projet: min {durees[0]:.2f} s, médiane {durees[len(durees) // 2]:.2f} s, "
+              f"max {durees[-1]:.2f} s")
+    print("\n" + "="*60 + "\n")
+
+
+def installer_lot(resultats: List[ResultatProjet], jobs: int = None):
+    """Résout chaque pile une seule fois, puis installe les venvs hors ligne en parallèle"""
+    from concurrent.futures import ThreadPoolExecutor
+    from .installation import ErreurInstallation, installer_projet, preparer_wheelhouse, resoudre
+
+    a_installer = [r for r in resultats if r.reussi and r.packages]
+    if not a_installer:
+        return
+    piles = {tuple(sorted(r.packages)): r.packages for r in a_installer}
+    print(f"🔧 Préparation de {len(piles)} piles de dépendances pour {len(a_installer)} projets...")
+    for packages in piles.values():
+        try:
+            preparer_wheelhouse(resoudre(packages))
+        except ErreurInstallation as e:
+            print(f"  ⚠️ {e}")
+
+    def installer(resultat: ResultatProjet):
+        try:
+            print(f"  📦 {resultat.nom_projet}: {installer_projet(resultat.packages, resultat.nom_projet)}")
+        except ErreurInstallation as e:
+            print(f"  ⚠️ {resultat.nom_projet}: {e}")
+
+    # Les installations sont des sous-processus pip : des threads suffisent
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        list(pool.map(installer, a_installer))
+
+
+def creer_depuis_manifeste(chemin, jobs: int = None, installer: bool = True) -> bool:
+    """Point d'entrée de `seo create --from manifeste.json`"""
+    try:
+        projets = valider_manifeste(charger_manifeste(chemin))
+    except (OSError, ManifesteInvalide) as e:
+        print("🚫 Manifeste invalide, aucun projet généré:")
+        for erreur in getattr(e, 'erreurs', [str(e)]):
+            print(f"   - {erreur}")
+        return False
+
+    print(f"🏗️ Génération de {len(projets)} projets ({jobs or os.cpu_count()} processus)...\n")
+    debut = time.perf_counter()
+    resultats = generer_lot(projets, jobs)
+    duree = time.perf_counter() - debut
+
+    for resultat in resultats:
+        if not resultat.reussi and resultat.sortie:
+            print(f"\n--- Sortie de {resultat.nom_projet} ---\n{resultat.sortie}")
+    if installer:
+        installer_lot(resultats, jobs)
+    afficher_synthese(resultats, duree)
+    return all(r.reussi for r in resultats)
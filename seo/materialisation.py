@@ -0,0 +1,173 @@
+"""
+Moteur de matérialisation des templates
+
+Le manifeste de l'arborescence est construit une seule fois, puis les
+fichiers sont copiés octet pour octet (jamais décodés) sur un pool de
+threads borné, en s'appuyant sur les copies noyau : reflink quand le
+système de fichiers le permet, sinon ``shutil.copyfile`` (``sendfile``
+sous Linux, ``fcopyfile`` sous macOS).
+"""
+import errno
+import os
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, List, NamedTuple, Optional
+
+# Pas de hardlinks : une écriture en place dans le projet modifierait le template installé
+STRATEGIES = ('auto', 'copie')
+
+# Dossiers et extensions jamais copiés depuis un template
+IGNORES_DOSSIERS = {'__pycache__'}
+IGNORES_EXTENSIONS = ('.pyc', '.pyo')
+
+# ioctl FICLONE (linux/fs.h) : clone copy-on-write sur btrfs, xfs, ...
+_FICLONE = 0x40049409
+
+
+class EntreeManifeste(NamedTuple):
+    """Fichier du manifeste (chemin relatif, séparateur '/')"""
+    chemin: str
+    taille: int
+
+
+class Manifeste(NamedTuple):
+    """Arborescence d'un template : dossiers puis fichiers, ordre stable"""
+    dossiers: List[str]
+    fichiers: List[EntreeManifeste]
+
+    @property
+    def octets(self) -> int:
+        return sum(entree.taille for entree in self.fichiers)
+
+
+class RapportMaterialisation(NamedTuple):
+    """Statistiques d'une matérialisation"""
+    fichiers: int
+    octets: int
+    duree: float
+
+    @property
+    def fichiers_par_seconde(self) -> float:
+        return self.fichiers / self.duree if self.duree > 0 else float(self.fichiers)
+
+    @property
+    def octets_par_seconde(self) -> float:
+        return self.octets / self.duree if self.duree > 0 else float(self.octets)
+
+    def __str__(self):
+        return (f"{self.fichiers} fichiers, {formater_octets(self.octets)} "
+                f"en {self.duree * 1000:.1f} ms "
+                f"({self.fichiers_par_seconde:.0f} fichiers/s, "
+                f"{formater_octets(self.octets_par_seconde)}/s)")
+
+
+def formater_octets(octets: float) -> str:
+    """Formate une taille en o/Ko/Mo/Go"""
+    for unite in ('o', 'Ko', 'Mo'):
+        if octets < 1024:
+            return f"{octets:.0f} {unite}" if unite == 'o' else f"{octets:.1f} {unite}"
+        octets /= 1024
+    return f"{octets:.1f} Go"
+
+
+def construire_manifeste(source) -> Manifeste:
+    """Parcourt une seule fois l'arborescence source (sans récursion Python)"""
+    source = Path(source)
+    dossiers, fichiers = [], []
+    a_visiter = ['']
+    while a_visiter:
+        relatif = a_visiter.pop()
+        with os.scandir(source / relatif if relatif else source) as entrees:
+            for entree in sorted(entrees, key=lambda e: e.name):
+                chemin = f"{relatif}/{entree.name}" if relatif else entree.name
+                if entree.is_dir():
+                    if entree.name not in IGNORES_DOSSIERS:
+                        dossiers.append(chemin)
+                        a_visiter.append(chemin)
+                elif not entree.name.endswith(IGNORES_EXTENSIONS):
+                    fichiers.append(EntreeManifeste(chemin, entree.stat().st_size))
+    return Manifeste(dossiers, fichiers)
+
+
+def workers_par_defaut() -> int:
+    """Taille du pool : les copies sont limitées par les E/S, pas par le CPU"""
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def repartir(fonction: Callable, elements: Iterable, workers: Optional[int] = None):
+    """Applique une fonction à chaque élément sur le pool de threads borné"""
+    elements = list(elements)
+    workers = workers or workers_par_defaut()
+    if workers == 1 or len(elements) <= 1:
+        for element in elements:
+            fonction(element)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # list() propage la première exception levée par un worker
+            list(pool.map(fonction, elements))
+
+
+class _Copieur:
+    """Copie un fichier avec la stratégie la moins coûteuse disponible"""
+
+    def __init__(self, strategie: str):
+        if strategie not in STRATEGIES:
+            raise ValueError(f"🚫 Stratégie de copie inconnue: {strategie}")
+        self.strategie = strategie
+        # Désactivé au premier refus du système de fichiers
+        self.reflink = strategie == 'auto' and sys.platform.startswith('linux')
+        self._verrou = threading.Lock()
+
+    def copier(self, source: Path, destination: Path):
+        if self.reflink and self._cloner(source, destination):
+            return
+        shutil.copyfile(source, destination)
+
+    def _cloner(self, source: Path, destination: Path) -> bool:
+        import fcntl
+        try:
+            with open(source, 'rb') as src, open(destination, 'wb') as dst:
+                fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+            return True
+        except OSError as e:
+            if e.errno in (errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV,
+                           errno.EINVAL, errno.ENOSYS, errno.EBADF):
+                with self._verrou:
+                    self.reflink = False
+                return False
+            raise
+
+
+def materialiser(source, destination, manifeste: Optional[Manifeste] = None,
+                 workers: Optional[int] = None, strategie: str = 'auto') -> RapportMaterialisation:
+    """
+    Copie un template vers sa destination
+
+    Args:
+        source: Dossier du template
+        destination: Dossier du projet (créé si besoin)
+        manifeste: Manifeste déjà construit (sinon construit ici)
+        workers: Taille du pool de threads (défaut: workers_par_defaut())
+        strategie: 'auto' (reflink puis copie noyau) ou 'copie'
+    """
+    debut = time.perf_counter()
+    source = Path(source)
+    destination = Path(destination)
+    if manifeste is None:
+        manifeste = construire_manifeste(source)
+    copieur = _Copieur(strategie)
+
+    destination.mkdir(parents=True, exist_ok=True)
+    for dossier in manifeste.dossiers:
+        (destination / dossier).mkdir(parents=True, exist_ok=True)
+
+    def copier(entree: EntreeManifeste):
+        copieur.copier(source / entree.chemin, destination / entree.chemin)
+
+    repartir(copier, manifeste.fichiers, workers)
+    return RapportMaterialisation(len(manifeste.fichiers), manifeste.octets,
+                                  time.perf_counter() - debut)
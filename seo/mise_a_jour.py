@@ -0,0 +1,118 @@
+"""
+Mise à jour incrémentale d'un projet généré (``seo upgrade``)
+
+À la création, ``.seo/manifeste.json`` enregistre les préférences et
+l'empreinte de chaque fichier écrit. La mise à jour recalcule le contenu
+attendu avec les templates installés et ne touche qu'aux fichiers dont
+le template a changé et que l'utilisateur n'a pas modifiés ; les autres
+sont signalés comme conflits (la nouvelle version est déposée à côté,
+suffixée ``.seo-nouveau``).
+"""
+import json
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple
+
+from . import __version__
+from .utils import DOSSIER_SEO, empreinte
+
+SUFFIXE_PROPOSITION = '.seo-nouveau'
+
+
+class RapportMiseAJour(NamedTuple):
+    """Résultat d'une mise à jour, par catégorie de fichiers"""
+    inchanges: List[str]
+    mis_a_jour: List[str]
+    crees: List[str]
+    conflits: List[str]
+    obsoletes: List[str]
+
+
+def chemin_manifeste(chemin_projet) -> Path:
+    from .generators import FICHIER_MANIFESTE
+    return Path(chemin_projet) / DOSSIER_SEO / FICHIER_MANIFESTE
+
+
+def lire_manifeste(chemin_projet) -> Dict[str, Any]:
+    fichier = chemin_manifeste(chemin_projet)
+    if not fichier.exists():
+        raise FileNotFoundError(f"Aucun manifeste {fichier} : projet créé avant le suivi des fichiers ?")
+    return json.loads(fichier.read_text(encoding='utf-8'))
+
+
+def _empreinte_disque(chemin: Path):
+    try:
+        return empreinte(chemin.read_bytes())
+    except FileNotFoundError:
+        return None
+
+
+def mettre_a_jour(chemin_projet='.', simulation: bool = False, forcer: bool = False) -> RapportMiseAJour:
+    """
+    Applique les changements des templates à un projet existant
+
+    Args:
+        simulation: N'écrit rien, calcule seulement le rapport
+        forcer: Écrase aussi les fichiers modifiés par l'utilisateur
+    """
+    from .generators import recreer_generateur
+
+    chemin_projet = Path(chemin_projet).resolve()
+    manifeste = lire_manifeste(chemin_projet)
+    connus: Dict[str, str] = manifeste.get('fichiers', {})
+    generator = recreer_generateur(manifeste, chemin_projet)
+    plan = generator.planifier()
+
+    rapport = RapportMiseAJour([], [], [], [], sorted(set(connus) - set(plan)))
+    nouvelles = {}
+    for relatif, (attendue, lire) in sorted(plan.items()):
+        ancienne = connus.get(relatif)
+        if attendue == ancienne:
+            # Template inchangé : le fichier n'est même pas lu
+            rapport.inchanges.append(relatif)
+            nouvelles[relatif] = ancienne
+            continue
+
+        chemin = chemin_projet / relatif
+        actuelle = _empreinte_disque(chemin)
+        if actuelle == attendue:
+            rapport.inchanges.append(relatif)
+        elif actuelle is None and ancienne is None:
+            rapport.crees.append(relatif)
+        elif forcer or (actuelle is not None and actuelle == ancienne):
+            rapport.mis_a_jour.append(relatif)
+        else:
+            # Modifié (ou supprimé) par l'utilisateur depuis la génération
+            rapport.conflits.append(relatif)
+            if not simulation and actuelle is not None:
+                chemin.with_name(chemin.name + SUFFIXE_PROPOSITION).write_bytes(lire())
+            if ancienne is not None:
+                nouvelles[relatif] = ancienne
+            continue
+
+        if not simulation and actuelle != attendue:
+            chemin.parent.mkdir(parents=True, exist_ok=True)
+            chemin.write_bytes(lire())
+        nouvelles[relatif] = attendue
+
+    if not simulation:
+        manifeste.update(version=__version__, fichiers=dict(sorted(nouvelles.items())))
+        chemin_manifeste(chemin_projet).write_text(
+            json.dumps(manifeste, indent=2, ensure_ascii=False) + "\n", encoding='utf-8')
+    return rapport
+
+
+def afficher_rapport(rapport: RapportMiseAJour, simulation: bool = False):
+    """Résumé lisible d'une mise à jour"""
+    print("\n" + "="*60)
+    print(" Mise à jour" + (" (simulation)" if simulation else ""))
+    print("="*60 + "\n")
+    print(f"   Inchangés: {len(rapport.inchanges)}")
+    for titre, fichiers in (("Mis à jour", rapport.mis_a_jour), ("Créés", rapport.crees),
+                            ("Conflits", rapport.conflits), ("Obsolètes", rapport.obsoletes)):
+        print(f"   {titre}: {len(fichiers)}")
+        for fichier in fichiers:
+            print(f"     - {fichier}")
+    if rapport.conflits:
+        print(f"\n   Conflits : fichiers modifiés localement, nouvelle version dans *{SUFFIXE_PROPOSITION}")
+        print("   (seo upgrade --force pour écraser)")
+    print("\n" + "="*60 + "\n")
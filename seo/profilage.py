@@ -0,0 +1,329 @@
+"""
+Profilage des requêtes HTTP (`seo run --profile`, `seo profile report`)
+
+Un middleware WSGI enveloppe l'application du projet et écrit un profil
+par requête retenue (préfixes de chemin, durée minimale) dans
+``.seo/profils/`` :
+
+- ``cprofile`` : profil déterministe (``.prof``, lisible par pstats,
+  snakeviz...). Une seule requête profilée à la fois, les autres passent
+  sans profil. Coûteux : pour le développement.
+- ``sample`` : un thread relève la pile des requêtes en cours toutes les
+  quelques millisecondes et écrit les piles au format « collapsed »
+  (``.collapsed``, pour flamegraph.pl ou speedscope). Peu coûteux :
+  utilisable en production.
+
+Le corps des réponses est lu dans le middleware pour que sa génération
+soit mesurée : les réponses en flux sont mises en mémoire.
+
+`seo run dev` lance le script du projet par ``python -m seo.profilage``,
+qui installe le middleware sur toute application Flask ; `seo run prod`
+passe les options à gunicorn.conf.py par l'environnement.
+"""
+import cProfile
+import itertools
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .utils import DOSSIER_SEO
+
+DOSSIER_PROFILS = 'profils'
+MODES = ('cprofile', 'sample')
+EXTENSIONS = {'cprofile': '.prof', 'sample': '.collapsed'}
+
+
+class Options(NamedTuple):
+    """Réglages du profilage (transmis au processus de l'application par l'environnement)"""
+    mode: str = 'cprofile'
+    dossier: str = os.path.join(DOSSIER_SEO, DOSSIER_PROFILS)
+    chemins: Tuple[str, ...] = ()
+    duree_min_ms: float = 0.0
+    intervalle_ms: float = 5.0
+
+    def vers_environnement(self) -> Dict[str, str]:
+        return {
+            'SEO_PROFIL': self.mode,
+            'SEO_PROFIL_DOSSIER': os.path.abspath(self.dossier),
+            'SEO_PROFIL_CHEMINS': ','.join(self.chemins),
+            'SEO_PROFIL_DUREE_MIN': str(self.duree_min_ms),
+            'SEO_PROFIL_INTERVALLE': str(self.intervalle_ms),
+        }
+
+    @classmethod
+    def depuis_environnement(cls) -> Optional['Options']:
+        """Options posées par `seo run --profile`, ou None"""
+        mode = os.environ.get('SEO_PROFIL')
+        if not mode:
+            return None
+        if mode not in MODES:
+            raise ValueError(f"🚫 Mode de profilage inconnu: {mode} ({', '.join(MODES)})")
+        defaut = cls()
+        return cls(mode=mode,
+                   dossier=os.environ.get('SEO_PROFIL_DOSSIER', defaut.dossier),
+                   chemins=tuple(c for c in os.environ.get('SEO_PROFIL_CHEMINS', '').split(',') if c),
+                   duree_min_ms=float(os.environ.get('SEO_PROFIL_DUREE_MIN', 0)),
+                   intervalle_ms=float(os.environ.get('SEO_PROFIL_INTERVALLE', defaut.intervalle_ms)))
+
+
+def nom_fonction(cadre) -> str:
+    """module:fonction d'un cadre d'exécution, comme dans les piles « collapsed »"""
+    code = cadre.f_code
+    return f"{cadre.f_globals.get('__name__', '?')}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def module_de(fichier: str) -> str:
+    """Nom de module d'un fichier source (cProfile ne garde que son chemin)"""
+    chemin = os.path.abspath(fichier)
+    for racine in sorted({os.path.abspath(p or '.') for p in sys.path}, key=len, reverse=True):
+        if chemin.startswith(racine + os.sep):
+            module = os.path.splitext(chemin[len(racine) + 1:])[0].replace(os.sep, '.')
+            return module[:-len('.__init__')] if module.endswith('.__init__') else module
+    return Path(fichier).stem
+
+
+class MiddlewareProfilage:
+    """Middleware WSGI : un fichier de profil par requête retenue"""
+
+    def __init__(self, application, options: Options):
+        self.application = application
+        self.options = options
+        Path(options.dossier).mkdir(parents=True, exist_ok=True)
+        # cProfile : un seul profileur actif à la fois dans le processus
+        self._verrou_profil = threading.Lock()
+        # sample : piles relevées par thread de requête
+        self._verrou_piles = threading.Lock()
+        self._piles: Dict[int, Counter] = {}
+        self._echantillonneur_pid = None
+        self._numeros = itertools.count(1)
+
+    def __call__(self, environ, start_response):
+        chemin = environ.get('PATH_INFO') or '/'
+        if self.options.chemins and not chemin.startswith(self.options.chemins):
+            return self.application(environ, start_response)
+        if self.options.mode == 'sample':
+            return self._echantillonner(environ, start_response)
+        return self._profiler(environ, start_response)
+
+    def _executer(self, environ, start_response) -> List[bytes]:
+        """Appelle l'application et lit son corps (les piles relevées s'arrêtent à ce cadre)"""
+        corps = self.application(environ, start_response)
+        try:
+            return list(corps)
+        finally:
+            if hasattr(corps, 'close'):
+                corps.close()
+
+    def _fichier(self, environ, duree: float) -> Optional[Path]:
+        """Destination du profil, ou None si la requête est trop rapide"""
+        duree_ms = duree * 1000
+        if duree_ms < self.options.duree_min_ms:
+            return None
+        chemin = re.sub(r'[^A-Za-z0-9]+', '_', environ.get('PATH_INFO', '')).strip('_')[:60] or 'racine'
+        nom = (f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(self._numeros)}-"
+               f"{environ.get('REQUEST_METHOD', 'GET')}-{chemin}-{duree_ms:.0f}ms")
+        return Path(self.options.dossier) / (nom + EXTENSIONS[self.options.mode])
+
+    def _profiler(self, environ, start_response):
+        if not self._verrou_profil.acquire(blocking=False):
+            return self.application(environ, start_response)
+        profil = cProfile.Profile()
+        debut = time.perf_counter()
+        try:
+            profil.enable()
+            try:
+                contenu = self._executer(environ, start_response)
+            finally:
+                profil.disable()
+        finally:
+            self._verrou_profil.release()
+        fichier = self._fichier(environ, time.perf_counter() - debut)
+        if fichier is not None:
+            profil.dump_stats(str(fichier))
+        return contenu
+
+    def _echantillonner(self, environ, start_response):
+        self._demarrer_echantillonneur()
+        ident = threading.get_ident()
+        piles = Counter()
+        with self._verrou_piles:
+            self._piles[ident] = piles
+        debut = time.perf_counter()
+        try:
+            contenu = self._executer(environ, start_response)
+        finally:
+            with self._verrou_piles:
+                del self._piles[ident]
+        fichier = self._fichier(environ, time.perf_counter() - debut)
+        if fichier is not None and piles:
+            fichier.write_text(''.join(f"{pile} {nombre}\n" for pile, nombre in piles.items()),
+                               encoding='utf-8')
+        return contenu
+
+    def _demarrer_echantillonneur(self):
+        # Les threads ne survivent pas au fork des workers gunicorn : un par processus
+        if self._echantillonneur_pid == os.getpid():
+            return
+        with self._verrou_piles:
+            if self._echantillonneur_pid != os.getpid():
+                threading.Thread(target=self._boucle, name='seo-profilage', daemon=True).start()
+                self._echantillonneur_pid = os.getpid()
+
+    def _pile(self, cadre) -> str:
+        noms = []
+        while cadre is not None and cadre.f_code is not self._executer.__code__:
+            noms.append(nom_fonction(cadre))
+            cadre = cadre.f_back
+        return ';'.join(reversed(noms))
+
+    def _boucle(self):
+        intervalle = self.options.intervalle_ms / 1000
+        while True:
+            time.sleep(intervalle)
+            cadres = sys._current_frames()
+            with self._verrou_piles:
+                for ident, piles in self._piles.items():
+                    cadre = cadres.get(ident)
+                    if cadre is not None:
+                        piles[self._pile(cadre)] += 1
+
+
+def installer_flask(options: Options):
+    """Enveloppe toute application Flask de ce processus dans le middleware"""
+    import flask
+
+    appel_origine = flask.Flask.__call__
+    run_origine = flask.Flask.run
+    middlewares = {}
+
+    def appel(app, environ, start_response):
+        middleware = middlewares.get(id(app))
+        if middleware is None:
+            middleware = middlewares[id(app)] = MiddlewareProfilage(
+                lambda e, s: appel_origine(app, e, s), options)
+        return middleware(environ, start_response)
+
+    def run(app, *args, **kwargs):
+        # Le rechargeur relancerait le script sans le profilage
+        kwargs['use_reloader'] = False
+        return run_origine(app, *args, **kwargs)
+
+    flask.Flask.__call__ = appel
+    flask.Flask.run = run
+
+
+def lancer(argv: List[str]):
+    """python -m seo.profilage run.py [arguments] (ou -m module [arguments])"""
+    import runpy
+    options = Options.depuis_environnement() or Options()
+    installer_flask(options)
+    print(f" Profilage {options.mode} -> {options.dossier}", flush=True)
+    if argv[0] == '-m':
+        sys.argv = argv[1:]
+        runpy.run_module(argv[1], run_name='__main__', alter_sys=True)
+    else:
+        sys.argv = argv
+        sys.path.insert(0, os.path.dirname(os.path.abspath(argv[0])))
+        runpy.run_path(argv[0], run_name='__main__')
+
+
+class Fonction(NamedTuple):
+    """Ligne du rapport : temps (cprofile, secondes) ou échantillons (sample)"""
+    nom: str
+    propre: float
+    cumul: float
+    appels: int
+
+
+class Rapport(NamedTuple):
+    profils: int
+    fonctions: List[Fonction]
+    unite: str
+
+
+def _rapport_cprofile(fichiers: List[Path]) -> List[Fonction]:
+    import pstats
+    stats = pstats.Stats(str(fichiers[0]))
+    for fichier in fichiers[1:]:
+        stats.add(str(fichier))
+    fonctions = []
+    for (fichier, ligne, nom), (_, appels, propre, cumul, _) in stats.stats.items():
+        if fichier == '~':
+            # Fonctions C : le nom est déjà de la forme <built-in method ...>
+            fonctions.append(Fonction(nom, propre, cumul, appels))
+        else:
+            fonctions.append(Fonction(f"{module_de(fichier)}:{nom}:{ligne}", propre, cumul, appels))
+    return fonctions
+
+
+def _rapport_echantillons(fichiers: List[Path], fusion: Optional[Path] = None) -> List[Fonction]:
+    piles = Counter()
+    for fichier in fichiers:
+        for ligne in fichier.read_text(encoding='utf-8').splitlines():
+            pile, _, nombre = ligne.rpartition(' ')
+            if pile:
+                piles[pile] += int(nombre)
+    if fusion is not None:
+        fusion.write_text(''.join(f"{pile} {nombre}\n" for pile, nombre in piles.most_common()),
+                          encoding='utf-8')
+    propre, cumul = Counter(), Counter()
+    for pile, nombre in piles.items():
+        noms = pile.split(';')
+        propre[noms[-1]] += nombre
+        # Une fonction récursive ne compte qu'une fois par pile
+        for nom in set(noms):
+            cumul[nom] += nombre
+    return [Fonction(nom, propre[nom], total, 0) for nom, total in cumul.items()]
+
+
+def construire_rapport(dossier, tri: str = 'propre', fusion=None) -> Rapport:
+    """
+    Agrège les profils d'un dossier (tous ceux d'un même mode)
+
+    Args:
+        tri: 'propre' (temps dans la fonction elle-même) ou 'cumul' (appels compris)
+        fusion: Fichier où écrire l'ensemble des piles échantillonnées (flamegraph) ;
+            ValueError pour des profils cprofile, qui ne conservent pas les piles
+    """
+    dossier = Path(dossier)
+    prof = sorted(dossier.glob('*' + EXTENSIONS['cprofile']))
+    echantillons = sorted(dossier.glob('*' + EXTENSIONS['sample']))
+    if prof and fusion:
+        raise ValueError(f"Profils cprofile dans {dossier} : pas de piles à fusionner "
+                         f"(profilez en mode sample)")
+    if prof:
+        fichiers, fonctions, unite = prof, _rapport_cprofile(prof), 's'
+    elif echantillons:
+        fichiers = echantillons
+        fonctions = _rapport_echantillons(echantillons, Path(fusion) if fusion else None)
+        unite = 'échantillons'
+    else:
+        raise FileNotFoundError(f"Aucun profil dans {dossier}")
+    fonctions.sort(key=lambda f: f.cumul if tri == 'cumul' else f.propre, reverse=True)
+    return Rapport(len(fichiers), fonctions, unite)
+
+
+def afficher_rapport(rapport: Rapport, limite: int = 20):
+    """Fonctions les plus coûteuses sur l'ensemble des requêtes profilées"""
+    total = sum(f.propre for f in rapport.fonctions) or 1
+    print("\n" + "="*78)
+    print(f" Profils: {rapport.profils} requête(s), unité: {rapport.unite}")
+    print("="*78 + "\n")
+    print(f"   {'propre':>10} {'%':>6} {'cumul':>10} {'appels':>8}  fonction")
+    for fonction in rapport.fonctions[:limite]:
+        appels = str(fonction.appels) if fonction.appels else '-'
+        print(f"   {fonction.propre:>10.4g} {100 * fonction.propre / total:>5.1f}% "
+              f"{fonction.cumul:>10.4g} {appels:>8}  {fonction.nom}")
+    print("\n" + "="*78 + "\n")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Usage: python -m seo.profilage run.py [arguments]")
+        sys.exit(2)
+    lancer(sys.argv[1:])
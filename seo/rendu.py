@@ -0,0 +1,78 @@
+"""
+Rendu des templates : substitution des variables de préférences
+
+Syntaxe : ``{= nom_variable =}``. Elle ne se confond ni avec Jinja
+(``{{ }}``) ni avec docker-compose (``${VAR}``). Le rendu travaille sur
+les octets, sans décoder le fichier, et chaque template n'est analysé
+qu'une fois par processus (cache des templates compilés).
+"""
+import hashlib
+import re
+import threading
+from typing import Any, Dict, List, Optional, Union
+
+MARQUEUR = b'{='
+MOTIF = re.compile(rb'\{=\s*([A-Za-z_][A-Za-z0-9_]*)\s*=\}')
+
+# Templates compilés, par clé (hash du contenu par défaut)
+_cache: Dict[str, 'TemplateCompile'] = {}
+_verrou = threading.Lock()
+
+
+class VariableManquante(KeyError):
+    """Variable utilisée par un template mais absente des préférences"""
+
+    def __str__(self):
+        return f"🚫 Variable de template non définie: {self.args[0]}"
+
+
+def contient_variables(contenu: bytes) -> bool:
+    """Vrai si le contenu doit passer par le rendu (sinon copie brute)"""
+    return MARQUEUR in contenu and MOTIF.search(contenu) is not None
+
+
+class TemplateCompile:
+    """Template analysé une fois : alternance de littéraux et de variables"""
+
+    __slots__ = ('segments', 'variables')
+
+    def __init__(self, contenu: bytes):
+        # Segments pairs : octets littéraux ; impairs : noms de variables
+        self.segments: List[Union[bytes, str]] = []
+        position = 0
+        for correspondance in MOTIF.finditer(contenu):
+            self.segments.append(contenu[position:correspondance.start()])
+            self.segments.append(correspondance.group(1).decode('ascii'))
+            position = correspondance.end()
+        self.segments.append(contenu[position:])
+        self.variables = frozenset(self.segments[1::2])
+
+    def rendre(self, variables: Dict[str, Any]) -> bytes:
+        morceaux = []
+        for i, segment in enumerate(self.segments):
+            if i % 2 == 0:
+                morceaux.append(segment)
+            else:
+                try:
+                    valeur = variables[segment]
+                except KeyError:
+                    raise VariableManquante(segment) from None
+                morceaux.append(str(valeur).encode('utf-8'))
+        return b''.join(morceaux)
+
+
+def compiler(contenu: bytes, cle: Optional[str] = None) -> TemplateCompile:
+    """Retourne le template compilé, depuis le cache si possible"""
+    if cle is None:
+        cle = hashlib.sha1(contenu).hexdigest()
+    template = _cache.get(cle)
+    if template is None:
+        template = TemplateCompile(bytes(contenu))
+        with _verrou:
+            template = _cache.setdefault(cle, template)
+    return template
+
+
+def rendre(contenu: bytes, variables: Dict[str, Any], cle: Optional[str] = None) -> bytes:
+    """Substitue les variables dans un contenu de template"""
+    return compiler(contenu, cle).rendre(variables)
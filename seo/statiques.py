@@ -0,0 +1,220 @@
+"""
+Construction des fichiers statiques (`seo assets build`)
+
+Chaque fichier de ``static/`` est copié dans ``static/dist/`` sous un nom
+qui contient l'empreinte de son contenu (``style.3f2a9c1e.css``) :
+
+- CSS minifié (commentaires et espaces), JS minifié si ``rjsmin`` est
+  installé, copié tel quel sinon ;
+- références relatives des CSS (``url()``, ``@import``) réécrites vers les
+  noms construits, ou vers l'emplacement d'origine hors de ``static/`` ;
+- variantes ``.gz`` (et ``.br`` si ``brotli`` est installé) des fichiers
+  texte, quand elles sont plus petites ;
+- ``dist/manifest.json`` : nom d'origine -> nom construit.
+
+Le module ``statiques.py`` des projets lit le manifeste : ``url_for``
+renvoie les noms construits, servis compressés selon Accept-Encoding et
+mis en cache un an (``immutable``) ; une modification change le nom.
+
+    pip install seo-dev-env[assets]    # brotli, rjsmin
+"""
+import gzip
+import hashlib
+import json
+import os
+import posixpath
+import re
+import shutil
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+DOSSIER_DIST = 'dist'
+MANIFESTE = 'manifest.json'
+# Fichiers compressés à l'avance (les images et polices le sont déjà)
+EXTENSIONS_TEXTE = {'.css', '.js', '.mjs', '.map', '.json', '.svg', '.txt', '.html', '.xml', '.ico'}
+# En dessous, l'en-tête de compression coûte plus qu'il ne fait gagner
+TAILLE_MIN_COMPRESSION = 256
+
+DELIMITEURS_CSS = set('{};,>')
+_JETONS_CSS = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|(/\*.*?\*/)|(\s+)|([^"'/\s]+|/)''', re.S)
+# Références d'un CSS : url(...) avec ou sans guillemets, @import "..." (@import url(...) passe par url())
+_REFERENCES_CSS = re.compile(r'''(?P<avant>url\(\s*|@import\s+(?=["']))(?P<guillemet>["'])?'''
+                             r'''(?P<reference>(?(guillemet)[^"']*|[^)"'\s]*))''', re.I)
+# Schéma (https:, data:...) : référence externe ou intégrée, laissée telle quelle
+_SCHEMA = re.compile(r'[a-z][a-z0-9+.-]*:', re.I)
+
+
+def minifier_css(texte: str) -> str:
+    """Retire commentaires et espaces superflus (chaînes et commentaires /*! */ conservés)"""
+    morceaux = []
+    espace = False
+    for chaine, commentaire, blanc, autre in _JETONS_CSS.findall(texte):
+        if blanc or (commentaire and not commentaire.startswith('/*!')):
+            espace = bool(morceaux)
+            continue
+        jeton = chaine or commentaire or re.sub(r'\s*([{};,>])\s*', r'\1', autre).replace(';}', '}')
+        precedent = morceaux[-1] if morceaux else ''
+        if not chaine and jeton[0] == '}' and precedent.endswith(';') and precedent[0] not in '"\'':
+            morceaux[-1] = precedent[:-1]
+        # Espaces sans effet autour des délimiteurs de blocs et de déclarations
+        # (pas « : » ni « + » : « a :hover » et calc(1px + 2px) en dépendent)
+        elif espace and precedent[-1:] not in DELIMITEURS_CSS and (chaine or jeton[0] not in DELIMITEURS_CSS):
+            morceaux.append(' ')
+        morceaux.append(jeton)
+        espace = False
+    return ''.join(morceaux)
+
+
+def minifier_js(texte: str) -> str:
+    """Minifie avec rjsmin s'il est installé (sans analyseur JS, le texte est laissé tel quel)"""
+    try:
+        import rjsmin
+    except ImportError:
+        return texte
+    return rjsmin.jsmin(texte)
+
+
+MINIFIEURS = {'.css': minifier_css, '.js': minifier_js}
+
+
+def _cible_locale(reference: str, dossier: str):
+    """(chemin relatif à static/, suffixe ?query#fragment) d'une référence relative, None sinon"""
+    if not reference or reference.startswith(('/', '#')) or _SCHEMA.match(reference):
+        return None
+    chemin, suffixe = re.match(r'([^?#]*)(.*)', reference).groups()
+    return posixpath.normpath(posixpath.join(dossier, chemin)), suffixe
+
+
+def dependances_css(texte: str, relatif: str):
+    """Fichiers de static/ référencés par un CSS (url(), @import)"""
+    for correspondance in _REFERENCES_CSS.finditer(texte):
+        cible = _cible_locale(correspondance['reference'], posixpath.dirname(relatif))
+        if cible:
+            yield cible[0]
+
+
+def reecrire_css(texte: str, relatif: str, manifeste: Dict[str, str]) -> str:
+    """
+    Réécrit les références relatives d'un CSS pour son emplacement dans dist/
+
+    Un fichier construit est désigné par son nom versionné ; les autres
+    (absents de static/) gardent leur emplacement d'origine.
+    """
+    dossier = posixpath.dirname(relatif)
+    dossier_construit = posixpath.join(DOSSIER_DIST, dossier)
+
+    def remplacer(correspondance):
+        cible = _cible_locale(correspondance['reference'], dossier)
+        if cible is None:
+            return correspondance[0]
+        chemin, suffixe = cible
+        reference = posixpath.relpath(manifeste.get(chemin, chemin), dossier_construit) + suffixe
+        return correspondance['avant'] + (correspondance['guillemet'] or '') + reference
+
+    return _REFERENCES_CSS.sub(remplacer, texte)
+
+
+def compresser(contenu: bytes) -> Dict[str, bytes]:
+    """Variantes compressées plus petites que l'original, par extension (.gz, .br)"""
+    variantes = {'.gz': gzip.compress(contenu, compresslevel=9, mtime=0)}
+    try:
+        import brotli
+        variantes['.br'] = brotli.compress(contenu, quality=11)
+    except ImportError:
+        pass
+    return {extension: donnees for extension, donnees in variantes.items() if len(donnees) < len(contenu)}
+
+
+class Resultat(NamedTuple):
+    fichiers: int
+    octets_source: int
+    octets_construits: int
+    octets_gzip: int
+    brotli: bool
+    manifeste: Path
+
+
+def dossier_statique(chemin_projet) -> Path:
+    """static/ du projet (app/static/ pour l'architecture par feature)"""
+    for candidat in ('static', os.path.join('app', 'static')):
+        dossier = Path(chemin_projet) / candidat
+        if dossier.is_dir():
+            return dossier
+    raise FileNotFoundError(f"Aucun dossier static/ dans {chemin_projet}")
+
+
+def construire(chemin_projet='.', statique: Optional[str] = None, minifier: bool = True) -> Resultat:
+    """
+    Construit static/dist/ et son manifeste ; les constructions précédentes sont remplacées
+
+    Les CSS sont construits après les fichiers qu'ils référencent, pour que
+    leur contenu (et donc leur empreinte) désigne les noms versionnés.
+    """
+    source = Path(statique) if statique else dossier_statique(chemin_projet)
+    dist = source / DOSSIER_DIST
+    if dist.exists():
+        shutil.rmtree(dist)
+    fichiers = {fichier.relative_to(source).as_posix(): fichier for fichier in sorted(source.rglob('*'))
+                if fichier.is_file() and dist not in fichier.parents and not fichier.name.startswith('.')}
+    manifeste = {}
+    octets = {'source': 0, 'construits': 0, 'gzip': 0}
+    avec_brotli = False
+
+    def ecrire(relatif: str, contenu: bytes):
+        nonlocal avec_brotli
+        fichier = fichiers[relatif]
+        extension = fichier.suffix.lower()
+        if minifier and extension in MINIFIEURS:
+            contenu = MINIFIEURS[extension](contenu.decode('utf-8-sig')).encode('utf-8')
+        empreinte = hashlib.sha256(contenu).hexdigest()[:10]
+        construit = f"{DOSSIER_DIST}/{Path(relatif).with_suffix('')}.{empreinte}{fichier.suffix}"
+        cible = source / construit
+        cible.parent.mkdir(parents=True, exist_ok=True)
+        cible.write_bytes(contenu)
+        octets['construits'] += len(contenu)
+        taille_servie = len(contenu)
+        if extension in EXTENSIONS_TEXTE and len(contenu) >= TAILLE_MIN_COMPRESSION:
+            for suffixe, donnees in compresser(contenu).items():
+                (cible.parent / (cible.name + suffixe)).write_bytes(donnees)
+                if suffixe == '.gz':
+                    taille_servie = len(donnees)
+                else:
+                    avec_brotli = True
+        octets['gzip'] += taille_servie
+        manifeste[relatif] = construit
+
+    en_cours = set()
+
+    def ecrire_css(relatif: str):
+        # @import réciproques : la référence du cycle garde son nom d'origine
+        if relatif in manifeste or relatif in en_cours:
+            return
+        en_cours.add(relatif)
+        texte = fichiers[relatif].read_bytes().decode('utf-8-sig')
+        for dependance in dependances_css(texte, relatif):
+            if dependance.lower().endswith('.css') and dependance in fichiers:
+                ecrire_css(dependance)
+        ecrire(relatif, reecrire_css(texte, relatif, manifeste).encode('utf-8'))
+
+    for relatif, fichier in fichiers.items():
+        octets['source'] += fichier.stat().st_size
+        if fichier.suffix.lower() != '.css':
+            ecrire(relatif, fichier.read_bytes())
+    for relatif, fichier in fichiers.items():
+        if fichier.suffix.lower() == '.css':
+            ecrire_css(relatif)
+    chemin_manifeste = dist / MANIFESTE
+    dist.mkdir(parents=True, exist_ok=True)
+    chemin_manifeste.write_text(json.dumps(manifeste, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+    return Resultat(len(manifeste), octets['source'], octets['construits'], octets['gzip'], avec_brotli,
+                    chemin_manifeste)
+
+
+def afficher_resultat(resultat: Resultat):
+    def ko(octets: int) -> str:
+        return f"{octets / 1024:.1f} Ko"
+    print(f"✅ {resultat.fichiers} fichier(s) statiques construits -> {resultat.manifeste.parent}")
+    print(f"   {ko(resultat.octets_source)} -> {ko(resultat.octets_construits)} minifiés, "
+          f"{ko(resultat.octets_gzip)} servis en gzip")
+    if not resultat.brotli:
+        print("   Variantes .br : pip install brotli")
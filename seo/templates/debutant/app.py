@@ -1,7 +1,14 @@
 ﻿from flask import Flask, render_template
 
+import gabarits
+import statiques
+
 app = Flask(__name__)
 app.config["SECRET_KEY"] = "votre-cle-secrete-changez-moi"
+# Templates compilés une fois, partagés entre redémarrages (instance/jinja/)
+gabarits.init_app(app)
+# Fichiers de `seo assets build` : noms versionnés, compressés, cache d'un an
+statiques.init_app(app)
 
 @app.route("/")
 def accueil():
@@ -0,0 +1,40 @@
+"""Cache de bytecode Jinja partagé sur disque
+
+Les templates compilés sont écrits dans instance/jinja/ (ou JINJA_CACHE_DIR) :
+les workers et les redémarrages réutilisent ce code au lieu de recompiler
+chaque template à sa première requête. Chaque entrée est vérifiée par
+l'empreinte du source : un template modifié est recompilé.
+
+Précompilation à la construction (image Docker, CI) :
+
+    flask --app app compiler-templates     # ou : seo templates compile
+"""
+import os
+
+from jinja2 import FileSystemBytecodeCache
+
+EXTENSIONS = (".html", ".htm", ".xml", ".txt", ".j2", ".jinja")
+
+
+def compiler(app) -> int:
+    """Compile tous les templates de l'application dans le cache ; renvoie leur nombre"""
+    noms = [nom for nom in app.jinja_env.list_templates() if nom.endswith(EXTENSIONS)]
+    for nom in noms:
+        app.jinja_env.get_template(nom)
+    return len(noms)
+
+
+def init_app(app):
+    dossier = os.environ.get("JINJA_CACHE_DIR") or os.path.join(app.instance_path, "jinja")
+    try:
+        os.makedirs(dossier, exist_ok=True)
+    except OSError as e:
+        app.logger.warning("Cache des templates désactivé (%s)", e)
+        return
+    # Avant le premier accès à app.jinja_env, construit à partir de jinja_options
+    app.jinja_options = {**app.jinja_options, "bytecode_cache": FileSystemBytecodeCache(dossier)}
+
+    @app.cli.command("compiler-templates")
+    def compiler_templates():
+        """Précompile les templates dans le cache de bytecode"""
+        print(f"{compiler(app)} template(s) compilé(s) dans {dossier}")
@@ -0,0 +1,62 @@
+"""Fichiers statiques construits par `seo assets build`
+
+Avec static/dist/manifest.json, url_for("static", filename="style.css")
+renvoie le nom construit (dist/style.<empreinte>.css). Le contenu d'un
+nom construit ne change jamais : il est servi avec un cache d'un an
+(immutable) et, selon Accept-Encoding, dans sa variante .br ou .gz.
+
+Sans manifeste, rien ne change. Relancez `seo assets build` après avoir
+modifié static/ ; en debug, un fichier modifié depuis la construction
+est servi tel quel.
+"""
+import json
+import mimetypes
+import os
+
+from flask import request, send_from_directory
+
+DIST = "dist/"
+UN_AN = 365 * 24 * 3600
+# Par ordre de préférence
+ENCODAGES = (("br", ".br"), ("gzip", ".gz"))
+
+
+def init_app(app):
+    chemin_manifeste = os.path.join(app.static_folder, "dist", "manifest.json")
+    try:
+        with open(chemin_manifeste, encoding="utf-8") as f:
+            manifeste = json.load(f)
+    except FileNotFoundError:
+        return
+    construit_le = os.path.getmtime(chemin_manifeste)
+
+    def modifie_depuis(nom: str) -> bool:
+        try:
+            return os.path.getmtime(os.path.join(app.static_folder, nom)) > construit_le
+        except OSError:
+            return False
+
+    @app.url_defaults
+    def nom_construit(endpoint, valeurs):
+        construit = manifeste.get(valeurs.get("filename")) if endpoint == "static" else None
+        if construit is not None and not (app.debug and modifie_depuis(valeurs["filename"])):
+            valeurs["filename"] = construit
+
+    def fichier_statique(filename):
+        if not filename.startswith(DIST):
+            return app.send_static_file(filename)
+        for encodage, extension in ENCODAGES:
+            if request.accept_encodings[encodage] and os.path.isfile(
+                    os.path.join(app.static_folder, filename + extension)):
+                reponse = send_from_directory(app.static_folder, filename + extension, max_age=UN_AN,
+                                              mimetype=mimetypes.guess_type(filename)[0])
+                reponse.headers["Content-Encoding"] = encodage
+                break
+        else:
+            reponse = send_from_directory(app.static_folder, filename, max_age=UN_AN)
+        reponse.vary.add("Accept-Encoding")
+        reponse.cache_control.public = True
+        reponse.cache_control.immutable = True
+        return reponse
+
+    app.view_functions["static"] = fichier_statique
@@ -2,11 +2,15 @@
 Point d'entrée de l'application
 Architecture par feature (domain-based)
 """
+import os
+
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_login import LoginManager
-from .core.config import Config
+from .core import gabarits, instrumentation, requetes, sqlite
+from .core.cache import cache
+from .core.config import Config, config
 
 db = SQLAlchemy()
 migrate = Migrate()
@@ -14,14 +18,26 @@ login_manager = LoginManager()
 login_manager.login_view = "utilisateurs.connexion"
 login_manager.login_message = "Veuillez vous connecter pour accéder à cette page."
 
-def create_app(config_class=Config):
+def create_app(config_class=None):
+    """
+    Crée l'application ; sans config_class, FLASK_ENV choisit la configuration
+    (development : `seo run`, .env.example ; production : docker-compose.yml).
+    Sans FLASK_ENV, Config : jamais les réglages de développement par défaut.
+    """
+    if config_class is None:
+        config_class = config.get(os.environ.get("FLASK_ENV", ""), Config)
     app = Flask(__name__)
     app.config.from_object(config_class)
     
     # Initialiser les extensions
+    gabarits.init_app(app)
+    sqlite.init_app(app)
     db.init_app(app)
     migrate.init_app(app, db)
     login_manager.init_app(app)
+    requetes.init_app(app)
+    instrumentation.init_app(app)
+    cache.init_app(app)
     
     # Enregistrer les blueprints (features)
     from app.utilisateurs.routes import bp as utilisateurs_bp
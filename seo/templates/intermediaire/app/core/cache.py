@@ -0,0 +1,195 @@
+"""Cache des réponses
+
+Les vues décorées par @en_cache("espace") sont servies depuis Redis
+(REDIS_URL : le service redis du docker-compose) ou, sans Redis, depuis
+un LRU en mémoire propre au processus. Ce dernier ne voit pas les
+invalidations des autres workers : il ne sert qu'en debug (serveur de
+développement, un seul processus) ou sur demande (CACHE_MEMOIRE=1, un
+seul worker). Sinon, sans Redis, seul l'ETag reste actif.
+
+Chaque réponse porte un ETag : un GET conditionnel (If-None-Match) reçoit
+304 sans corps. Les clés comprennent l'utilisateur connecté et une version
+par espace et par utilisateur ; invalider() change la version, les
+anciennes entrées ne sont plus lues et expirent d'elles-mêmes.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Optional
+
+from flask import Response, make_response, request, session
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class CacheMemoire:
+    """LRU borné avec expiration, propre au processus"""
+
+    def __init__(self, taille_max: int = 1024):
+        self.taille_max = taille_max
+        self._entrees = OrderedDict()  # cle -> (expiration, valeur)
+        self._verrou = threading.Lock()
+
+    def get(self, cle: str) -> Optional[bytes]:
+        with self._verrou:
+            entree = self._entrees.get(cle)
+            if entree is None:
+                return None
+            if entree[0] < time.monotonic():
+                del self._entrees[cle]
+                return None
+            self._entrees.move_to_end(cle)
+            return entree[1]
+
+    def set(self, cle: str, valeur: bytes, ttl: Optional[int] = None, absent: bool = False):
+        with self._verrou:
+            if absent and cle in self._entrees:
+                return
+            self._entrees[cle] = (time.monotonic() + ttl if ttl else float("inf"), valeur)
+            self._entrees.move_to_end(cle)
+            while len(self._entrees) > self.taille_max:
+                self._entrees.popitem(last=False)
+
+
+class CacheRedis:
+    """Redis partagé par tous les workers ; en panne, le cache est ignoré quelques secondes"""
+
+    PAUSE_APRES_ERREUR = 5
+
+    def __init__(self, url: str):
+        import redis
+        self._erreurs = redis.RedisError
+        self._client = redis.Redis.from_url(url, socket_timeout=0.25, socket_connect_timeout=0.25)
+        self._panne_jusqua = 0.0
+
+    def _appeler(self, methode, *args, **kwargs):
+        if time.monotonic() < self._panne_jusqua:
+            return None
+        try:
+            return methode(*args, **kwargs)
+        except self._erreurs:
+            # Pas de délai d'attente réseau à chaque requête tant que Redis est injoignable
+            self._panne_jusqua = time.monotonic() + self.PAUSE_APRES_ERREUR
+            return None
+
+    def get(self, cle: str) -> Optional[bytes]:
+        return self._appeler(self._client.get, cle)
+
+    def set(self, cle: str, valeur: bytes, ttl: Optional[int] = None, absent: bool = False):
+        self._appeler(self._client.set, cle, valeur, ex=ttl, nx=absent)
+
+
+def utilisateur_courant() -> str:
+    """Partie « utilisateur » des clés (anonyme : "-")"""
+    from flask_login import current_user
+    return current_user.get_id() if current_user.is_authenticated else "-"
+
+
+class Cache:
+    """Extension : choisit le stockage à l'initialisation de l'application"""
+
+    def __init__(self):
+        self.stockage = None
+        self.ttl = 60
+
+    def init_app(self, app):
+        self.ttl = app.config.get("CACHE_TTL", 60)
+        url = app.config.get("REDIS_URL")
+        if url:
+            try:
+                self.stockage = CacheRedis(url)
+            except ImportError:
+                app.logger.warning("REDIS_URL défini mais le paquet redis manque : pip install redis")
+        if self.stockage is None and (app.debug or app.config.get("CACHE_MEMOIRE")):
+            self.stockage = CacheMemoire(app.config.get("CACHE_TAILLE_MAX", 1024))
+        if not self.ttl:
+            self.stockage = None
+        app.extensions["cache"] = self
+
+    def _version(self, espace: str, utilisateur: str) -> bytes:
+        cle = f"cache:version:{espace}:{utilisateur}"
+        version = self.stockage.get(cle)
+        if version is None:
+            # Jamais 0 : une version évincée ne doit pas retrouver d'anciennes entrées
+            self.stockage.set(cle, str(time.time_ns()).encode(), absent=True)
+            version = self.stockage.get(cle) or b"0"
+        return version
+
+    def invalider(self, espace: str, utilisateur=None):
+        """Oublie les réponses d'un espace pour un utilisateur (l'utilisateur connecté par défaut)"""
+        if self.stockage is None:
+            return
+        utilisateur = utilisateur_courant() if utilisateur is None else str(utilisateur)
+        self.stockage.set(f"cache:version:{espace}:{utilisateur}", str(time.time_ns()).encode())
+
+    def cle(self, espace: str) -> Optional[str]:
+        """Clé de la requête courante : espace, utilisateur, version et URL (None sans cache)"""
+        if self.stockage is None:
+            return None
+        utilisateur = utilisateur_courant()
+        version = self._version(espace, utilisateur).decode()
+        return f"cache:{espace}:{utilisateur}:{version}:{request.full_path}"
+
+    def lire(self, cle: str) -> Optional[Response]:
+        brut = self.stockage.get(cle)
+        if brut is None:
+            return None
+        etag, type_contenu, corps = brut.split(b"\n", 2)
+        reponse = Response(corps, content_type=type_contenu.decode())
+        reponse.set_etag(etag.decode())
+        return reponse
+
+    def ecrire(self, cle: str, reponse: Response, ttl: Optional[int] = None):
+        etag, _ = reponse.get_etag()
+        if reponse.status_code != 200 or reponse.is_streamed or etag is None:
+            return
+        entete = f"{etag}\n{reponse.content_type}\n".encode()
+        self.stockage.set(cle, entete + reponse.get_data(), ttl or self.ttl)
+
+
+cache = Cache()
+
+
+def etiqueter(reponse: Response) -> Response:
+    """ETag calculé sur le corps ; le navigateur garde la page mais la revalide"""
+    if reponse.status_code == 200 and not reponse.is_streamed:
+        if reponse.get_etag()[0] is None:
+            reponse.set_etag(hashlib.blake2b(reponse.get_data(), digest_size=16).hexdigest())
+        # Données propres à l'utilisateur : jamais dans un cache partagé
+        reponse.headers.setdefault("Cache-Control", "private, no-cache")
+    return reponse
+
+
+def en_cache(espace: str, ttl: Optional[int] = None):
+    """Met en cache la réponse GET d'une vue, par utilisateur et par URL ; 304 si l'ETag correspond"""
+    def decorateur(vue):
+        @wraps(vue)
+        def enveloppe(*args, **kwargs):
+            # Un message flash en attente doit être affiché : page rendue, pas mise en cache
+            cle = None if request.method != "GET" or session.get("_flashes") else cache.cle(espace)
+            reponse = cache.lire(cle) if cle else None
+            if reponse is None:
+                reponse = etiqueter(make_response(vue(*args, **kwargs)))
+                if cle:
+                    cache.ecrire(cle, reponse, ttl)
+            return etiqueter(reponse).make_conditional(request)
+        return enveloppe
+    return decorateur
+
+
+def surveiller(modele, espace: str, attribut_utilisateur: str = "user_id"):
+    """Invalide l'espace du propriétaire après chaque écriture ORM validée d'une instance du modèle"""
+
+    def ecrit(mapper, connection, instance):
+        Session.object_session(instance).info.setdefault("cache_a_invalider", set()).add(
+            (espace, getattr(instance, attribut_utilisateur)))
+
+    for evenement in ("after_insert", "after_update", "after_delete"):
+        event.listen(modele, evenement, ecrit)
+
+    @event.listens_for(Session, "after_commit")
+    def apres_validation(session):
+        for espace_modifie, utilisateur in session.info.pop("cache_a_invalider", ()):
+            cache.invalider(espace_modifie, utilisateur)
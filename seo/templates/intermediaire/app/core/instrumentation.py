@@ -0,0 +1,123 @@
+"""Mesures de performance par requête HTTP (optionnel : INSTRUMENTATION=1)
+
+- durée de chaque requête, par endpoint, méthode et statut (histogramme) ;
+- nombre et durée cumulée des requêtes SQL de chaque requête HTTP ;
+- journal des requêtes SQL plus lentes que SQL_LENTE_SECONDES ;
+- avertissement N+1 : une même instruction SQL exécutée SEUIL_N_PLUS_UN
+  fois dans une requête HTTP (une relation chargée ligne par ligne).
+
+GET /metrics les expose au format Prometheus. Sous gunicorn, chaque worker
+a ses compteurs : PROMETHEUS_MULTIPROC_DIR (dossier vide au démarrage,
+préparé par le gunicorn.conf.py de `seo run prod`) permet à /metrics de
+les additionner, quel que soit le worker qui répond. Réservez /metrics au
+réseau interne (proxy ou pare-feu).
+"""
+import os
+import time
+from functools import lru_cache
+
+from flask import Response, current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core import requetes
+
+# Libellé des requêtes sans endpoint (404) : évite une série par URL inconnue
+SANS_ENDPOINT = "<aucun>"
+
+
+@lru_cache(maxsize=None)
+def _metriques():
+    """Métriques créées une fois par processus (plusieurs create_app en tests)"""
+    from prometheus_client import Counter, Histogram
+    return {
+        "duree": Histogram("http_request_duration_seconds", "Durée des requêtes HTTP",
+                           ["method", "endpoint", "status"]),
+        "requetes_sql": Histogram("http_request_sql_queries", "Requêtes SQL par requête HTTP",
+                                  ["endpoint"], buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100)),
+        "duree_sql": Histogram("http_request_sql_duration_seconds",
+                               "Temps SQL cumulé par requête HTTP", ["endpoint"]),
+        "lentes": Counter("sql_slow_queries_total", "Requêtes SQL au-dessus du seuil", ["endpoint"]),
+        "n_plus_un": Counter("sql_n_plus_one_total", "Instructions SQL répétées (N+1)", ["endpoint"]),
+    }
+
+
+def _endpoint() -> str:
+    return request.endpoint or SANS_ENDPOINT
+
+
+def _abreger(statement: str) -> str:
+    return " ".join(statement.split())[:300]
+
+
+def _avant(conn, cursor, statement, parameters, context, executemany):
+    context._debut_instrumentation = time.perf_counter()
+
+
+def _apres(conn, cursor, statement, parameters, context, executemany):
+    debut = getattr(context, "_debut_instrumentation", None)
+    if debut is None or not has_app_context():
+        return
+    duree = time.perf_counter() - debut
+    config = current_app.config
+    if not config.get("INSTRUMENTATION"):
+        return
+    if has_request_context():
+        g.duree_sql = g.get("duree_sql", 0.0) + duree
+        # Instructions paramétrées : même texte = même requête, valeurs mises à part
+        vues = g.setdefault("instructions_sql", {})
+        vues[statement] = vues.get(statement, 0) + 1
+        seuil = config.get("SEUIL_N_PLUS_UN", 5)
+        if vues[statement] == seuil:
+            _metriques()["n_plus_un"].labels(_endpoint()).inc()
+            current_app.logger.warning("N+1 probable sur %s %s : %d fois %s",
+                                       request.method, request.path, seuil, _abreger(statement))
+    if duree >= config.get("SQL_LENTE_SECONDES", 0.2):
+        if has_request_context():
+            _metriques()["lentes"].labels(_endpoint()).inc()
+        current_app.logger.warning("Requête SQL lente (%.0f ms) : %s", duree * 1000, _abreger(statement))
+
+
+def init_app(app):
+    if not app.config.get("INSTRUMENTATION"):
+        return
+    dossier = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if dossier:
+        os.makedirs(dossier, exist_ok=True)
+    metriques = _metriques()
+    requetes.ecouter()
+    # Écoute sur la classe Engine, une seule fois par processus
+    for nom, ecouteur in (("before_cursor_execute", _avant), ("after_cursor_execute", _apres)):
+        if not event.contains(Engine, nom, ecouteur):
+            event.listen(Engine, nom, ecouteur)
+
+    @app.before_request
+    def demarrer():
+        g.debut_requete = time.perf_counter()
+
+    @app.after_request
+    def retenir_statut(reponse):
+        g.statut_reponse = reponse.status_code
+        return reponse
+
+    @app.teardown_request
+    def mesurer(erreur):
+        # Appelé même quand une exception non gérée saute after_request : 500
+        debut = g.pop("debut_requete", None)
+        if debut is None or request.endpoint == "metriques":
+            return
+        endpoint = _endpoint()
+        metriques["duree"].labels(request.method, endpoint, g.pop("statut_reponse", 500)).observe(
+            time.perf_counter() - debut)
+        metriques["requetes_sql"].labels(endpoint).observe(requetes.requetes_sql())
+        metriques["duree_sql"].labels(endpoint).observe(g.get("duree_sql", 0.0))
+
+    @app.route("/metrics", endpoint="metriques")
+    def exposer():
+        from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, REGISTRY, generate_latest
+        registre = REGISTRY
+        if dossier:
+            from prometheus_client import multiprocess
+            registre = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registre, path=dossier)
+        return Response(generate_latest(registre), mimetype=CONTENT_TYPE_LATEST)
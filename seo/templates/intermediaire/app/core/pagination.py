@@ -0,0 +1,63 @@
+"""Pagination par curseur (keyset)
+
+Au lieu de OFFSET, qui relit toutes les lignes des pages précédentes, la
+page suivante reprend après la dernière ligne vue : le coût d'une page
+ne dépend pas du nombre total de lignes, à condition qu'un index couvre
+le filtre et l'ordre (voir Tache.__table_args__).
+"""
+import base64
+from datetime import datetime
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+PAR_PAGE = 20
+PAR_PAGE_MAX = 100
+
+
+class CurseurInvalide(ValueError):
+    """Curseur illisible (modifié à la main ou d'un autre format)"""
+
+
+class Page(NamedTuple):
+    elements: List[Any]
+    suivant: Optional[str]
+
+
+def encoder_curseur(date: datetime, identifiant: int) -> str:
+    brut = f"{date.isoformat()}|{identifiant}".encode()
+    return base64.urlsafe_b64encode(brut).decode().rstrip("=")
+
+
+def decoder_curseur(curseur: str) -> Tuple[datetime, int]:
+    try:
+        brut = base64.urlsafe_b64decode(curseur + "=" * (-len(curseur) % 4)).decode()
+        date, identifiant = brut.split("|")
+        return datetime.fromisoformat(date), int(identifiant)
+    except (ValueError, UnicodeDecodeError):
+        raise CurseurInvalide(curseur) from None
+
+
+def limite_demandee(valeur: Optional[str]) -> int:
+    try:
+        return max(1, min(int(valeur), PAR_PAGE_MAX))
+    except (TypeError, ValueError):
+        return PAR_PAGE
+
+
+def page_keyset(requete, colonne_date, colonne_id, curseur: Optional[str] = None,
+                limite: int = PAR_PAGE) -> Page:
+    """Page décroissante sur (colonne_date, colonne_id), après le curseur"""
+    if curseur:
+        date, identifiant = decoder_curseur(curseur)
+        # Forme équivalente à (date, id) < (d, i), qui borne l'index sur tous les moteurs
+        requete = requete.filter(colonne_date <= date, or_(
+            colonne_date < date, and_(colonne_date == date, colonne_id < identifiant)))
+    # Une ligne de plus pour savoir s'il existe une page suivante
+    lignes = requete.order_by(colonne_date.desc(), colonne_id.desc()).limit(limite + 1).all()
+    elements = lignes[:limite]
+    suivant = None
+    if len(lignes) > limite:
+        dernier = elements[-1]
+        suivant = encoder_curseur(getattr(dernier, colonne_date.key), getattr(dernier, colonne_id.key))
+    return Page(elements, suivant)
@@ -0,0 +1,41 @@
+"""Compteur de requêtes SQL par requête HTTP
+
+Chaque réponse porte l'en-tête X-Requetes-SQL (nombre de requêtes SQL
+exécutées pour la produire), aussi journalisé en debug. Actif en mode
+debug ou avec COMPTER_REQUETES_SQL=1 ; `seo bench` l'affiche par route.
+"""
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+EN_TETE = "X-Requetes-SQL"
+
+
+def _compter(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        g.requetes_sql = g.get("requetes_sql", 0) + 1
+
+
+def requetes_sql() -> int:
+    """Requêtes SQL exécutées depuis le début de la requête HTTP courante"""
+    return g.get("requetes_sql", 0)
+
+
+def ecouter():
+    """Active le comptage (aussi utilisé par app/core/instrumentation.py)"""
+    # Écoute sur la classe Engine : pas besoin de contexte d'application
+    if not event.contains(Engine, "before_cursor_execute", _compter):
+        event.listen(Engine, "before_cursor_execute", _compter)
+
+
+def init_app(app):
+    if not (app.config.get("COMPTER_REQUETES_SQL") or app.debug):
+        return
+    ecouter()
+
+    @app.after_request
+    def ajouter_en_tete(reponse):
+        nombre = requetes_sql()
+        reponse.headers[EN_TETE] = str(nombre)
+        app.logger.debug("%s %s : %d requête(s) SQL", request.method, request.path, nombre)
+        return reponse
@@ -1,5 +1,6 @@
 ﻿"""Modèle Tâche"""
 from app import db
+from app.core.cache import surveiller
 from datetime import datetime
 
 class Tache(db.Model):
@@ -9,10 +10,18 @@ class Tache(db.Model):
     titre = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
     termine = db.Column(db.Boolean, default=False)
-    date_creation = db.Column(db.DateTime, default=datetime.utcnow)
+    date_creation = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     
     # Relation avec utilisateur
     user_id = db.Column(db.Integer, db.ForeignKey("utilisateurs.id"), nullable=False)
     
+    # Index de la liste paginée : filtre user_id, ordre (date_creation, id)
+    __table_args__ = (
+        db.Index("ix_taches_user_id_date_creation", "user_id", "date_creation", "id"),
+    )
+    
     def __repr__(self):
         return f"<Tache {self.titre}>"
+
+# Les pages en cache de l'espace "taches" sont invalidées à chaque écriture
+surveiller(Tache, "taches")
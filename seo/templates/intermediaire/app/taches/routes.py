@@ -1,44 +1,138 @@
 ﻿"""Routes tâches"""
-from flask import Blueprint, render_template, redirect, url_for, flash, request
+from flask import Blueprint, render_template, redirect, url_for, flash, request, abort, jsonify
 from flask_login import login_required, current_user
+from sqlalchemy import delete, func, not_, update
 from app import db
+from app.core.cache import cache, en_cache
+from app.core.pagination import CurseurInvalide, limite_demandee, page_keyset
 from app.taches.models import Tache
 
 bp = Blueprint("taches", __name__, url_prefix="/taches")
 
+def page_courante():
+    """Page des tâches de l'utilisateur d'après ?apres=<curseur>&limite=<n>"""
+    requete = Tache.query.filter(Tache.user_id == current_user.id)
+    try:
+        return page_keyset(requete, Tache.date_creation, Tache.id,
+                           request.args.get("apres"), limite_demandee(request.args.get("limite")))
+    except CurseurInvalide:
+        abort(400)
+
 @bp.route("/")
 @login_required
+@en_cache("taches")
 def liste():
-    taches = current_user.taches.order_by(Tache.date_creation.desc()).all()
-    return render_template("taches/liste.html", taches=taches)
+    page = page_courante()
+    return render_template("taches/liste.html", taches=page.elements, suivant=page.suivant)
+
+@bp.route("/api")
+@login_required
+@en_cache("taches")
+def liste_json():
+    page = page_courante()
+    return jsonify(
+        taches=[{
+            "id": tache.id,
+            "titre": tache.titre,
+            "description": tache.description,
+            "termine": tache.termine,
+            "date_creation": tache.date_creation.isoformat(),
+        } for tache in page.elements],
+        suivant=page.suivant,
+    )
 
 @bp.route("/ajouter", methods=["POST"])
 @login_required
 def ajouter():
     titre = request.form.get("titre")
     if titre:
-        tache = Tache(titre=titre, proprietaire=current_user)
+        # user_id plutôt que proprietaire : pas de chargement de l'utilisateur
+        tache = Tache(titre=titre, user_id=current_user.id)
         db.session.add(tache)
         db.session.commit()
         flash("Tâche ajoutée!", "success")
     return redirect(url_for("taches.liste"))
 
+# Les modifications sont des UPDATE/DELETE filtrés par propriétaire :
+# une seule requête, sans charger la tâche ni l'utilisateur.
+
+def des_taches(ids=None):
+    """Condition SQL : tâches de l'utilisateur connecté (toutes si ids est None)"""
+    condition = Tache.user_id == current_user.id
+    if ids is not None:
+        condition = condition & Tache.id.in_(ids)
+    return condition
+
+def executer(instruction):
+    """Exécute un UPDATE/DELETE, valide et retourne le nombre de lignes touchées"""
+    resultat = db.session.execute(instruction.execution_options(synchronize_session=False))
+    db.session.commit()
+    # Hors ORM : les événements de surveiller() ne voient pas ces écritures
+    cache.invalider("taches")
+    return resultat.rowcount
+
+def donnees_groupees():
+    """Corps d'une action groupée : formulaire (champs ids répétés) ou objet JSON {"ids": [...]}"""
+    if not request.is_json:
+        return request.form
+    donnees = request.get_json(silent=True)
+    if donnees is None:
+        donnees = {}
+    if not isinstance(donnees, dict):
+        abort(400)
+    return donnees
+
+def ids_demandes(donnees):
+    """Identifiants demandés ; None si tout=1 (toutes les tâches de l'utilisateur)"""
+    if str(donnees.get("tout", "")).lower() in ("1", "true"):
+        return None
+    ids = donnees.get("ids", []) if request.is_json else donnees.getlist("ids")
+    # "12" serait lu comme les tâches 1 et 2, true comme la tâche 1
+    if not isinstance(ids, list) or any(isinstance(i, bool) for i in ids):
+        abort(400)
+    try:
+        return [int(i) for i in ids]
+    except (TypeError, ValueError):
+        abort(400)
+
+def reponse_groupee(nombre, message):
+    if request.is_json:
+        return jsonify(nombre=nombre)
+    flash(message.format(nombre), "success")
+    return redirect(request.referrer or url_for("taches.liste"))
+
 @bp.route("/terminer/<int:id>")
 @login_required
 def terminer(id):
-    tache = Tache.query.get_or_404(id)
-    if tache.proprietaire == current_user:
-        tache.termine = not tache.termine
-        db.session.commit()
-        flash("Tâche mise à jour!", "success")
+    # Bascule côté base : NOT termine (NULL compté comme non terminé)
+    modifiees = executer(update(Tache).where(des_taches([id]))
+                         .values(termine=not_(func.coalesce(Tache.termine, False))))
+    if not modifiees:
+        abort(404)
+    flash("Tâche mise à jour!", "success")
     return redirect(url_for("taches.liste"))
 
 @bp.route("/supprimer/<int:id>")
 @login_required
 def supprimer(id):
-    tache = Tache.query.get_or_404(id)
-    if tache.proprietaire == current_user:
-        db.session.delete(tache)
-        db.session.commit()
-        flash("Tâche supprimée!", "success")
+    if not executer(delete(Tache).where(des_taches([id]))):
+        abort(404)
+    flash("Tâche supprimée!", "success")
     return redirect(url_for("taches.liste"))
+
+@bp.route("/terminer", methods=["POST"])
+@login_required
+def terminer_groupe():
+    """Marque plusieurs tâches terminées (termine=0 pour les rouvrir)"""
+    donnees = donnees_groupees()
+    ids = ids_demandes(donnees)
+    termine = str(donnees.get("termine", "1")).lower() not in ("0", "false")
+    nombre = executer(update(Tache).where(des_taches(ids)).values(termine=termine)) if ids != [] else 0
+    return reponse_groupee(nombre, "{} tâche(s) mise(s) à jour!")
+
+@bp.route("/supprimer", methods=["POST"])
+@login_required
+def supprimer_groupe():
+    ids = ids_demandes(donnees_groupees())
+    nombre = executer(delete(Tache).where(des_taches(ids))) if ids != [] else 0
+    return reponse_groupee(nombre, "{} tâche(s) supprimée(s)!")
@@ -0,0 +1,71 @@
+"""Cache de l'utilisateur connecté
+
+flask-login appelle user_loader à chaque requête authentifiée (puis garde
+l'utilisateur le temps de la requête). Les colonnes de l'utilisateur sont
+gardées en mémoire CACHE_UTILISATEUR_TTL secondes et rattachées à la
+session sans requête SQL (0 désactive le cache).
+
+Toute modification d'un utilisateur par l'ORM (mot de passe, is_admin...)
+l'invalide dans ce processus ; les autres workers le voient au plus tard
+après le TTL. Un UPDATE groupé (Query.update) ne passe pas par l'ORM :
+appeler invalider() après.
+"""
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app import db
+
+# id -> (expiration, colonnes)
+_cache: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+
+
+def colonnes(instance) -> Dict[str, Any]:
+    return {attribut.key: getattr(instance, attribut.key) for attribut in instance.__mapper__.column_attrs}
+
+
+def rattacher(modele, valeurs: Dict[str, Any]):
+    """Instance attachée à la session à partir des colonnes, sans SELECT"""
+    instance = modele(**valeurs)
+    make_transient_to_detached(instance)
+    return db.session.merge(instance, load=False)
+
+
+def charger(modele, identifiant: int):
+    """Utilisateur par clé primaire, depuis le cache si l'entrée est fraîche"""
+    entree = _cache.get(identifiant)
+    if entree is not None and entree[0] > time.monotonic():
+        return rattacher(modele, entree[1])
+    instance = db.session.get(modele, identifiant)
+    ttl = current_app.config.get("CACHE_UTILISATEUR_TTL", 30)
+    if instance is not None and ttl > 0:
+        _cache[identifiant] = (time.monotonic() + ttl, colonnes(instance))
+    return instance
+
+
+def invalider(identifiant: Optional[int] = None):
+    """Oublie un utilisateur (ou tous)"""
+    if identifiant is None:
+        _cache.clear()
+    else:
+        _cache.pop(identifiant, None)
+
+
+def surveiller(modele):
+    """Invalide le cache quand un utilisateur est modifié ou supprimé"""
+
+    def modifie(mapper, connection, instance):
+        invalider(instance.id)
+        # Une requête concurrente a pu remettre l'ancienne version avant la validation
+        Session.object_session(instance).info.setdefault("utilisateurs_modifies", set()).add(instance.id)
+
+    event.listen(modele, "after_update", modifie)
+    event.listen(modele, "after_delete", modifie)
+
+    @event.listens_for(Session, "after_commit")
+    def apres_validation(session):
+        for identifiant in session.info.pop("utilisateurs_modifies", ()):
+            invalider(identifiant)
@@ -1,7 +1,7 @@
 ﻿"""Modèle Utilisateur (gestion des utilisateurs)"""
 from app import db, login_manager
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.utilisateurs import cache, mots_de_passe
 
 class User(UserMixin, db.Model):
     __tablename__ = "utilisateurs"
@@ -16,14 +16,18 @@ class User(UserMixin, db.Model):
     taches = db.relationship("Tache", backref="proprietaire", lazy="dynamic", cascade="all, delete-orphan")
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = mots_de_passe.hacher(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        """Vérifie sur le pool de hachage (lève HachageSature s'il est saturé)"""
+        return mots_de_passe.verifier(self.password_hash, password)
     
     def __repr__(self):
         return f"<User {self.username}>"
 
+cache.surveiller(User)
+
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    # Pas de SELECT par requête : voir app/utilisateurs/cache.py
+    return cache.charger(User, int(user_id))
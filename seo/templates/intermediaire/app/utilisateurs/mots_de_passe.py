@@ -0,0 +1,87 @@
+"""Hachage et vérification des mots de passe
+
+La méthode et son coût viennent de HACHAGE_MOT_DE_PASSE (format werkzeug,
+par exemple "scrypt:32768:8:1" ou "pbkdf2:sha256:600000"), réglé par
+environnement dans core/config.py.
+
+Une vérification coûte des dizaines de millisecondes de CPU : elles sont
+exécutées sur un pool borné (HACHAGE_CONCURRENCE threads par processus).
+Quand le pool est saturé plus de HACHAGE_ATTENTE secondes, la connexion
+est refusée (HachageSature) au lieu d'occuper tous les workers.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional
+
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash
+
+METHODE_DEFAUT = "scrypt:32768:8:1"
+
+
+class HachageSature(RuntimeError):
+    """Trop de vérifications de mots de passe en attente"""
+
+
+_pool: Optional[ThreadPoolExecutor] = None
+_places: Optional[threading.BoundedSemaphore] = None
+_verrou = threading.Lock()
+
+
+def _reinitialiser():
+    # Les threads du pool ne survivent pas au fork (gunicorn avec preload)
+    global _pool, _places, _verrou
+    _pool, _places, _verrou = None, None, threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinitialiser)
+
+
+def _config(cle, defaut):
+    return current_app.config.get(cle, defaut) if has_app_context() else defaut
+
+
+def methode() -> str:
+    return _config("HACHAGE_MOT_DE_PASSE", None) or METHODE_DEFAUT
+
+
+def _executer(fonction, *arguments):
+    """Exécute un hachage sur le pool ; HachageSature si aucune place ne se libère à temps"""
+    global _pool, _places
+    if _pool is None:
+        with _verrou:
+            if _pool is None:
+                concurrence = int(_config("HACHAGE_CONCURRENCE", 2))
+                # Au plus une vérification en attente par thread du pool
+                _places = threading.BoundedSemaphore(2 * concurrence)
+                _pool = ThreadPoolExecutor(max_workers=concurrence, thread_name_prefix="hachage")
+    if not _places.acquire(timeout=float(_config("HACHAGE_ATTENTE", 2))):
+        raise HachageSature("Trop de connexions simultanées")
+    try:
+        return _pool.submit(fonction, *arguments).result()
+    finally:
+        _places.release()
+
+
+def hacher(mot_de_passe: str) -> str:
+    return _executer(generate_password_hash, mot_de_passe, methode())
+
+
+def verifier(empreinte: Optional[str], mot_de_passe: str) -> bool:
+    if not empreinte:
+        return False
+    return _executer(check_password_hash, empreinte, mot_de_passe)
+
+
+@lru_cache(maxsize=8)
+def _prefixe(methode_configuree: str) -> str:
+    # werkzeug complète les paramètres omis ("scrypt" -> "scrypt:32768:8:1")
+    return generate_password_hash("", methode_configuree).split("$", 1)[0]
+
+
+def doit_rehacher(empreinte: Optional[str]) -> bool:
+    """Vrai si l'empreinte n'a pas été produite avec la méthode et le coût configurés"""
+    return bool(empreinte) and empreinte.split("$", 1)[0] != _prefixe(methode())
@@ -2,6 +2,7 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_user, logout_user, login_required, current_user
 from app import db
+from app.utilisateurs import mots_de_passe
 from app.utilisateurs.models import User
 
 bp = Blueprint("utilisateurs", __name__, url_prefix="/auth")
@@ -16,7 +17,19 @@ def connexion():
         password = request.form.get("password")
         
         user = User.query.filter_by(username=username).first()
-        if user and user.check_password(password):
+        try:
+            valide = user is not None and user.check_password(password)
+        except mots_de_passe.HachageSature:
+            flash("Trop de connexions en cours, réessayez dans un instant", "error")
+            return render_template("utilisateurs/connexion.html"), 503, {"Retry-After": "1"}
+        if valide:
+            # Coût ou méthode changés dans la configuration : mise à niveau transparente
+            if mots_de_passe.doit_rehacher(user.password_hash):
+                try:
+                    user.set_password(password)
+                    db.session.commit()
+                except mots_de_passe.HachageSature:
+                    pass  # refait à la prochaine connexion
             login_user(user)
             flash("Connexion réussie!", "success")
             next_page = request.args.get("next")
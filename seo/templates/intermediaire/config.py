@@ -1,10 +1,12 @@
 ﻿"""Configuration racine du projet"""
 import os
 from dotenv import load_dotenv
+from app.core.config import options_moteur
 
 load_dotenv()
 
 class Config:
     SECRET_KEY = os.environ.get("SECRET_KEY") or "dev-secret-changez-moi-en-production"
-    SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL") or "sqlite:///app.db"
+    SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL") or "{= database_url =}"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = options_moteur(SQLALCHEMY_DATABASE_URI)
@@ -0,0 +1,46 @@
+"""Application Celery liée à Flask (tâches de fond)
+
+Les appels lents (SMTP, API Stripe...) quittent le chemin de la requête :
+la vue met une tâche en file (`tache.delay(...)`) et répond aussitôt ; un
+worker l'exécute dans un contexte d'application (db, config...).
+
+    celery -A celery_worker.celery worker --loglevel=info
+    celery -A celery_worker.celery beat --loglevel=info
+"""
+import os
+
+from celery import Celery, Task
+
+
+def init_app(app):
+    class TacheFlask(Task):
+        def __call__(self, *args, **kwargs):
+            with app.app_context():
+                return self.run(*args, **kwargs)
+
+    celery = Celery(app.import_name, task_cls=TacheFlask)
+    courtier = app.config.get("CELERY_BROKER_URL") or os.environ.get(
+        "CELERY_BROKER_URL", "redis://localhost:6379/0")
+    celery.conf.update(
+        broker_url=courtier,
+        result_backend=app.config.get("CELERY_RESULT_BACKEND") or os.environ.get("CELERY_RESULT_BACKEND"),
+        # Les vues n'attendent pas de résultat : rien à stocker
+        task_ignore_result=True,
+        # Acquittée après exécution : une tâche d'un worker tué est relivrée
+        task_acks_late=True,
+        task_reject_on_worker_lost=True,
+        # Tâches d'E/S longues : un worker ne réserve pas celles qu'il ne peut pas commencer
+        worker_prefetch_multiplier=1,
+        task_time_limit=int(os.environ.get("CELERY_TASK_TIME_LIMIT", 300)),
+        broker_connection_retry_on_startup=True,
+        # Exécution immédiate dans le processus (tests)
+        task_always_eager=app.config.get("CELERY_TASK_ALWAYS_EAGER", False),
+        task_eager_propagates=True,
+        timezone="UTC",
+        # Tâches périodiques lancées par `celery beat`, par exemple :
+        # "purge": {"task": "app.taches_fond.maintenance.purger", "schedule": 3600},
+        beat_schedule={},
+    )
+    celery.set_default()
+    app.extensions["celery"] = celery
+    return celery
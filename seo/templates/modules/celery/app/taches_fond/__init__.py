@@ -0,0 +1,11 @@
+"""
+Tâches de fond exécutées par les workers Celery (app/core/celery.py)
+
+Chaque module de ce paquet est importé ici pour que le worker connaisse
+ses tâches.
+"""
+import importlib
+import pkgutil
+
+for _module in pkgutil.iter_modules(__path__):
+    importlib.import_module(f"{__name__}.{_module.name}")
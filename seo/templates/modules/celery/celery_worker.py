@@ -0,0 +1,11 @@
+"""
+Point d'entrée des processus Celery
+
+    celery -A celery_worker.celery worker --loglevel=info
+    celery -A celery_worker.celery beat --loglevel=info
+"""
+import app.taches_fond  # noqa: F401  (enregistre les tâches)
+from app import create_app
+
+flask_app = create_app()
+celery = flask_app.extensions["celery"]
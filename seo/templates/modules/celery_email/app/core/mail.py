@@ -0,0 +1,29 @@
+"""E-mails (Flask-Mail), envoyés par un worker Celery
+
+    from app.core.mail import envoyer_email
+    envoyer_email(["client@exemple.fr"], "Bienvenue", "Votre compte est prêt")
+"""
+import os
+from typing import Iterable, Optional
+
+from flask_mail import Mail
+
+mail = Mail()
+
+
+def init_app(app):
+    # MAIL_* du .env, sauf si la configuration les définit déjà
+    app.config.setdefault("MAIL_SERVER", os.environ.get("MAIL_SERVER", "localhost"))
+    app.config.setdefault("MAIL_PORT", int(os.environ.get("MAIL_PORT", 25)))
+    app.config.setdefault("MAIL_USE_TLS", os.environ.get("MAIL_USE_TLS", "").lower() in ("1", "true"))
+    app.config.setdefault("MAIL_USERNAME", os.environ.get("MAIL_USERNAME"))
+    app.config.setdefault("MAIL_PASSWORD", os.environ.get("MAIL_PASSWORD"))
+    app.config.setdefault("MAIL_DEFAULT_SENDER", os.environ.get("MAIL_DEFAULT_SENDER")
+                          or os.environ.get("MAIL_USERNAME") or "noreply@localhost")
+    mail.init_app(app)
+
+
+def envoyer_email(destinataires: Iterable[str], sujet: str, texte: str, html: Optional[str] = None):
+    """Met l'e-mail en file : la requête n'attend pas le serveur SMTP"""
+    from app.taches_fond.emails import envoyer
+    return envoyer.delay(list(destinataires), sujet, texte, html)
@@ -0,0 +1,17 @@
+"""Envoi des e-mails (mis en file par app.core.mail.envoyer_email)"""
+import smtplib
+
+from celery import shared_task
+
+
+# Erreurs passagères seulement (un destinataire refusé ne se corrige pas en réessayant)
+ERREURS_TRANSITOIRES = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, TimeoutError)
+
+
+# Nouvel essai après 1 s, 2 s, 4 s... avec une part d'aléatoire, 10 min d'écart au plus
+@shared_task(autoretry_for=ERREURS_TRANSITOIRES, retry_backoff=True,
+             retry_backoff_max=600, retry_jitter=True, max_retries=6)
+def envoyer(destinataires, sujet, texte, html=None):
+    from flask_mail import Message
+    from app.core.mail import mail
+    mail.send(Message(sujet, recipients=destinataires, body=texte, html=html))
@@ -0,0 +1,34 @@
+"""
+Webhook Stripe
+
+La signature est vérifiée dans la requête (calcul local), puis l'événement
+est confié à un worker Celery (app/taches_fond/stripe.py) : Stripe reçoit
+sa réponse en quelques millisecondes, quel que soit le traitement.
+"""
+import json
+import os
+
+from flask import Blueprint, abort, current_app, jsonify, request
+
+bp = Blueprint("stripe", __name__, url_prefix="/api/v1/stripe")
+
+
+@bp.route("/webhook", methods=["POST"])
+def webhook():
+    import stripe
+    from app.taches_fond.stripe import traiter_evenement
+    charge = request.get_data()
+    try:
+        stripe.Webhook.construct_event(charge, request.headers.get("Stripe-Signature", ""),
+                                       current_app.config["STRIPE_WEBHOOK_SECRET"])
+    except (ValueError, stripe.SignatureVerificationError):
+        abort(400)
+    # Le JSON brut (déjà authentifié) se sérialise tel quel dans la file
+    traiter_evenement.delay(json.loads(charge))
+    return jsonify(recu=True)
+
+
+def init_app(app):
+    app.config.setdefault("STRIPE_SECRET_KEY", os.environ.get("STRIPE_SECRET_KEY"))
+    app.config.setdefault("STRIPE_WEBHOOK_SECRET", os.environ.get("STRIPE_WEBHOOK_SECRET"))
+    app.register_blueprint(bp)
@@ -0,0 +1,47 @@
+"""
+Traitement des événements Stripe (reçus par app/api/v1/stripe.py)
+
+Stripe peut livrer un même événement plusieurs fois : chaque gestionnaire
+doit être idempotent (clé : evenement["id"] ou l'identifiant de l'objet).
+"""
+import logging
+
+import stripe
+from celery import shared_task
+from flask import current_app
+
+journal = logging.getLogger(__name__)
+
+# Type d'événement -> fonction(objet)
+GESTIONNAIRES = {}
+
+ERREURS_TRANSITOIRES = (stripe.APIConnectionError, stripe.RateLimitError, ConnectionError, TimeoutError)
+
+
+def gestionnaire(type_evenement: str):
+    def enregistrer(fonction):
+        GESTIONNAIRES[type_evenement] = fonction
+        return fonction
+    return enregistrer
+
+
+@shared_task(autoretry_for=ERREURS_TRANSITOIRES, retry_backoff=True,
+             retry_backoff_max=600, retry_jitter=True, max_retries=8)
+def traiter_evenement(evenement):
+    fonction = GESTIONNAIRES.get(evenement["type"])
+    if fonction is None:
+        return
+    stripe.api_key = current_app.config.get("STRIPE_SECRET_KEY")
+    fonction(evenement["data"]["object"])
+
+
+@gestionnaire("checkout.session.completed")
+def paiement_termine(session):
+    journal.info("Paiement terminé pour le client %s", session.get("customer"))
+    # À compléter : activer l'abonnement, envoyer la facture...
+
+
+@gestionnaire("customer.subscription.deleted")
+def abonnement_resilie(abonnement):
+    journal.info("Abonnement %s résilié", abonnement.get("id"))
+    # À compléter : désactiver l'accès du client
@@ -0,0 +1,53 @@
+"""
+Point d'entrée de l'application
+API versionnée (app/api/v1), configuration dans app/core
+"""
+import importlib
+import importlib.util
+import os
+
+from flask import Flask
+from flask_cors import CORS
+from flask_jwt_extended import JWTManager
+from flask_migrate import Migrate
+
+from .core import sqlite
+from .core.cache import cache
+from .core.config import Config, config
+from .db.base import db
+
+migrate = Migrate()
+jwt = JWTManager()
+
+# Modules écrits à la génération selon les options (SaaS : Celery, e-mails, Stripe)
+MODULES_OPTIONNELS = ("app.core.celery", "app.core.mail", "app.api.v1.stripe")
+
+def create_app(config_class=None):
+    """
+    Crée l'application ; sans config_class, FLASK_ENV choisit la configuration
+    (development : `seo run`, .env.example ; production : docker-compose.yml).
+    Sans FLASK_ENV, Config : jamais les réglages de développement par défaut.
+    """
+    if config_class is None:
+        config_class = config.get(os.environ.get("FLASK_ENV", ""), Config)
+    app = Flask(__name__)
+    app.config.from_object(config_class)
+
+    # Initialiser les extensions
+    sqlite.init_app(app)
+    db.init_app(app)
+    migrate.init_app(app, db)
+    jwt.init_app(app)
+    CORS(app)
+    cache.init_app(app)
+
+    # Enregistrer les versions de l'API
+    from app.api.v1 import bp as api_v1_bp
+
+    app.register_blueprint(api_v1_bp)
+
+    for nom in MODULES_OPTIONNELS:
+        if importlib.util.find_spec(nom) is not None:
+            importlib.import_module(nom).init_app(app)
+
+    return app
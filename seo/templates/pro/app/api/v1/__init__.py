@@ -0,0 +1,2 @@
+"""API v1"""
+from app.api.v1.endpoints import bp
@@ -0,0 +1,19 @@
+"""
+Endpoints de l'API v1
+
+Les lectures coûteuses se mettent en cache par utilisateur avec
+@en_cache("espace") (app/core/cache.py) ; surveiller(Modele, "espace")
+les invalide à chaque écriture du modèle.
+"""
+from flask import Blueprint, jsonify
+from sqlalchemy import text
+
+from app.db.base import db
+
+bp = Blueprint("api_v1", __name__, url_prefix="/api/v1")
+
+@bp.route("/sante")
+def sante():
+    """Sonde de disponibilité (jamais en cache) : l'application et la base répondent"""
+    db.session.execute(text("SELECT 1"))
+    return jsonify(statut="ok")
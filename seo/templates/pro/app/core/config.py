@@ -0,0 +1,81 @@
+"""Configuration de l'application"""
+import os
+import warnings
+from pathlib import Path
+
+basedir = Path(__file__).resolve().parent.parent.parent
+
+def url_base_donnees():
+    """URL de la base ({= base_donnees =} à la génération), SQLite relatif à la racine du projet"""
+    url = os.environ.get("DATABASE_URL") or "{= database_url =}"
+    if url.startswith("sqlite:///") and not url.startswith("sqlite:////"):
+        url = f"sqlite:///{basedir / url[len('sqlite:///'):]}"
+    return url
+
+def options_moteur(url):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS selon la base et le dimensionnement gunicorn
+
+    Chaque worker a son propre pool : workers x (pool_size + max_overflow)
+    reste sous DB_MAX_CONNEXIONS (max_connections de PostgreSQL, ou la
+    limite clients de PgBouncer). WEB_CONCURRENCY et GUNICORN_THREADS sont
+    exportés par gunicorn.conf.py. SQLite : voir app/core/sqlite.py.
+    Au-delà d'un worker par connexion du budget, celui-ci ne peut plus
+    être tenu : un avertissement le signale au démarrage.
+    """
+    if url.startswith("sqlite"):
+        return {}
+    workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+    budget = int(os.environ.get("DB_MAX_CONNEXIONS", 80))
+    if workers > budget:
+        warnings.warn(f"{workers} workers pour DB_MAX_CONNEXIONS={budget} : une connexion "
+                      f"par worker au minimum, {workers} connexions possibles", RuntimeWarning)
+    par_worker = max(1, budget // workers)
+    if os.environ.get("GUNICORN_WORKER_CLASS") == "gevent":
+        # Des centaines de greenlets par worker : tout le budget, sans débordement
+        concurrence = par_worker
+    else:
+        # Une connexion par thread de requête au plus
+        concurrence = min(int(os.environ.get("GUNICORN_THREADS", 4)), par_worker)
+    return {
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", concurrence)),
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", min(2, par_worker - concurrence))),
+        # Connexion vérifiée avant usage (redémarrage de la base, coupure réseau)
+        "pool_pre_ping": True,
+        # Recyclée avant les délais d'inactivité des proxies et de MySQL (wait_timeout)
+        "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", 1800)),
+        "pool_timeout": int(os.environ.get("DB_POOL_TIMEOUT", 10)),
+    }
+
+class Config:
+    NOM_PROJET = "{= nom_projet_py =}"
+    SECRET_KEY = os.environ.get("SECRET_KEY") or "dev-secret-key-changez-moi"
+    JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY") or SECRET_KEY
+    SQLALCHEMY_DATABASE_URI = url_base_donnees()
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Pool de connexions dimensionné d'après gunicorn.conf.py (chargé avant l'application)
+    SQLALCHEMY_ENGINE_OPTIONS = options_moteur(SQLALCHEMY_DATABASE_URI)
+    # Cache des réponses (app/core/cache.py) : Redis si REDIS_URL ; 0 le désactive
+    REDIS_URL = os.environ.get("REDIS_URL")
+    CACHE_TTL = int(os.environ.get("CACHE_TTL", 60))
+    # Sans Redis, LRU en mémoire en debug ou si CACHE_MEMOIRE=1 (un seul worker)
+    CACHE_MEMOIRE = os.environ.get("CACHE_MEMOIRE") == "1"
+
+class DevelopmentConfig(Config):
+    DEBUG = True
+
+class TestingConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    CACHE_TTL = 0
+
+class ProductionConfig(Config):
+    DEBUG = False
+
+config = {
+    "development": DevelopmentConfig,
+    "production": ProductionConfig,
+    "testing": TestingConfig,
+    "default": DevelopmentConfig
+}
@@ -0,0 +1,35 @@
+"""Réglages SQLite appliqués à chaque nouvelle connexion
+
+En mode WAL, les lectures ne bloquent plus l'écriture (et inversement) :
+indispensable dès que plusieurs threads ou workers servent des requêtes.
+"""
+import sqlite3
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    # Sûr en WAL (seul le dernier commit peut être perdu sur coupure), beaucoup moins de fsync
+    "PRAGMA synchronous=NORMAL",
+    # Attendre le verrou d'écriture au lieu d'échouer avec « database is locked »
+    "PRAGMA busy_timeout=5000",
+    # Cache de pages de 20 Mo par connexion, tables temporaires en mémoire
+    "PRAGMA cache_size=-20000",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def _appliquer(connexion, enregistrement):
+    if isinstance(connexion, sqlite3.Connection):
+        curseur = connexion.cursor()
+        for pragma in PRAGMAS:
+            curseur.execute(pragma)
+        curseur.close()
+
+
+def init_app(app):
+    if not app.config.get("SQLALCHEMY_DATABASE_URI", "").startswith("sqlite"):
+        return
+    if not event.contains(Engine, "connect", _appliquer):
+        event.listen(Engine, "connect", _appliquer)
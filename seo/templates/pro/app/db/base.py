@@ -0,0 +1,4 @@
+"""Instance SQLAlchemy partagée par les modèles (app/db/models.py)"""
+from flask_sqlalchemy import SQLAlchemy
+
+db = SQLAlchemy()
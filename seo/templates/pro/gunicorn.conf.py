@@ -0,0 +1,120 @@
+"""
+Configuration gunicorn (production)
+
+Le dimensionnement est calculé au démarrage, à partir des CPU réellement
+disponibles (affinité et quota cgroup du conteneur compris). Chaque
+valeur peut être imposée par variable d'environnement.
+
+    sync     2 x CPU + 1 workers, un thread chacun (requêtes courtes, CPU)
+    gthread  CPU + 1 workers x GUNICORN_THREADS threads (défaut, E/S base de données)
+    gevent   CPU workers, GUNICORN_WORKER_CONNECTIONS connexions (E/S longues ; pip install gevent)
+"""
+import os
+import shutil
+import tempfile
+
+
+def cpus_disponibles() -> int:
+    """CPU utilisables par ce processus, quota du conteneur compris"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        # cgroup v2 : "quota période" ou "max"
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, periode = f.read().split()
+        if quota != 'max':
+            cpus = min(cpus, max(1, int(quota) // int(periode)))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+CPUS = cpus_disponibles()
+
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', '5000')}")
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+
+if worker_class == 'sync':
+    workers, threads = 2 * CPUS + 1, 1
+elif worker_class == 'gevent':
+    workers, threads = CPUS, 1
+    worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+    # Avec preload, l'application est importée par le maître : patcher avant
+    from gevent import monkey
+    monkey.patch_all()
+else:
+    workers, threads = CPUS + 1, int(os.environ.get('GUNICORN_THREADS', 4))
+
+# WEB_CONCURRENCY est la convention des hébergeurs (Heroku, Render...)
+workers = int(os.environ.get('WEB_CONCURRENCY', workers))
+
+# Exportés pour l'application (chargée après ce fichier) : taille des pools SQL
+os.environ['WEB_CONCURRENCY'] = str(workers)
+os.environ['GUNICORN_THREADS'] = str(threads)
+os.environ['GUNICORN_WORKER_CLASS'] = worker_class
+
+# Métriques Prometheus (INSTRUMENTATION=1) : un dossier partagé par les workers, vide au
+# démarrage, pour que GET /metrics additionne les compteurs de tous les workers
+if os.environ.get('INSTRUMENTATION') == '1':
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        shutil.rmtree(os.environ['PROMETHEUS_MULTIPROC_DIR'], ignore_errors=True)
+        os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'])
+    else:
+        # Dossier temporaire, supprimé à l'arrêt (on_exit)
+        DOSSIER_METRIQUES = tempfile.mkdtemp(
+            prefix='prometheus-', dir='/dev/shm' if os.path.isdir('/dev/shm') else None)
+        os.environ['PROMETHEUS_MULTIPROC_DIR'] = DOSSIER_METRIQUES
+
+# Application chargée une fois dans le maître puis partagée en copie sur écriture
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') != '0'
+
+# Recyclage des workers (fuites mémoire), décalé pour ne pas tous les redémarrer ensemble
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', max_requests // 10))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+
+# Battement de cœur des workers en mémoire plutôt que sur le disque du conteneur
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = os.environ.get('GUNICORN_ACCESSLOG', '-')
+loglevel = os.environ.get('GUNICORN_LOGLEVEL', 'info')
+
+
+def when_ready(server):
+    cfg = server.cfg
+    server.log.info("%s workers %s x %s threads (%s CPU), preload=%s, max_requests=%s",
+                    cfg.workers, cfg.worker_class_str, cfg.threads, CPUS,
+                    cfg.preload_app, cfg.max_requests)
+
+
+def post_fork(server, worker):
+    # Avec preload, les connexions SQL ouvertes par le maître ne doivent pas être partagées
+    application = server.app.wsgi() if server.cfg.preload_app else None
+    extension = getattr(application, 'extensions', {}).get('sqlalchemy')
+    if extension is not None:
+        with application.app_context():
+            getattr(extension, 'db', extension).engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    # seo run prod --profile : profils des requêtes de ce worker (seo.profilage)
+    if os.environ.get('SEO_PROFIL'):
+        from seo.profilage import MiddlewareProfilage, Options
+        worker.wsgi = MiddlewareProfilage(worker.wsgi, Options.depuis_environnement())
+
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def on_exit(server):
+    if 'DOSSIER_METRIQUES' in globals():
+        shutil.rmtree(DOSSIER_METRIQUES, ignore_errors=True)
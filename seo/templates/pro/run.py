@@ -0,0 +1,12 @@
+"""Point d'entrée pour lancer l'application"""
+from app import create_app
+from app.db.base import db
+
+app = create_app()
+
+@app.shell_context_processor
+def make_shell_context():
+    return {"db": db}
+
+if __name__ == "__main__":
+    app.run(debug=True)
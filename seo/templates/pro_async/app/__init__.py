@@ -0,0 +1,31 @@
+"""
+Point d'entrée de l'application (ASGI)
+
+Quart reprend l'API de Flask (blueprints, config, request, g) avec des
+vues asynchrones, servies par uvicorn (gunicorn.conf.py) : un worker
+traite des centaines de requêtes qui attendent la base ou le réseau.
+API versionnée (app/api/v1), configuration dans app/core.
+"""
+from quart import Quart
+from quart_cors import cors
+
+from .core import sqlite
+from .core.config import Config
+from .db.base import db
+
+def create_app(config_class=Config):
+    app = Quart(__name__)
+    app.config.from_object(config_class)
+
+    # Initialiser les extensions
+    db.init_app(app)
+    sqlite.init_app(app, db.engine)
+    app = cors(app, allow_origin=[origine.strip() for origine in app.config["CORS_ORIGINES"].split(",")])
+
+    # Enregistrer les versions de l'API
+    from app.api.v1 import auth_bp, bp as api_v1_bp
+
+    app.register_blueprint(api_v1_bp)
+    app.register_blueprint(auth_bp)
+
+    return app
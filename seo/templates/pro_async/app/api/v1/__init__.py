@@ -0,0 +1,3 @@
+"""API v1"""
+from app.api.v1.auth import bp as auth_bp
+from app.api.v1.endpoints import bp
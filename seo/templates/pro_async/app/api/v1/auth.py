@@ -0,0 +1,43 @@
+"""Inscription, connexion (jeton JWT) et profil de l'utilisateur connecté"""
+from quart import Blueprint, g, request
+from sqlalchemy import or_, select
+
+from app.core.security import creer_jeton, hacher, jwt_requis, verifier
+from app.db.base import db
+from app.db.models import User
+
+bp = Blueprint("auth", __name__, url_prefix="/api/v1/auth")
+
+@bp.route("/inscription", methods=["POST"])
+async def inscription():
+    donnees = await request.get_json(silent=True) or {}
+    username, email, mot_de_passe = (donnees.get(champ) for champ in ("username", "email", "password"))
+    if not username or not email or not mot_de_passe:
+        return {"erreur": "username, email et password sont requis"}, 400
+    async with db.session() as session:
+        existant = await session.scalar(
+            select(User.id).where(or_(User.username == username, User.email == email)))
+        if existant is not None:
+            return {"erreur": "Nom d'utilisateur ou e-mail déjà utilisé"}, 409
+        utilisateur = User(username=username, email=email, password_hash=await hacher(mot_de_passe))
+        session.add(utilisateur)
+        await session.commit()
+    return utilisateur.to_dict(), 201
+
+@bp.route("/connexion", methods=["POST"])
+async def connexion():
+    donnees = await request.get_json(silent=True) or {}
+    async with db.session() as session:
+        utilisateur = await session.scalar(select(User).where(User.username == donnees.get("username")))
+    if not await verifier(utilisateur and utilisateur.password_hash, donnees.get("password") or ""):
+        return {"erreur": "Identifiants invalides"}, 401
+    return {"access_token": creer_jeton(utilisateur.id), "token_type": "Bearer"}
+
+@bp.route("/moi")
+@jwt_requis
+async def moi():
+    async with db.session() as session:
+        utilisateur = await session.get(User, int(g.identite))
+    if utilisateur is None:
+        return {"erreur": "Utilisateur introuvable"}, 404
+    return utilisateur.to_dict()
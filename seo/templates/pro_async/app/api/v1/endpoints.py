@@ -0,0 +1,21 @@
+"""
+Endpoints de l'API v1
+
+Les vues sont des coroutines : pendant qu'une requête attend la base
+(await session.execute) ou un service externe (httpx.AsyncClient), le
+worker en sert d'autres. Un appel bloquant (bibliothèque synchrone,
+calcul long) passe par asyncio.to_thread pour ne pas figer la boucle.
+"""
+from quart import Blueprint
+from sqlalchemy import text
+
+from app.db.base import db
+
+bp = Blueprint("api_v1", __name__, url_prefix="/api/v1")
+
+@bp.route("/sante")
+async def sante():
+    """Sonde de disponibilité : l'application et la base répondent"""
+    async with db.session() as session:
+        await session.execute(text("SELECT 1"))
+    return {"statut": "ok"}
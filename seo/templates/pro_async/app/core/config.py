@@ -0,0 +1,83 @@
+"""Configuration de l'application"""
+import os
+from pathlib import Path
+
+basedir = Path(__file__).resolve().parent.parent.parent
+
+# Pilotes asynchrones de SQLAlchemy (create_async_engine) par schéma d'URL
+PILOTES_ASYNC = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+def url_base_donnees():
+    """
+    URL asynchrone de la base ({= base_donnees =} à la génération)
+
+    DATABASE_URL peut rester au format synchrone partagé avec les autres
+    outils (postgresql://, mysql+pymysql://) : le pilote est remplacé par
+    son équivalent asynchrone. SQLite est relatif à la racine du projet.
+    """
+    url = os.environ.get("DATABASE_URL") or "{= database_url =}"
+    schema, separateur, reste = url.partition("://")
+    url = PILOTES_ASYNC.get(schema.split("+")[0], schema) + separateur + reste
+    if url.startswith("sqlite+aiosqlite:///") and not url.startswith("sqlite+aiosqlite:////"):
+        url = f"sqlite+aiosqlite:///{basedir / url[len('sqlite+aiosqlite:///'):]}"
+    return url
+
+def options_moteur(url):
+    """
+    Options de create_async_engine selon la base et le nombre de workers
+
+    Un worker uvicorn sert toutes ses requêtes sur une seule boucle
+    d'événements : le nombre de requêtes SQL simultanées n'est plus borné
+    par des threads mais par le pool. Chaque worker reçoit sa part de
+    DB_MAX_CONNEXIONS (WEB_CONCURRENCY est exporté par gunicorn.conf.py),
+    sans débordement : au-delà, les requêtes attendent une connexion
+    (DB_POOL_TIMEOUT) au lieu de saturer la base.
+    """
+    if url.startswith("sqlite"):
+        return {}
+    workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+    par_worker = max(1, int(os.environ.get("DB_MAX_CONNEXIONS", 80)) // workers)
+    return {
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", min(20, par_worker))),
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", 0)),
+        # Connexion vérifiée avant usage (redémarrage de la base, coupure réseau)
+        "pool_pre_ping": True,
+        # Recyclée avant les délais d'inactivité des proxies et de MySQL (wait_timeout)
+        "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", 1800)),
+        "pool_timeout": int(os.environ.get("DB_POOL_TIMEOUT", 10)),
+    }
+
+class Config:
+    NOM_PROJET = "{= nom_projet_py =}"
+    SECRET_KEY = os.environ.get("SECRET_KEY") or "dev-secret-key-changez-moi-en-production"
+    JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY") or SECRET_KEY
+    # Durée de validité des jetons d'accès, en secondes
+    JWT_DUREE = int(os.environ.get("JWT_DUREE", 3600))
+    DATABASE_URL = url_base_donnees()
+    # Pool de connexions dimensionné d'après gunicorn.conf.py (chargé avant l'application)
+    DATABASE_ENGINE_OPTIONS = options_moteur(DATABASE_URL)
+    # Origines autorisées (CORS), séparées par des virgules
+    CORS_ORIGINES = os.environ.get("CORS_ORIGINES", "*")
+
+class DevelopmentConfig(Config):
+    DEBUG = True
+
+class TestingConfig(Config):
+    TESTING = True
+    DATABASE_URL = "sqlite+aiosqlite://"
+    DATABASE_ENGINE_OPTIONS = {}
+
+class ProductionConfig(Config):
+    DEBUG = False
+
+config = {
+    "development": DevelopmentConfig,
+    "production": ProductionConfig,
+    "testing": TestingConfig,
+    "default": DevelopmentConfig
+}
@@ -0,0 +1,67 @@
+"""
+Authentification par jeton JWT, sans bloquer la boucle d'événements
+
+Le hachage des mots de passe (scrypt, volontairement lent) s'exécute
+dans un thread : pendant ce temps, le worker continue de servir les
+autres requêtes. La vérification d'un jeton (HMAC) est immédiate.
+
+    @bp.route("/privee")
+    @jwt_requis
+    async def privee():
+        return {"utilisateur": g.identite}
+"""
+import asyncio
+import time
+from functools import lru_cache, wraps
+
+import jwt
+from quart import current_app, g, request
+from werkzeug.security import check_password_hash, generate_password_hash
+
+ALGORITHME = "HS256"
+
+
+@lru_cache(maxsize=None)
+def _empreinte_factice() -> str:
+    # Une connexion avec un nom inconnu coûte autant qu'avec un bon nom
+    return generate_password_hash("-")
+
+
+async def hacher(mot_de_passe: str) -> str:
+    return await asyncio.to_thread(generate_password_hash, mot_de_passe)
+
+
+async def verifier(empreinte, mot_de_passe: str) -> bool:
+    """Vérifie le mot de passe (empreinte None : utilisateur inconnu, toujours faux)"""
+    valide = await asyncio.to_thread(check_password_hash, empreinte or _empreinte_factice(), mot_de_passe)
+    return valide and empreinte is not None
+
+
+def creer_jeton(identite) -> str:
+    maintenant = int(time.time())
+    charge = {"sub": str(identite), "iat": maintenant, "exp": maintenant + current_app.config["JWT_DUREE"]}
+    return jwt.encode(charge, current_app.config["JWT_SECRET_KEY"], algorithm=ALGORITHME)
+
+
+def identite_du_jeton():
+    """Identité du jeton Bearer de la requête, None si absent ou invalide"""
+    entete = request.headers.get("Authorization", "")
+    if not entete.startswith("Bearer "):
+        return None
+    try:
+        charge = jwt.decode(entete[len("Bearer "):], current_app.config["JWT_SECRET_KEY"],
+                            algorithms=[ALGORITHME], options={"require": ["exp", "sub"]})
+    except jwt.InvalidTokenError:
+        return None
+    return charge["sub"]
+
+
+def jwt_requis(vue):
+    """Refuse la requête (401) sans jeton valide ; l'identité est dans g.identite"""
+    @wraps(vue)
+    async def enveloppe(*args, **kwargs):
+        g.identite = identite_du_jeton()
+        if g.identite is None:
+            return {"erreur": "Jeton d'accès manquant ou invalide"}, 401, {"WWW-Authenticate": "Bearer"}
+        return await current_app.ensure_async(vue)(*args, **kwargs)
+    return enveloppe
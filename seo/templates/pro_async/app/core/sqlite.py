@@ -0,0 +1,31 @@
+"""Réglages SQLite appliqués à chaque nouvelle connexion (pilote aiosqlite)
+
+En mode WAL, les lectures ne bloquent plus l'écriture (et inversement) :
+indispensable dès que plusieurs requêtes ou workers accèdent à la base.
+"""
+from sqlalchemy import event
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    # Sûr en WAL (seul le dernier commit peut être perdu sur coupure), beaucoup moins de fsync
+    "PRAGMA synchronous=NORMAL",
+    # Attendre le verrou d'écriture au lieu d'échouer avec « database is locked »
+    "PRAGMA busy_timeout=5000",
+    # Cache de pages de 20 Mo par connexion, tables temporaires en mémoire
+    "PRAGMA cache_size=-20000",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def _appliquer(connexion, enregistrement):
+    # Connexion adaptée par SQLAlchemy : son curseur est synchrone
+    curseur = connexion.cursor()
+    for pragma in PRAGMAS:
+        curseur.execute(pragma)
+    curseur.close()
+
+
+def init_app(app, engine):
+    if engine.dialect.name != "sqlite":
+        return
+    event.listen(engine.sync_engine, "connect", _appliquer)
@@ -0,0 +1,57 @@
+"""
+Moteur SQLAlchemy asynchrone partagé par les modèles (app/db/models.py)
+
+Dans une vue :
+
+    async with db.session() as session:
+        utilisateur = await session.get(User, identifiant)
+
+Les attributs sont chargés à la requête : pas de chargement paresseux
+implicite en asynchrone (selectinload() pour les relations).
+"""
+import asyncio
+
+import click
+from sqlalchemy.ext.asyncio import AsyncAttrs, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase
+
+
+class Base(AsyncAttrs, DeclarativeBase):
+    """Classe de base des modèles"""
+
+
+class BaseDeDonnees:
+    """Extension : moteur et fabrique de sessions créés à l'initialisation de l'application"""
+
+    def __init__(self):
+        self.engine = None
+        self.session = None
+
+    def init_app(self, app):
+        self.engine = create_async_engine(app.config["DATABASE_URL"],
+                                          **app.config.get("DATABASE_ENGINE_OPTIONS", {}))
+        # Objets utilisables après commit sans nouvel aller-retour vers la base
+        self.session = async_sessionmaker(self.engine, expire_on_commit=False)
+        app.extensions["database"] = self
+
+        @app.after_serving
+        async def fermer():
+            await self.engine.dispose()
+
+        @app.cli.command("creer-tables")
+        def creer_tables():
+            """Crée les tables des modèles (sans migration)"""
+            async def creer():
+                await self.creer_tables()
+                # Connexions liées à cette boucle d'événements, fermée ensuite
+                await self.engine.dispose()
+            asyncio.run(creer())
+            click.echo("Tables créées")
+
+    async def creer_tables(self):
+        from app.db import models  # noqa: F401 (enregistre les tables)
+        async with self.engine.begin() as connexion:
+            await connexion.run_sync(Base.metadata.create_all)
+
+
+db = BaseDeDonnees()
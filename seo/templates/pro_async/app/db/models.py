@@ -0,0 +1,20 @@
+"""Modèles de la base"""
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class User(Base):
+    __tablename__ = "user"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    username: Mapped[str] = mapped_column(String(80), unique=True, index=True)
+    email: Mapped[str] = mapped_column(String(120), unique=True)
+    password_hash: Mapped[str] = mapped_column(String(256))
+    date_creation: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+    def to_dict(self):
+        return {"id": self.id, "username": self.username, "email": self.email}
@@ -0,0 +1,67 @@
+"""
+Configuration gunicorn (production, application ASGI)
+
+gunicorn gère les processus (redémarrages, signaux, recyclage) et chaque
+worker uvicorn exécute une boucle d'événements : un worker par CPU
+suffit, la concurrence vient des requêtes en attente d'E/S et non du
+nombre de workers. Le dimensionnement est calculé au démarrage, à partir
+des CPU réellement disponibles (affinité et quota cgroup du conteneur
+compris). Chaque valeur peut être imposée par variable d'environnement.
+"""
+import os
+
+
+def cpus_disponibles() -> int:
+    """CPU utilisables par ce processus, quota du conteneur compris"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        # cgroup v2 : "quota période" ou "max"
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, periode = f.read().split()
+        if quota != 'max':
+            cpus = min(cpus, max(1, int(quota) // int(periode)))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+CPUS = cpus_disponibles()
+
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', '5000')}")
+# Les workers sync, gthread et gevent ne savent pas servir une application ASGI
+worker_class = 'uvicorn_worker.UvicornWorker'
+
+# WEB_CONCURRENCY est la convention des hébergeurs (Heroku, Render...)
+workers = int(os.environ.get('WEB_CONCURRENCY', CPUS))
+
+# Exporté pour l'application (chargée après ce fichier) : taille des pools SQL
+os.environ['WEB_CONCURRENCY'] = str(workers)
+os.environ['GUNICORN_WORKER_CLASS'] = worker_class
+
+# Le pool SQL et la boucle d'événements sont propres à chaque worker :
+# l'application est importée dans les workers, pas dans le maître
+preload_app = False
+
+# Recyclage des workers (fuites mémoire), décalé pour ne pas tous les redémarrer ensemble
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', max_requests // 10))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+
+# Battement de cœur des workers en mémoire plutôt que sur le disque du conteneur
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = os.environ.get('GUNICORN_ACCESSLOG', '-')
+loglevel = os.environ.get('GUNICORN_LOGLEVEL', 'info')
+
+
+def when_ready(server):
+    cfg = server.cfg
+    server.log.info("%s workers %s (%s CPU), max_requests=%s",
+                    cfg.workers, cfg.worker_class_str, CPUS, cfg.max_requests)
@@ -0,0 +1,17 @@
+"""Point d'entrée pour lancer l'application
+
+    python run.py                     développement (rechargement automatique)
+    quart --app run:app creer-tables  tables des modèles
+    seo run prod                      gunicorn + workers uvicorn (gunicorn.conf.py)
+"""
+from app import create_app
+from app.db.base import db
+
+app = create_app()
+
+@app.shell_context_processor
+def make_shell_context():
+    return {"db": db}
+
+if __name__ == "__main__":
+    app.run(debug=True)
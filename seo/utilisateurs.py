@@ -0,0 +1,248 @@
+"""
+Import, export et listing des utilisateurs d'un projet généré
+
+Les lignes sont traitées par lots : le CSV est lu en flux, les mots de
+passe d'un lot sont hachés sur un pool de processus (le hachage werkzeug
+est coûteux en CPU) pendant que le lot précédent est inséré en une seule
+requête multi-lignes (executemany). L'export et `seo user list` lisent
+la table avec un curseur côté serveur, sans la charger en mémoire.
+"""
+import csv
+import os
+import sys
+import time
+from typing import Any, Dict, Iterable, Iterator, List
+
+TAILLE_LOT = 1000
+MODULES_MODELES = ('app.utilisateurs.models', 'app.taches.models', 'app.models', 'app.db.models')
+VRAI = ('1', 'true', 'vrai', 'oui', 'yes', 'o', 'y')
+
+
+class ErreurImport(ValueError):
+    """CSV incompatible avec la table des utilisateurs"""
+
+
+def par_lots(elements: Iterable, taille: int = TAILLE_LOT) -> Iterator[List]:
+    """Découpe un itérable en listes de `taille` éléments au plus"""
+    lot = []
+    for element in elements:
+        lot.append(element)
+        if len(lot) >= taille:
+            yield lot
+            lot = []
+    if lot:
+        yield lot
+
+
+def hacher(mot_de_passe: str, methode: str = None) -> str:
+    """Hachage d'un mot de passe (exécuté dans les processus du pool)"""
+    from werkzeug.security import generate_password_hash
+    if methode:
+        return generate_password_hash(mot_de_passe, methode)
+    return generate_password_hash(mot_de_passe)
+
+
+def methode_hachage(app) -> str:
+    """Méthode configurée par le projet (HACHAGE_MOT_DE_PASSE), sinon celle de werkzeug"""
+    return app.config.get('HACHAGE_MOT_DE_PASSE')
+
+
+def extension_db(app):
+    """Instance Flask-SQLAlchemy de l'application"""
+    extension = app.extensions['sqlalchemy']
+    # Flask-SQLAlchemy 2.x enregistre un état, 3.x l'instance elle-même
+    return getattr(extension, 'db', extension)
+
+
+def trouver_modele(db, nom: str):
+    """Classe de modèle du projet par son nom, quelle que soit l'architecture du template"""
+    import importlib
+    for module in MODULES_MODELES:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            continue
+    for mapper in db.Model.registry.mappers:
+        if mapper.class_.__name__ == nom:
+            return mapper.class_
+    raise LookupError(f"Aucun modèle {nom} trouvé dans l'application")
+
+
+def trouver_modele_user(db):
+    """Classe User du projet"""
+    return trouver_modele(db, 'User')
+
+
+def colonnes_importables(table, entetes: List[str]) -> List[str]:
+    """Valide l'en-tête du CSV ; `password` est haché vers `password_hash`"""
+    colonnes = set(table.columns.keys())
+    inconnues = [e for e in entetes if e not in colonnes and e != 'password']
+    if inconnues:
+        raise ErreurImport(f"Colonnes inconnues: {', '.join(inconnues)}")
+    if 'password' in entetes and 'password_hash' in entetes:
+        raise ErreurImport("Le CSV doit contenir 'password' ou 'password_hash', pas les deux")
+    # `password` fournit password_hash, haché à l'import
+    fournies = set(entetes) | ({'password_hash'} if 'password' in entetes else set())
+    manquantes = [c.name for c in table.columns
+                  if not c.nullable and not c.primary_key and c.default is None
+                  and c.server_default is None and c.name not in fournies]
+    if manquantes:
+        raise ErreurImport(f"Colonnes obligatoires absentes: {', '.join(manquantes)}")
+    return entetes
+
+
+def _defauts(table) -> Dict[str, Any]:
+    """Valeurs par défaut scalaires des colonnes (cellules vides du CSV)"""
+    return {c.name: c.default.arg for c in table.columns
+            if c.default is not None and c.default.is_scalar}
+
+
+def _convertisseurs(table, entetes: List[str]) -> Dict[str, Any]:
+    """Conversion des chaînes du CSV selon le type des colonnes"""
+    from sqlalchemy import Boolean, Integer
+
+    def booleen(valeur):
+        return valeur.strip().lower() in VRAI
+
+    convertisseurs = {}
+    for entete in entetes:
+        if entete not in table.columns:
+            continue
+        type_colonne = table.columns[entete].type
+        if isinstance(type_colonne, Boolean):
+            convertisseurs[entete] = booleen
+        elif isinstance(type_colonne, Integer):
+            convertisseurs[entete] = int
+    return convertisseurs
+
+
+def importer(app, fichier, taille_lot: int = TAILLE_LOT, workers: int = None) -> int:
+    """
+    Importe les utilisateurs d'un CSV (en-tête = noms de colonnes)
+
+    Returns:
+        Nombre de lignes insérées
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+    from sqlalchemy.exc import IntegrityError
+
+    db = extension_db(app)
+    with app.app_context():
+        table = trouver_modele_user(db).__table__
+        lecteur = csv.DictReader(fichier)
+        entetes = colonnes_importables(table, lecteur.fieldnames or [])
+        convertisseurs = _convertisseurs(table, entetes)
+        defauts = _defauts(table)
+        workers = workers or os.cpu_count() or 1
+        insertion = table.insert()
+        hachage = partial(hacher, methode=methode_hachage(app))
+
+        def convertir(cle, valeur):
+            if valeur in ('', None):
+                # Une insertion multi-lignes n'applique pas les défauts des colonnes fournies
+                return defauts.get(cle)
+            return convertisseurs[cle](valeur) if cle in convertisseurs else valeur
+
+        def lire():
+            """(valeurs converties, mot de passe) de chaque ligne, vérifiée à la lecture"""
+            for ligne in lecteur:
+                # DictReader range les cellules en trop sous la clé None
+                if None in ligne:
+                    raise ErreurImport(f"Ligne {lecteur.line_num}: plus de valeurs que de colonnes")
+                valeurs = {}
+                for cle, valeur in ligne.items():
+                    if cle == 'password':
+                        continue
+                    try:
+                        valeurs[cle] = convertir(cle, valeur)
+                    except ValueError:
+                        raise ErreurImport(f"Ligne {lecteur.line_num}: {cle} invalide ({valeur!r})") from None
+                yield valeurs, ligne.get('password')
+
+        def inserer(lot, hashes):
+            lignes = []
+            for (valeurs, _), empreinte in zip(lot, hashes):
+                if empreinte is not None:
+                    valeurs['password_hash'] = empreinte
+                lignes.append(valeurs)
+            try:
+                db.session.execute(insertion, lignes)
+                db.session.commit()
+            except IntegrityError as e:
+                db.session.rollback()
+                raise ErreurImport(f"Lot rejeté après {total} lignes importées: {e.orig}") from None
+            return len(lignes)
+
+        total, debut = 0, time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            precedent = None
+            for lot in par_lots(lire(), taille_lot):
+                # Le hachage du lot courant démarre avant l'insertion du précédent
+                if 'password' in entetes:
+                    hashes = pool.map(hachage, [mot_de_passe for _, mot_de_passe in lot],
+                                      chunksize=max(1, len(lot) // (workers * 4)))
+                else:
+                    hashes = [None] * len(lot)
+                if precedent is not None:
+                    total += inserer(*precedent)
+                    print(f"   {total} utilisateurs importés ({total / (time.perf_counter() - debut):.0f}/s)",
+                          flush=True)
+                precedent = (lot, hashes)
+            if precedent is not None:
+                total += inserer(*precedent)
+    return total
+
+
+def lire_par_pages(app, colonnes: List[str] = None, taille: int = TAILLE_LOT) -> Iterator[List[Any]]:
+    """Parcourt la table des utilisateurs par pages, avec un curseur côté serveur"""
+    from sqlalchemy import select
+
+    db = extension_db(app)
+    with app.app_context():
+        table = trouver_modele_user(db).__table__
+        selection = [table.c[nom] for nom in colonnes] if colonnes else [table]
+        requete = select(*selection).order_by(*table.primary_key.columns)
+        resultat = db.session.execute(
+            requete.execution_options(stream_results=True, max_row_buffer=taille))
+        try:
+            for page in resultat.partitions(taille):
+                yield page
+        finally:
+            resultat.close()
+
+
+def colonnes_exportees(app) -> List[str]:
+    """Colonnes de l'export : toutes sauf la clé primaire (le CSV se réimporte tel quel)"""
+    db = extension_db(app)
+    with app.app_context():
+        table = trouver_modele_user(db).__table__
+        return [c.name for c in table.columns if not c.primary_key]
+
+
+def exporter(app, fichier, taille_lot: int = TAILLE_LOT) -> int:
+    """Écrit les utilisateurs en CSV ; retourne le nombre de lignes"""
+    colonnes = colonnes_exportees(app)
+    ecrivain = csv.writer(fichier)
+    ecrivain.writerow(colonnes)
+    total = 0
+    for page in lire_par_pages(app, colonnes, taille_lot):
+        ecrivain.writerows(page)
+        total += len(page)
+    return total
+
+
+def lister(app, taille_page: int = 50):
+    """Affiche les utilisateurs page par page"""
+    interactif = sys.stdin.isatty() and sys.stdout.isatty()
+    print("\n Utilisateurs:\n")
+    total = 0
+    for page in lire_par_pages(app, ['id', 'username', 'email'], taille_page):
+        for id_, username, email in page:
+            print(f"   {id_:>6}  {username:<24} {email}")
+        total += len(page)
+        if interactif and len(page) == taille_page:
+            if input(f"\n   -- {total} affichés, Entrée pour la suite, q pour quitter -- ").strip().lower() == 'q':
+                return
+            print()
+    print(f"\n   {total} utilisateurs\n")
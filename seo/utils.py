@@ -1,5 +1,11 @@
+import hashlib
 import os
+import sys
 from pathlib import Path
+from .materialisation import materialiser
+
+# Dossier d'état de SEO Dev Env dans les projets générés
+DOSSIER_SEO = '.seo'
 
 def creer_fichier(chemin, contenu):
     """Crée un fichier avec le contenu spécifié"""
@@ -8,17 +14,22 @@ def creer_fichier(chemin, contenu):
     with open(chemin, 'w', encoding='utf-8') as f:
         f.write(contenu)
 
+def empreinte(contenu: bytes) -> str:
+    """SHA-256 d'un contenu"""
+    return hashlib.sha256(contenu).hexdigest()
+
 def copier_dossier(source, destination):
-    """Copie récursivement un dossier"""
-    source = Path(source)
-    destination = Path(destination)
-    
-    destination.mkdir(parents=True, exist_ok=True)
-    
-    for item in source.iterdir():
-        dest_item = destination / item.name
-        if item.is_dir():
-            copier_dossier(item, dest_item)
-        else:
-            with open(item, 'r', encoding='utf-8') as src_file:
-                creer_fichier(dest_item, src_file.read())
\ No newline at end of file
+    """Copie récursivement un dossier (octet pour octet, fichiers binaires compris)"""
+    return materialiser(source, destination)
+
+
+def repertoire_cache() -> Path:
+    """Dossier de cache utilisateur de SEO Dev Env (surchargeable par SEO_CACHE_DIR)"""
+    if os.environ.get('SEO_CACHE_DIR'):
+        return Path(os.environ['SEO_CACHE_DIR'])
+    if sys.platform == 'win32':
+        base = Path(os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local')
+        return base / 'seo-dev-env' / 'Cache'
+    if sys.platform == 'darwin':
+        return Path.home() / 'Library' / 'Caches' / 'seo-dev-env'
+    return Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'seo-dev-env'
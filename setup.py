@@ -22,14 +22,18 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires='>=3.6',
+    python_requires='>=3.7',
     install_requires=[
         'flask>=2.0.0',
         'python-dotenv>=0.19.0',
     ],
+    extras_require={
+        # seo assets build : variantes .br et minification JS
+        'assets': ['brotli', 'rjsmin'],
+    },
     entry_points={
         'console_scripts': [
-            'seo=seo.generators:main',
+            'seo=seo.lanceur:main',
             'seo-create=seo.generators:creer_projet_interactif',
         ],
     },
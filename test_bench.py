@@ -0,0 +1,98 @@
+"""
+Tests du banc de charge (parties indépendantes de Flask)
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from seo.bench import dernier_resultat, enregistrer, executer_bench, percentile, scenarios_url
+
+
+def test_percentile():
+    valeurs = [float(i) for i in range(1, 101)]
+    assert percentile(valeurs, 50) == 50
+    assert percentile(valeurs, 95) == 95
+    assert percentile(valeurs, 99) == 99
+    assert percentile([7.0], 99) == 7.0
+    assert percentile([], 50) == 0.0
+
+
+def test_resultats_enregistres_pour_comparaison(tmp_path):
+    premier = enregistrer({'routes': {}}, tmp_path, tmp_path / '.seo' / 'bench' / 'bench-1.json')
+    second = enregistrer({'routes': {}}, tmp_path, tmp_path / '.seo' / 'bench' / 'bench-2.json')
+    assert dernier_resultat(tmp_path) == second
+    assert dernier_resultat(tmp_path, exclure=second) == premier
+
+
+def test_serveur_deja_lance(tmp_path):
+    """--url : mesure d'un serveur lancé à part (ASGI, comparaison de variantes)"""
+    class Sante(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            corps = b'{"statut": "ok"}'
+            self.send_response(200 if self.path == '/api/v1/sante' else 404)
+            self.send_header('Content-Length', str(len(corps)))
+            self.end_headers()
+            self.wfile.write(corps)
+
+        def log_message(self, *args):
+            pass
+
+    serveur = ThreadingHTTPServer(('127.0.0.1', 0), Sante)
+    threading.Thread(target=serveur.serve_forever, daemon=True).start()
+    try:
+        resultats = executer_bench(tmp_path, duree=0.3, concurrence=2,
+                                   urls=[f'http://127.0.0.1:{serveur.server_port}/api/v1/sante'])
+    finally:
+        serveur.shutdown()
+    route = resultats['routes']['/api/v1/sante']
+    assert route['requetes'] > 0 and route['erreurs'] == 0 and set(route['codes']) == {'200'}
+    assert resultats['parametres']['url'] == f'127.0.0.1:{serveur.server_port}'
+
+    with pytest.raises(LookupError):
+        scenarios_url(['http://127.0.0.1:5000/a', 'http://127.0.0.1:5001/a'])
+
+
+def test_connexion_impossible_sans_blocage(tmp_path):
+    """Un client qui ne peut pas se connecter fait échouer le banc au lieu de bloquer les autres"""
+    from seo.bench import Cible, Scenario, charger
+    from seo.lanceur import main
+
+    class PremiereCoupee(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        connexions = []
+
+        def do_POST(self):
+            self.connexions.append(self.path)
+            if len(self.connexions) == 1:
+                # Première connexion coupée sans réponse, les suivantes réussissent
+                self.close_connection = True
+                return
+            self.send_response(200)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    serveur = ThreadingHTTPServer(('127.0.0.1', 0), PremiereCoupee)
+    threading.Thread(target=serveur.serve_forever, daemon=True).start()
+    resultat = {}
+
+    def lancer():
+        try:
+            charger(Cible(port=serveur.server_port), [Scenario('sante', 'GET', '/')], ['bench0'], 0.2, 3)
+        except Exception as e:
+            resultat['erreur'] = e
+
+    fil = threading.Thread(target=lancer, daemon=True)
+    fil.start()
+    fil.join(timeout=10)
+    serveur.shutdown()
+    assert not fil.is_alive()
+    assert isinstance(resultat.get('erreur'), ConnectionError)
+
+    with pytest.raises(SystemExit):
+        main(['bench', str(tmp_path), '-c', '0'])
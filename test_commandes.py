@@ -0,0 +1,121 @@
+"""
+Tests des commandes de gestion des projets générés
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+from seo.commandes import charger_app, commande_db
+
+
+@pytest.fixture
+def projet(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, 'path', list(sys.path))
+    for module in ('app', 'run'):
+        monkeypatch.delitem(sys.modules, module, raising=False)
+    yield tmp_path
+    for module in ('app', 'run'):
+        sys.modules.pop(module, None)
+
+
+def test_charger_app_create_app(projet):
+    (projet / 'app').mkdir()
+    (projet / 'app' / '__init__.py').write_text("def create_app():\n    return 'usine'\n")
+    assert charger_app() == 'usine'
+
+
+def test_charger_app_module_simple(projet):
+    (projet / 'app.py').write_text("app = 'debutant'\n")
+    assert charger_app() == 'debutant'
+
+
+def test_commande_db_action_inconnue(capsys):
+    assert not commande_db(['upgrade', 'stamp'])
+    assert "stamp" in capsys.readouterr().out
+
+
+def test_commande_db_migrations(projet, capsys):
+    """init, migrate et upgrade dans le même processus, puis le SQL hors ligne"""
+    pytest.importorskip('flask_migrate', reason='Flask-Migrate non installé')
+    import sqlite3
+    (projet / 'app.py').write_text(
+        "from flask import Flask\n"
+        "from flask_migrate import Migrate\n"
+        "from flask_sqlalchemy import SQLAlchemy\n"
+        "app = Flask(__name__)\n"
+        f"app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///{projet / 'app.db'}'\n"
+        "db = SQLAlchemy(app)\n"
+        "Migrate(app, db)\n"
+        "class Tache(db.Model):\n"
+        "    id = db.Column(db.Integer, primary_key=True)\n"
+        "    titre = db.Column(db.String(100))\n")
+
+    assert commande_db(['init', 'migrate', 'upgrade'], message='initiale')
+    assert len(list((projet / 'migrations' / 'versions').glob('*initiale*.py'))) == 1
+    with sqlite3.connect(projet / 'app.db') as connexion:
+        tables = {nom for nom, in connexion.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    assert {'tache', 'alembic_version'} <= tables
+    assert 'Migrations appliquées' in capsys.readouterr().out
+
+    assert commande_db('upgrade', sql=True)
+    assert 'CREATE TABLE tache' in capsys.readouterr().out
+
+
+def test_par_lots():
+    from seo.utilisateurs import par_lots
+    assert [len(lot) for lot in par_lots(range(2500), 1000)] == [1000, 1000, 500]
+    assert list(par_lots([], 10)) == []
+
+
+def config_gunicorn(monkeypatch, **environnement):
+    import runpy
+    from seo.commandes import CONFIG_GUNICORN
+    for cle in ('GUNICORN_WORKER_CLASS', 'GUNICORN_THREADS', 'WEB_CONCURRENCY'):
+        monkeypatch.delenv(cle, raising=False)
+    for cle, valeur in environnement.items():
+        monkeypatch.setenv(cle, valeur)
+    return runpy.run_path(str(Path(__file__).parent / 'seo' / 'templates' / 'pro' / CONFIG_GUNICORN))
+
+
+def test_gunicorn_dimensionne_selon_les_cpu(monkeypatch):
+    config = config_gunicorn(monkeypatch)
+    cpus = config['CPUS']
+    assert (config['worker_class'], config['workers'], config['threads']) == ('gthread', cpus + 1, 4)
+    assert config['preload_app'] and config['max_requests'] > 0
+
+    config = config_gunicorn(monkeypatch, GUNICORN_WORKER_CLASS='sync', WEB_CONCURRENCY='3')
+    assert (config['workers'], config['threads']) == (3, 1)
+
+
+def test_cible_wsgi(tmp_path):
+    from seo.commandes import arguments_gunicorn, cible_wsgi
+    assert cible_wsgi(str(tmp_path)) == 'app:app'
+    (tmp_path / 'app').mkdir()
+    assert cible_wsgi(str(tmp_path)) == 'app:create_app()'
+    (tmp_path / 'run.py').touch()
+    arguments = arguments_gunicorn(workers=2, chemin=str(tmp_path))
+    assert arguments[-3:] == ['--workers', '2', 'run:app']
+
+
+def test_commandes_projet_dans_le_venv(projet, monkeypatch):
+    """seo run/db/user... se relancent avec le Python du venv, où seo reste importable"""
+    import subprocess
+    from seo import lanceur
+
+    lancements = []
+    monkeypatch.setattr(lanceur.os, 'execv', lambda python, argv: lancements.append((python, argv)))
+    with pytest.raises(SystemExit):
+        lanceur.main(['db', 'upgrade'])
+    assert not lancements  # pas de venv : exécutée sur place
+
+    subprocess.run([sys.executable, '-m', 'venv', '--without-pip', str(projet / 'venv')], check=True)
+    with pytest.raises(SystemExit):
+        lanceur.main(['db', 'upgrade'])
+    python, argv = lancements[0]
+    assert Path(python).parent.parent == projet / 'venv'
+    assert argv[0] == python and argv[-2:] == ['db', 'upgrade']
+    sortie = subprocess.run([python, *argv[1:-2], '--version'], stdout=subprocess.PIPE,
+                            universal_newlines=True, check=True).stdout
+    assert sortie.startswith('seo-dev-env')
@@ -0,0 +1,89 @@
+"""
+Budget de démarrage de la commande `seo` (python -X importtime)
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+RACINE = Path(__file__).parent
+
+# Modules qu'aucun chemin rapide ne doit charger
+LOURDS = {'seo.generators', 'seo.archives', 'seo.materialisation', 'seo.installation',
+          'seo.cli', 'subprocess', 'shutil', 'pathlib', 'concurrent.futures'}
+
+# Temps cumulé maximal des imports du package, en millisecondes
+BUDGET_MS = float(os.environ.get('SEO_BUDGET_DEMARRAGE_MS', 25))
+
+
+def importtime(*arguments):
+    """
+    Imports d'une commande : {module: cumul en µs}
+
+    Les modules déjà chargés au démarrage de Python (site, fichiers .pth
+    d'une installation `pip install -e .`) sont retirés : seuls comptent
+    ceux que la commande importe elle-même.
+    """
+    modules = _importtime(*arguments)
+    for nom in _importtime('-c', 'pass'):
+        modules.pop(nom, None)
+    return modules
+
+
+def _importtime(*arguments):
+    resultat = subprocess.run([sys.executable, '-X', 'importtime', *arguments],
+                              cwd=RACINE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                              universal_newlines=True)
+    modules = {}
+    # Chaque module suit ceux qu'il importe, indentés de deux espaces par niveau :
+    # lu à l'envers, un module précède ses imports et la pile donne ses parents
+    parents = []
+    for ligne in reversed(resultat.stderr.splitlines()):
+        if not ligne.startswith('import time:') or 'cumulative' in ligne:
+            continue
+        _, cumul, nom = ligne[len('import time:'):].split('|')
+        niveau = len(nom) - len(nom.lstrip())
+        while parents and parents[-1][0] >= niveau:
+            parents.pop()
+        nom = nom.strip()
+        # Cumul d'un module seo importé par un autre : déjà compté dans celui du parent
+        imbrique = any(_du_package(parent) for _, parent in parents)
+        modules[nom] = 0 if imbrique and _du_package(nom) else int(cumul)
+        parents.append((niveau, nom))
+    return modules
+
+
+def _du_package(nom):
+    return nom == 'seo' or nom.startswith('seo.')
+
+
+def cumul_seo_ms(modules):
+    """Temps d'import du package, imports qu'il déclenche compris, sans double compte"""
+    return sum(cumul for nom, cumul in modules.items() if _du_package(nom)) / 1000
+
+
+def test_import_seo_est_paresseux():
+    modules = importtime('-c', 'import seo; seo.__version__')
+    assert not LOURDS & modules.keys()
+
+
+def test_seo_help_dans_le_budget():
+    modules = importtime('-m', 'seo', 'help')
+    assert 'seo.commandes' in modules
+    assert not (LOURDS | {'argparse'}) & modules.keys()
+    assert cumul_seo_ms(modules) < BUDGET_MS
+
+
+def test_sous_commande_ne_charge_pas_les_generateurs():
+    modules = importtime('-m', 'seo', 'run', '--help')
+    assert 'argparse' in modules
+    # argparse charge shutil pour la largeur du terminal
+    assert not (LOURDS - {'shutil'}) & modules.keys()
+    assert cumul_seo_ms(modules) < BUDGET_MS
+
+
+def test_exports_charges_a_la_demande():
+    import seo
+    from seo.generators import creer_projet
+    assert seo.creer_projet is creer_projet
+    assert 'main' in dir(seo)
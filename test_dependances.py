@@ -0,0 +1,65 @@
+"""
+Tests de la résolution des dépendances (lock et cache par pile)
+"""
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from seo import installation
+
+
+def test_resolution_unique_par_pile(tmp_path, monkeypatch):
+    """Une pile n'est résolue qu'une fois ; l'ordre des packages est indifférent"""
+    monkeypatch.setenv('SEO_CACHE_DIR', str(tmp_path))
+    appels = []
+
+    def faux_pip(*arguments, python=None):
+        appels.append(arguments)
+        rapport = Path(arguments[arguments.index('--report') + 1])
+        rapport.write_text(json.dumps({'install': [
+            {'metadata': {'name': 'Werkzeug', 'version': '3.0.1'}},
+            {'metadata': {'name': 'Flask', 'version': '3.0.0'}},
+        ]}), encoding='utf-8')
+
+    monkeypatch.setattr(installation, '_pip', faux_pip)
+
+    lock = installation.resoudre(['flask', 'python-dotenv'])
+    assert lock.splitlines()[-2:] == ['Flask==3.0.0', 'Werkzeug==3.0.1']
+    assert installation.resoudre(['python-dotenv', 'Flask']) == lock
+    assert len(appels) == 1
+    assert installation.cle_pile(['flask']) != installation.cle_pile(['flask', 'gunicorn'])
+
+
+def test_statut_arriere_plan(tmp_path):
+    """Une installation dont le processus a disparu est signalée comme interrompue"""
+    import subprocess
+    import sys
+    from seo import arriere_plan
+
+    assert arriere_plan.lire_statut(tmp_path) is None
+    termine = subprocess.Popen([sys.executable, '-c', 'pass'])
+    termine.wait()
+    arriere_plan.ecrire_statut(tmp_path, etat=arriere_plan.EN_COURS, pid=termine.pid)
+    assert arriere_plan.lire_statut(tmp_path)['etat'] == arriere_plan.INTERROMPU
+
+    arriere_plan.ecrire_statut(tmp_path, etat=arriere_plan.EN_ATTENTE, pid=None)
+    assert arriere_plan.lire_statut(tmp_path)['etat'] == arriere_plan.INTERROMPU
+
+    arriere_plan.ecrire_statut(tmp_path, etat=arriere_plan.PRET)
+    assert arriere_plan.afficher_statut(tmp_path)
+
+
+@pytest.mark.skipif(not shutil.which('false'), reason='commande false absente')
+def test_arriere_plan_mort_au_demarrage(tmp_path, monkeypatch):
+    """Un processus mort avant d'écrire son statut ne bloque pas `seo status --wait`"""
+    from seo import arriere_plan
+
+    # Interpréteur qui échoue aussitôt, sans rien écrire
+    monkeypatch.setattr(arriere_plan.sys, 'executable', shutil.which('false'))
+    pid = arriere_plan.lancer_installation(tmp_path, ['flask'])
+    os.waitpid(pid, 0)
+    assert arriere_plan.lire_statut(tmp_path)['pid'] == pid
+    assert not arriere_plan.afficher_statut(tmp_path, attendre=True)
@@ -0,0 +1,39 @@
+"""
+Tests de la génération par lot (seo create --from)
+"""
+import json
+
+import pytest
+
+from seo import lot
+
+
+def test_validation_globale(tmp_path):
+    """Toutes les erreurs sont remontées avant toute génération"""
+    entrees = [
+        {'nom_projet': str(tmp_path / 'a'), 'type_projet': 'api'},
+        {'nom_projet': str(tmp_path / 'a'), 'type_projet': 'api'},
+        {'nom_projet': str(tmp_path / 'b'), 'type_projet': 'mobile', 'docker': 'oui'},
+        'pas un objet',
+    ]
+    with pytest.raises(lot.ManifesteInvalide) as erreur:
+        lot.valider_manifeste(entrees)
+    assert len(erreur.value.erreurs) == 4
+    assert not (tmp_path / 'a').exists()
+
+
+def test_generation_parallele(tmp_path, monkeypatch):
+    """Les projets du manifeste sont générés avec les valeurs par défaut du mode interactif"""
+    monkeypatch.setenv('SEO_CACHE_DIR', str(tmp_path / 'cache'))
+    manifeste = tmp_path / 'manifeste.json'
+    manifeste.write_text(json.dumps({'projets': [
+        {'nom_projet': str(tmp_path / 'site'), 'type_projet': 'apprentissage'},
+        {'nom_projet': str(tmp_path / 'app'), 'type_projet': 'application', 'base_donnees': 'mysql'},
+        {'nom_projet': str(tmp_path / 'api'), 'type_projet': 'api'},
+    ]}), encoding='utf-8')
+
+    assert lot.creer_depuis_manifeste(manifeste, jobs=2, installer=False)
+
+    assert (tmp_path / 'site' / 'app.py').exists()
+    assert 'pymysql' in (tmp_path / 'app' / 'requirements.txt').read_text(encoding='utf-8')
+    assert 'psycopg2-binary' in (tmp_path / 'api' / 'requirements.txt').read_text(encoding='utf-8')
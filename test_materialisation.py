@@ -0,0 +1,82 @@
+"""
+Tests du moteur de matérialisation des templates
+"""
+from pathlib import Path
+
+import pytest
+
+from seo.materialisation import construire_manifeste, materialiser
+
+TEMPLATES = Path(__file__).parent / 'seo' / 'templates'
+
+
+def test_copie_octet_pour_octet(tmp_path):
+    """Les fichiers binaires et UTF-16 sont copiés sans être décodés"""
+    source = tmp_path / 'source'
+    (source / 'static' / 'img').mkdir(parents=True)
+    (source / 'static' / 'img' / 'logo.png').write_bytes(bytes(range(256)) * 64)
+    (source / 'vide.txt').write_bytes(b'')
+    (source / '__pycache__').mkdir()
+    (source / '__pycache__' / 'module.cpython-311.pyc').write_bytes(b'\x00')
+
+    rapport = materialiser(source, tmp_path / 'projet', workers=4)
+
+    assert (tmp_path / 'projet' / 'static' / 'img' / 'logo.png').read_bytes() == bytes(range(256)) * 64
+    assert (tmp_path / 'projet' / 'vide.txt').read_bytes() == b''
+    assert not (tmp_path / 'projet' / '__pycache__').exists()
+    assert rapport.fichiers == 2
+    assert rapport.octets == 256 * 64
+
+
+def test_template_intermediaire(tmp_path):
+    """Le template intermédiaire est reproduit à l'identique"""
+    source = TEMPLATES / 'intermediaire'
+    manifeste = construire_manifeste(source)
+    materialiser(source, tmp_path, manifeste=manifeste)
+
+    for entree in manifeste.fichiers:
+        assert (tmp_path / entree.chemin).read_bytes() == (source / entree.chemin).read_bytes()
+
+
+def test_strategie_inconnue(tmp_path):
+    """Pas de hardlinks vers le template installé : 'lien' est refusé"""
+    with pytest.raises(ValueError):
+        materialiser(tmp_path, tmp_path / 'projet', strategie='lien')
+
+
+def test_archive_template(tmp_path, monkeypatch):
+    """L'archive d'un niveau reproduit le template et n'est construite qu'une fois"""
+    from seo import archives
+
+    monkeypatch.setenv('SEO_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(archives, '_archives', {})
+
+    archive = archives.charger_archive('intermediaire', verifier=True)
+    assert archive.hash == archives.hash_template(TEMPLATES / 'intermediaire')
+    assert archives.charger_archive('intermediaire', verifier=False) is archive
+
+    rapport = archive.materialiser(tmp_path / 'projet')
+    source = TEMPLATES / 'intermediaire'
+    for entree in construire_manifeste(source).fichiers:
+        assert (tmp_path / 'projet' / entree.chemin).read_bytes() == (source / entree.chemin).read_bytes()
+    assert rapport.fichiers == len(construire_manifeste(source).fichiers)
+    assert archives.charger_archive('inexistant') is None
+
+
+def test_archives_precompilees(tmp_path, monkeypatch):
+    """`seo templates archive` : une archive par niveau et par module, reprise telle quelle ensuite"""
+    from seo import archives
+
+    monkeypatch.setenv('SEO_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(archives, '_archives', {})
+
+    construites = archives.construire_archives()
+    niveaux = {source.name for source in TEMPLATES.iterdir() if source.is_dir() and source.name != 'modules'}
+    modules = {f'modules/{module.name}' for module in (TEMPLATES / 'modules').iterdir() if module.is_dir()}
+    assert set(construites) == niveaux | modules
+    assert all(chemin.exists() for chemin in construites.values())
+
+    date = construites['pro'].stat().st_mtime_ns
+    assert archives.charger_archive('pro', verifier=True).hash == archives.hash_template(TEMPLATES / 'pro')
+    # Archive à jour : pas de reconstruction au premier usage
+    assert construites['pro'].stat().st_mtime_ns == date
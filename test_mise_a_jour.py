@@ -0,0 +1,37 @@
+"""
+Tests de la mise à jour incrémentale (seo upgrade)
+"""
+import json
+
+from seo.generators import ApplicationGenerator
+from seo.mise_a_jour import SUFFIXE_PROPOSITION, lire_manifeste, mettre_a_jour
+
+
+def test_mise_a_jour_incrementale(tmp_path, monkeypatch):
+    """Seuls les fichiers changés et non modifiés localement sont réécrits"""
+    monkeypatch.setenv('SEO_CACHE_DIR', str(tmp_path / 'cache'))
+    projet = tmp_path / 'boutique'
+    generator = ApplicationGenerator(str(projet), {'nom_projet': 'boutique', 'type_projet': 'application',
+                                                   'base_donnees': 'sqlite', 'auth': 'session'})
+    generator.installer = False
+    generator.generer()
+
+    manifeste = lire_manifeste(projet)
+    assert 'run.py' in manifeste['fichiers'] and 'requirements.txt' in manifeste['fichiers']
+    assert mettre_a_jour(projet).inchanges == sorted(manifeste['fichiers'])
+
+    # Modification locale, puis changement de préférences qui modifie les fichiers rendus
+    (projet / '.env.example').write_text("SECRET_KEY=perso\n", encoding='utf-8')
+    manifeste['preferences']['base_donnees'] = 'postgresql'
+    (projet / '.seo' / 'manifeste.json').write_text(json.dumps(manifeste), encoding='utf-8')
+    avant = (projet / 'run.py').stat().st_mtime_ns
+
+    rapport = mettre_a_jour(projet)
+
+    assert rapport.mis_a_jour == ['app/core/config.py', 'config.py', 'requirements.txt']
+    assert rapport.conflits == ['.env.example']
+    assert (projet / 'run.py').stat().st_mtime_ns == avant
+    assert 'psycopg2-binary' in (projet / 'requirements.txt').read_text(encoding='utf-8')
+    assert (projet / '.env.example').read_text(encoding='utf-8') == "SECRET_KEY=perso\n"
+    assert 'postgresql://' in (projet / ('.env.example' + SUFFIXE_PROPOSITION)).read_text(encoding='utf-8-sig')
+    assert mettre_a_jour(projet, forcer=True).mis_a_jour == ['.env.example']
@@ -0,0 +1,66 @@
+"""
+Modules communs aux templates intermédiaire et pro (app/core/)
+
+Chaque template embarque sa copie : ces tests vérifient qu'elles restent
+identiques, hors des points propres à chaque template (identité de
+l'utilisateur, docstrings qui décrivent le lancement de gunicorn).
+"""
+import ast
+import runpy
+from pathlib import Path
+
+import pytest
+
+TEMPLATES = Path(__file__).parent / 'seo' / 'templates'
+CORE = [TEMPLATES / niveau / 'app' / 'core' for niveau in ('intermediaire', 'pro')]
+
+# module -> définitions propres à chaque template
+PROPRES = {
+    'cache.py': {'utilisateur_courant'},
+    'sqlite.py': set(),
+    'config.py': None,
+}
+# config.py : seules ces fonctions sont partagées (les classes de configuration diffèrent)
+PARTAGEES_CONFIG = {'url_base_donnees', 'options_moteur'}
+
+
+def definitions(chemin: Path):
+    """{nom: AST sans docstring} des fonctions et classes de premier niveau, et le reste du module"""
+    arbre = ast.parse(chemin.read_text(encoding='utf-8-sig'))
+    noms, reste = {}, []
+    for noeud in arbre.body:
+        if isinstance(noeud, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            if ast.get_docstring(noeud) is not None:
+                noeud.body = noeud.body[1:]
+            noms[noeud.name] = ast.dump(noeud)
+        elif not (isinstance(noeud, ast.Expr) and isinstance(noeud.value, ast.Constant)):
+            reste.append(ast.dump(noeud))
+    return noms, reste
+
+
+@pytest.mark.parametrize('module', sorted(PROPRES))
+def test_copies_identiques(module):
+    (noms_a, reste_a), (noms_b, reste_b) = (definitions(core / module) for core in CORE)
+    if PROPRES[module] is None:
+        assert {nom: noms_a[nom] for nom in PARTAGEES_CONFIG} == {nom: noms_b[nom] for nom in PARTAGEES_CONFIG}
+        return
+    assert noms_a.keys() == noms_b.keys()
+    for nom in noms_a.keys() - PROPRES[module]:
+        assert noms_a[nom] == noms_b[nom], f"{module}: {nom} diffère entre les templates"
+    assert reste_a == reste_b
+
+
+@pytest.mark.parametrize('core', CORE, ids=lambda core: core.parent.parent.name)
+def test_pool_sql_dans_le_budget_de_connexions(core, monkeypatch):
+    config = runpy.run_path(str(core / 'config.py'))
+    assert config['options_moteur']('sqlite:///app.db') == {}
+    for workers in (1, 5, 17, 40, 80):
+        monkeypatch.setenv('WEB_CONCURRENCY', str(workers))
+        options = config['options_moteur']('postgresql://localhost/app')
+        assert options['pool_size'] >= 1 and options['pool_pre_ping']
+        assert workers * (options['pool_size'] + options['max_overflow']) <= 80
+    # Plus de workers que de connexions : budget intenable, signalé
+    monkeypatch.setenv('WEB_CONCURRENCY', '120')
+    with pytest.warns(RuntimeWarning, match='DB_MAX_CONNEXIONS=80'):
+        options = config['options_moteur']('postgresql://localhost/app')
+    assert (options['pool_size'], options['max_overflow']) == (1, 0)
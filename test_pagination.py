@@ -0,0 +1,62 @@
+"""
+Tests de la pagination par curseur du template intermédiaire (app/core/pagination.py)
+"""
+import runpy
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sqlalchemy = pytest.importorskip('sqlalchemy', reason='SQLAlchemy non installé')
+
+PAGINATION = runpy.run_path(str(Path(__file__).parent / 'seo' / 'templates' / 'intermediaire'
+                                / 'app' / 'core' / 'pagination.py'))
+
+
+@pytest.fixture
+def session():
+    from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+    class Base(DeclarativeBase):
+        pass
+
+    class Tache(Base):
+        __tablename__ = 'tache'
+        id: Mapped[int] = mapped_column(primary_key=True)
+        date_creation: Mapped[datetime]
+
+    moteur = sqlalchemy.create_engine('sqlite://')
+    Base.metadata.create_all(moteur)
+    debut = datetime(2026, 1, 1, 12, 0)
+    with Session(moteur) as session:
+        # Dates en double : l'identifiant départage, aucune ligne ne doit être perdue ni répétée
+        session.add_all(Tache(id=i, date_creation=debut + timedelta(minutes=i // 3)) for i in range(1, 11))
+        session.commit()
+        yield session, Tache
+
+
+def test_curseur_parcourt_toutes_les_lignes(session):
+    session, Tache = session
+    vus, curseur, pages = [], None, 0
+    while True:
+        page = PAGINATION['page_keyset'](session.query(Tache), Tache.date_creation, Tache.id, curseur, 3)
+        vus += [tache.id for tache in page.elements]
+        pages += 1
+        if page.suivant is None:
+            break
+        curseur = page.suivant
+    assert pages == 4
+    attendu = sorted(range(1, 11), key=lambda i: (i // 3, i), reverse=True)
+    assert vus == attendu
+
+
+def test_curseur_aller_retour_et_invalide():
+    date = datetime(2026, 3, 4, 5, 6, 7, 123456)
+    curseur = PAGINATION['encoder_curseur'](date, 42)
+    assert PAGINATION['decoder_curseur'](curseur) == (date, 42)
+    # Les routes répondent 400 à un curseur invalide
+    for invalide in ('pas-un-curseur', 'x' * 7, PAGINATION['encoder_curseur'](date, 1)[:-3] + '!!!'):
+        with pytest.raises(PAGINATION['CurseurInvalide']):
+            PAGINATION['decoder_curseur'](invalide)
+    assert PAGINATION['limite_demandee']('500') == PAGINATION['PAR_PAGE_MAX']
+    assert PAGINATION['limite_demandee']('abc') == PAGINATION['PAR_PAGE']
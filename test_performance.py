@@ -0,0 +1,206 @@
+"""
+Régressions de performance du générateur
+
+Mesure la génération complète de chaque niveau et de chaque type de
+projet (dans un tmpfs si disponible, sans installation des dépendances),
+le débit en fichiers/s, le pic de mémoire et le temps d'import, puis
+compare à performance_reference.json. Un test échoue si une mesure se
+dégrade de plus de SEO_SEUIL_REGRESSION (50 % par défaut).
+
+Les durées (et débits) sont exprimés en multiples d'une boucle de
+calibration en pur Python, pour que la référence reste comparable d'une
+machine à l'autre. Le pic de mémoire est en Mo.
+
+Mesures de temps réel : elles dépendent de la charge de la machine et ne
+sont lancées qu'à la demande, hors de la suite par défaut.
+
+    SEO_PERF=1 python -m pytest test_performance.py               # compare à la référence
+    SEO_PERF_ENREGISTRER=1 python -m pytest test_performance.py   # met à jour la référence
+"""
+import io
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import pytest
+
+RACINE = Path(__file__).parent
+REFERENCE = RACINE / 'performance_reference.json'
+SEUIL = float(os.environ.get('SEO_SEUIL_REGRESSION', 0.5))
+ENREGISTRER = os.environ.get('SEO_PERF_ENREGISTRER') == '1'
+REPETITIONS = 7
+
+pytestmark = pytest.mark.skipif(os.environ.get('SEO_PERF') != '1' and not ENREGISTRER,
+                                reason='mesures de performance : SEO_PERF=1')
+
+NIVEAUX = ['debutant', 'intermediaire', 'pro']
+TYPES_PROJET = ['apprentissage', 'application', 'api', 'saas', 'api_async']
+
+
+def calibrer() -> float:
+    """Durée d'une charge CPU fixe en pur Python (meilleure de 5)"""
+    durees = []
+    for _ in range(5):
+        debut = time.perf_counter()
+        sum(i * i for i in range(200_000))
+        durees.append(time.perf_counter() - debut)
+    return min(durees)
+
+
+@pytest.fixture(scope='module')
+def reference():
+    """Mesures de référence ; réécrites en fin de module avec SEO_PERF_ENREGISTRER=1"""
+    donnees = json.loads(REFERENCE.read_text(encoding='utf-8')) if REFERENCE.exists() else {}
+    etat = {'calibration': calibrer(), 'reference': donnees.get('mesures', {}), 'mesures': {}}
+    yield etat
+    if ENREGISTRER:
+        REFERENCE.write_text(json.dumps({
+            'python': f"{sys.version_info[0]}.{sys.version_info[1]}",
+            'mesures': dict(sorted({**etat['reference'], **etat['mesures']}.items())),
+        }, indent=2, ensure_ascii=False) + "\n", encoding='utf-8')
+
+
+def verifier(reference, nom: str, valeur: float, plus_grand_est_mieux: bool = False,
+             normaliser: bool = True):
+    """Compare une mesure à la référence (durées et débits normalisés par la calibration)"""
+    if normaliser:
+        calibration = reference['calibration']
+        valeur = valeur * calibration if plus_grand_est_mieux else valeur / calibration
+    reference['mesures'][nom] = round(valeur, 4)
+    attendu = reference['reference'].get(nom)
+    if ENREGISTRER or attendu is None:
+        return
+    if plus_grand_est_mieux:
+        assert valeur >= attendu * (1 - SEUIL), f"{nom}: {valeur:.4g} contre {attendu:.4g} (référence)"
+    else:
+        assert valeur <= attendu * (1 + SEUIL), f"{nom}: {valeur:.4g} contre {attendu:.4g} (référence)"
+
+
+@pytest.fixture(scope='module')
+def dossier_rapide():
+    """tmpfs si disponible : on mesure le générateur, pas le disque"""
+    base = '/dev/shm' if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK) else None
+    dossier = Path(tempfile.mkdtemp(prefix='seo-perf-', dir=base))
+    yield dossier
+    shutil.rmtree(dossier, ignore_errors=True)
+
+
+@pytest.fixture(scope='module', autouse=True)
+def cache_isole(tmp_path_factory):
+    """Archives de templates construites dans un cache propre au module"""
+    from seo import archives
+    ancien = os.environ.get('SEO_CACHE_DIR')
+    os.environ['SEO_CACHE_DIR'] = str(tmp_path_factory.mktemp('cache'))
+    archives._archives.clear()
+    yield
+    archives._archives.clear()
+    if ancien is None:
+        os.environ.pop('SEO_CACHE_DIR')
+    else:
+        os.environ['SEO_CACHE_DIR'] = ancien
+
+
+def creer(variante: str, chemin: Path):
+    """Générateur d'une variante, sans installation ni git"""
+    from seo import generators
+    from seo.lot import completer_preferences
+    if variante in NIVEAUX:
+        classes = {'debutant': generators.DebutantWebGenerator,
+                   'intermediaire': generators.IntermediaireWebGenerator,
+                   'pro': generators.ProWebGenerator}
+        generateur = classes[variante](str(chemin))
+        if variante == 'pro':
+            # Son _post_creation se limite au git init, hors de ce qui est mesuré
+            generateur._post_creation = lambda: None
+    else:
+        generateur = generators.creer_generateur(completer_preferences(
+            {'nom_projet': str(chemin), 'type_projet': variante, 'git': False}))
+    generateur.installer = False
+    return generateur
+
+
+def compter_fichiers(chemin: Path) -> int:
+    return sum(len(fichiers) for _, _, fichiers in os.walk(chemin))
+
+
+@pytest.mark.parametrize('variante', NIVEAUX + TYPES_PROJET)
+def test_generation(variante, reference, dossier_rapide):
+    durees = []
+    for i in range(REPETITIONS + 1):
+        chemin = dossier_rapide / f'{variante}-{i}'
+        generateur = creer(variante, chemin)
+        with redirect_stdout(io.StringIO()):
+            debut = time.perf_counter()
+            generateur.generer()
+            duree = time.perf_counter() - debut
+        # La première génération construit l'archive du niveau : hors mesure
+        if i:
+            durees.append(duree)
+        fichiers = compter_fichiers(chemin)
+        shutil.rmtree(chemin)
+
+    mediane = statistics.median(durees)
+    verifier(reference, f'generation.{variante}.duree', mediane)
+    verifier(reference, f'generation.{variante}.fichiers_par_s', fichiers / mediane,
+             plus_grand_est_mieux=True)
+
+
+def test_copie_et_creation_de_fichiers(reference, dossier_rapide):
+    from seo.utils import copier_dossier, creer_fichier
+    source = RACINE / 'seo' / 'templates' / 'intermediaire'
+    durees = []
+    for i in range(REPETITIONS):
+        chemin = dossier_rapide / f'copie-{i}'
+        debut = time.perf_counter()
+        copier_dossier(source, chemin)
+        for n in range(50):
+            creer_fichier(chemin / 'module' / f'f{n}.py', f"VALEUR = {n}\n")
+        durees.append(time.perf_counter() - debut)
+        shutil.rmtree(chemin)
+    verifier(reference, 'copie.intermediaire.duree', statistics.median(durees))
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="resource n'existe pas sous Windows")
+def test_pic_memoire(reference, dossier_rapide):
+    """Pic de RSS d'un processus qui génère toutes les variantes"""
+    script = (
+        "import io, resource, sys\n"
+        "from contextlib import redirect_stdout\n"
+        "import test_performance as t\n"
+        "from pathlib import Path\n"
+        "for v in t.NIVEAUX + t.TYPES_PROJET:\n"
+        "    g = t.creer(v, Path(sys.argv[1]) / v)\n"
+        "    with redirect_stdout(io.StringIO()):\n"
+        "        g.generer()\n"
+        # Linux : VmHWM, propre au processus (ru_maxrss hérite du pic de pytest à travers fork/exec)
+        "try:\n"
+        "    with open('/proc/self/status') as f:\n"
+        "        pic = next(int(l.split()[1]) for l in f if l.startswith('VmHWM:'))\n"
+        "except OSError:\n"
+        "    pic = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+        "    pic = pic / 1024 if sys.platform == 'darwin' else pic\n"
+        # Ko
+        "print(pic)\n"
+    )
+    resultat = subprocess.run([sys.executable, '-c', script, str(dossier_rapide / 'memoire')],
+                              cwd=RACINE, stdout=subprocess.PIPE, universal_newlines=True, check=True)
+    verifier(reference, 'memoire.pic_mo', float(resultat.stdout.split()[-1]) / 1024, normaliser=False)
+
+
+@pytest.mark.parametrize('module', ['seo.lanceur', 'seo.generators'])
+def test_temps_import(module, reference):
+    """Import à froid (meilleur de 3 avec python -X importtime)"""
+    durees = []
+    for _ in range(3):
+        resultat = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                  cwd=RACINE, stderr=subprocess.PIPE, universal_newlines=True)
+        lignes = [ligne for ligne in resultat.stderr.splitlines() if ligne.split('|')[-1].strip() == module]
+        durees.append(int(lignes[-1].split('|')[1]) / 1_000_000)
+    verifier(reference, f'import.{module}.duree', min(durees))
@@ -0,0 +1,67 @@
+"""
+Tests du profilage des requêtes (middleware WSGI et rapport)
+"""
+import time
+
+import pytest
+
+from seo.profilage import MiddlewareProfilage, Options, construire_rapport
+
+
+def calcul_lent(duree):
+    fin = time.perf_counter() + duree
+    while time.perf_counter() < fin:
+        sum(range(100))
+
+
+def application(environ, start_response):
+    if environ['PATH_INFO'].startswith('/lent'):
+        calcul_lent(0.06)
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [b'ok']
+
+
+def appeler(middleware, chemin):
+    statuts = []
+    corps = middleware({'PATH_INFO': chemin, 'REQUEST_METHOD': 'GET'},
+                       lambda statut, en_tetes: statuts.append(statut))
+    assert b''.join(corps) == b'ok' and statuts == ['200 OK']
+
+
+def test_cprofile_filtre_chemin_et_duree(tmp_path):
+    middleware = MiddlewareProfilage(application, Options('cprofile', str(tmp_path), ('/lent', '/rapide'), 30))
+    for chemin in ('/lent/1', '/rapide', '/autre/lent'):
+        appeler(middleware, chemin)
+    profils = list(tmp_path.glob('*.prof'))
+    assert len(profils) == 1 and 'GET-lent_1-' in profils[0].name
+
+    rapport = construire_rapport(tmp_path, 'cumul')
+    assert rapport.profils == 1 and rapport.unite == 's'
+    assert any(f.nom.startswith('test_profilage:calcul_lent') for f in rapport.fonctions[:5])
+    # cProfile ne garde pas les piles : --collapsed échoue au lieu de ne rien écrire
+    with pytest.raises(ValueError, match='mode sample'):
+        construire_rapport(tmp_path, fusion=tmp_path / 'fusion.txt')
+    assert not (tmp_path / 'fusion.txt').exists()
+
+
+def test_echantillons_en_piles_repliees(tmp_path):
+    middleware = MiddlewareProfilage(application, Options('sample', str(tmp_path), intervalle_ms=2))
+    appeler(middleware, '/lent')
+    appeler(middleware, '/lent')
+    fichiers = list(tmp_path.glob('*.collapsed'))
+    assert len(fichiers) == 2
+    pile, _, nombre = fichiers[0].read_text(encoding='utf-8').splitlines()[0].rpartition(' ')
+    assert pile.startswith('test_profilage:application') and int(nombre) > 0
+
+    fusion = tmp_path / 'fusion.txt'
+    rapport = construire_rapport(tmp_path, fusion=fusion)
+    assert rapport.unite == 'échantillons'
+    assert rapport.fonctions[0].nom == 'test_profilage:calcul_lent'
+    assert fusion.read_text(encoding='utf-8')
+
+
+def test_options_par_environnement(monkeypatch):
+    options = Options('sample', '/tmp/profils', ('/api', '/taches'), 50, 10)
+    for variable, valeur in options.vers_environnement().items():
+        monkeypatch.setenv(variable, valeur)
+    assert Options.depuis_environnement() == options
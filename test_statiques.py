@@ -0,0 +1,73 @@
+"""
+Tests de la construction des fichiers statiques (`seo assets build`)
+"""
+import gzip
+import json
+
+from seo.statiques import construire, minifier_css
+
+
+def test_minifier_css_preserve_le_sens():
+    source = '''/* commentaire */
+a :hover , b > c {
+    content: "a , b ;}" ;
+    width: calc(1px + 2px);
+}
+/*! licence */
+@media (max-width: 600px) { .x { color: red; } }
+'''
+    assert minifier_css(source) == ('a :hover,b>c{content: "a , b ;}";width: calc(1px + 2px)}'
+                                    '/*! licence */ @media (max-width: 600px){.x{color: red}}')
+
+
+def test_construction_versionnee_et_compressee(tmp_path):
+    statique = tmp_path / 'static'
+    (statique / 'img').mkdir(parents=True)
+    (statique / 'style.css').write_text('\ufeff' + 'body {\n    color: #333;\n}\n' * 40, encoding='utf-8')
+    (statique / 'img' / 'logo.png').write_bytes(b'\x89PNG' + bytes(300))
+    (statique / 'dist').mkdir()
+    (statique / 'dist' / 'ancien.css').write_text('périmé', encoding='utf-8')
+
+    resultat = construire(tmp_path)
+    manifeste = json.loads((statique / 'dist' / 'manifest.json').read_text(encoding='utf-8'))
+    assert resultat.fichiers == 2 and set(manifeste) == {'style.css', 'img/logo.png'}
+    assert manifeste['img/logo.png'].startswith('dist/img/logo.')
+    assert not (statique / 'dist' / 'ancien.css').exists()
+
+    css = statique / manifeste['style.css']
+    assert css.read_text(encoding='utf-8').startswith('body{color: #333}body')
+    assert gzip.decompress((statique / (manifeste['style.css'] + '.gz')).read_bytes()) == css.read_bytes()
+    # Les images ne sont pas recompressées
+    assert not (statique / (manifeste['img/logo.png'] + '.gz')).exists()
+
+    # Même contenu, même nom : les caches des navigateurs restent valides
+    assert json.loads(construire(tmp_path).manifeste.read_text(encoding='utf-8')) == manifeste
+
+
+def test_references_css_vers_les_noms_construits(tmp_path):
+    statique = tmp_path / 'static'
+    (statique / 'css').mkdir(parents=True)
+    (statique / 'img').mkdir()
+    (statique / 'img' / 'fond.png').write_bytes(b'\x89PNG' + bytes(10))
+    (statique / 'css' / 'base.css').write_text('body { margin: 0 }', encoding='utf-8')
+    (statique / 'css' / 'style.css').write_text(
+        '@import "base.css";\n'
+        '.a { background: url(../img/fond.png) }\n'
+        ".b { background: url( '../img/absent.png?v=1#x' ) }\n"
+        '.c { background: url("data:image/png;base64,AA"), url(/abs.png), url(https://cdn.test/x.png) }\n',
+        encoding='utf-8')
+
+    construire(tmp_path)
+    manifeste = json.loads((statique / 'dist' / 'manifest.json').read_text(encoding='utf-8'))
+    css = (statique / manifeste['css/style.css']).read_text(encoding='utf-8')
+    # Chemins relatifs au CSS construit (dist/css/) : fichiers versionnés, sinon emplacement d'origine
+    assert f'@import "{manifeste["css/base.css"][len("dist/css/"):]}"' in css
+    assert f'url(../{manifeste["img/fond.png"][len("dist/"):]})' in css
+    assert "'../../img/absent.png?v=1#x'" in css
+    assert 'url("data:image/png;base64,AA"),url(/abs.png),url(https://cdn.test/x.png)' in css
+
+    # L'image modifiée change aussi le nom du CSS qui la référence
+    (statique / 'img' / 'fond.png').write_bytes(b'\x89PNG' + bytes(20))
+    nouveau = json.loads(construire(tmp_path).manifeste.read_text(encoding='utf-8'))
+    assert nouveau['css/style.css'] != manifeste['css/style.css']
+    assert nouveau['css/base.css'] == manifeste['css/base.css']
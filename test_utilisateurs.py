@@ -0,0 +1,104 @@
+"""
+Tests de l'import, de l'export et du listing des utilisateurs (seo user)
+
+Aller-retour CSV contre un modèle User minimal sur SQLite.
+"""
+import io
+
+import pytest
+
+from seo.utilisateurs import ErreurImport, exporter, importer, lister
+
+flask_sqlalchemy = pytest.importorskip('flask_sqlalchemy', reason='Flask-SQLAlchemy non installé')
+
+CSV = (
+    "username,email,password,is_admin\n"
+    "alice,alice@example.com,secret-a,oui\n"
+    "bob,bob@example.com,secret-b,\n"
+    "chloe,chloe@example.com,secret-c,0\n"
+    "david,david@example.com,secret-d,true\n"
+    "emma,emma@example.com,secret-e,non\n"
+)
+
+
+def application(chemin, avec_age=False):
+    """Application Flask avec une table user, comme les templates"""
+    from flask import Flask
+
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI=f"sqlite:///{chemin}",
+                      # Hachage rapide : le test porte sur le flux, pas sur le coût
+                      HACHAGE_MOT_DE_PASSE='pbkdf2:sha256:1000')
+    db = flask_sqlalchemy.SQLAlchemy(app)
+
+    class User(db.Model):
+        id = db.Column(db.Integer, primary_key=True)
+        username = db.Column(db.String(80), unique=True, nullable=False)
+        email = db.Column(db.String(120), unique=True, nullable=False)
+        password_hash = db.Column(db.String(256), nullable=False)
+        is_admin = db.Column(db.Boolean, default=False)
+        if avec_age:
+            age = db.Column(db.Integer)
+
+    with app.app_context():
+        db.create_all()
+    return app, db, User
+
+
+def lignes(app, db, User):
+    with app.app_context():
+        return [(u.username, u.email, u.password_hash, u.is_admin)
+                for u in db.session.execute(db.select(User).order_by(User.id)).scalars()]
+
+
+def test_import_export_reimport(tmp_path):
+    from werkzeug.security import check_password_hash
+
+    app, db, User = application(tmp_path / 'a.db')
+    # Lots de 2 : le hachage d'un lot chevauche l'insertion du précédent
+    assert importer(app, io.StringIO(CSV), taille_lot=2, workers=2) == 5
+    importes = lignes(app, db, User)
+    assert [(u[0], u[3]) for u in importes] == [('alice', True), ('bob', False), ('chloe', False),
+                                              ('david', True), ('emma', False)]
+    assert check_password_hash(importes[1][2], 'secret-b')
+
+    export = io.StringIO()
+    assert exporter(app, export, taille_lot=2) == 5
+    assert export.getvalue().splitlines()[0] == 'username,email,password_hash,is_admin'
+
+    # Le CSV exporté se réimporte tel quel (empreintes comprises) dans une autre base
+    copie, db_copie, User_copie = application(tmp_path / 'b.db')
+    assert importer(copie, io.StringIO(export.getvalue()), taille_lot=3, workers=1) == 5
+    assert lignes(copie, db_copie, User_copie) == importes
+
+
+def test_import_rejete(tmp_path):
+    app, db, User = application(tmp_path / 'a.db')
+    with pytest.raises(ErreurImport, match='inconnues'):
+        importer(app, io.StringIO("username,email,password,age\n"), workers=1)
+    with pytest.raises(ErreurImport, match='obligatoires'):
+        importer(app, io.StringIO("username,password\nx,y\n"), workers=1)
+
+    # Lignes invalides : numéro de ligne du CSV, rien n'est inséré
+    app_entier = application(tmp_path / 'entier.db', avec_age=True)
+    with pytest.raises(ErreurImport, match=r"Ligne 3: age invalide \('douze'\)"):
+        importer(app_entier[0], io.StringIO("username,email,password,age\n"
+                                            "a,a@example.com,x,12\nb,b@example.com,y,douze\n"), workers=1)
+    with pytest.raises(ErreurImport, match='Ligne 2: plus de valeurs que de colonnes'):
+        importer(app, io.StringIO("username,email,password\na,a@example.com,x,en-trop\n"), workers=1)
+    assert not lignes(app, db, User) and not lignes(*app_entier)
+
+    # Doublon dans le second lot : le premier reste importé
+    doublon = CSV + "alice,autre@example.com,secret,\n"
+    with pytest.raises(ErreurImport, match='après 5 lignes'):
+        importer(app, io.StringIO(doublon), taille_lot=5, workers=1)
+    assert len(lignes(app, db, User)) == 5
+
+
+def test_lister_par_pages(tmp_path, capsys):
+    app, _, _ = application(tmp_path / 'a.db')
+    importer(app, io.StringIO(CSV), workers=1)
+    lister(app, taille_page=2)
+    sortie = capsys.readouterr().out
+    assert 'alice@example.com' in sortie and 'emma@example.com' in sortie
+    assert '5 utilisateurs' in sortie